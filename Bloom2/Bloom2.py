@@ -1,5 +1,11 @@
 from manim import *
 import numpy as np
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from reelkit.mobjects import NodeGraph
+from reelkit.rng import SeededScene
 
 class Scene1_ThreeSecretAreas(Scene):
     def construct(self):
@@ -92,59 +98,45 @@ class Scene2_AIQuery(Scene):
         
         # Create network graph
         center = ORIGIN
-        network = VGroup()
         
         # Create nodes in layers
         layers = 4
         nodes_per_layer = [1, 6, 18, 54]
-        positions = []
-        
-        # Center node
-        center_node = Dot(center, radius=0.08, color=TEAL)
-        network.add(center_node)
-        positions.append(center)
+        positions = [center]
         
-        # Create nodes in expanding layers
+        # Node positions in expanding layers
         layer_radius = [0, 0.8, 1.6, 2.4]
         for layer in range(1, layers):
-            for i in range(nodes_per_layer[layer]):
-                angle = 2 * PI * i / nodes_per_layer[layer]
-                pos = center + layer_radius[layer] * np.array([
-                    np.cos(angle), np.sin(angle), 0
-                ])
-                node = Dot(pos, radius=0.05, color=BLUE)
-                network.add(node)
-                positions.append(pos)
-        
-        # Create connections
-        connections = VGroup()
-        for i, pos1 in enumerate(positions):
-            if i == 0:  # Connect center to first layer
-                for j in range(1, nodes_per_layer[1] + 1):
-                    line = Line(pos1, positions[j], color=GRAY, stroke_width=0.5)
-                    line.set_opacity(0.3)
-                    connections.add(line)
-            elif i < len(positions) - nodes_per_layer[-1]:  # Connect to next layer
-                for j in range(i + 1, min(i + 4, len(positions))):
-                    if np.linalg.norm(positions[i] - positions[j]) < 1.5:
-                        line = Line(positions[i], positions[j], color=GRAY, stroke_width=0.3)
-                        line.set_opacity(0.2)
-                        connections.add(line)
+            angle = 2 * PI * np.arange(nodes_per_layer[layer]) / nodes_per_layer[layer]
+            positions.extend(layer_radius[layer] * np.stack([np.cos(angle), np.sin(angle), 0 * angle], axis=1))
+        positions = np.array(positions)
+        
+        # Connections as index pairs
+        spokes = [(0, j) for j in range(1, nodes_per_layer[1] + 1)]  # center to first layer
+        links = []
+        for i in range(1, len(positions) - nodes_per_layer[-1]):  # Connect to next layer
+            for j in range(i + 1, min(i + 4, len(positions))):
+                if np.linalg.norm(positions[i] - positions[j]) < 1.5:
+                    links.append((i, j))
+        
+        # One path per stroke style (the spokes from the center are heavier),
+        # one fill for the nodes and a bigger dot for the center
+        graph = NodeGraph(positions, [spokes, links], node_radius=0.05, node_color=BLUE,
+                          edge_color=GRAY, edge_width=(0.5, 0.3), edge_opacity=(0.3, 0.2),
+                          hub=0, hub_radius=0.08, hub_color=TEAL)
         
         # Animate network appearing
-        self.play(Create(connections), run_time=1.5)
-        self.play(FadeIn(network), run_time=1)
+        self.play(Create(graph.edges), run_time=1.5)
+        self.play(FadeIn(graph.nodes), run_time=1)
         
         # Pulse animation
         for _ in range(3):
-            pulse_nodes = network.copy()
-            pulse_nodes.set_color(YELLOW)
-            pulse_nodes.scale(1.5)
-            pulse_nodes.set_opacity(0.5)
+            pulse_nodes = graph.pulse(YELLOW, scale=1.5, opacity=0.5)
             self.play(
                 pulse_nodes.animate.set_opacity(0),
                 run_time=0.6
             )
+            self.remove(pulse_nodes)
 
 
 class Scene3_GrowthChart(Scene):
@@ -318,7 +310,7 @@ class Scene4_HyperscaleCampuses(Scene):
         self.wait(0.5)
 
 
-class Scene5_RealEstate(Scene):
+class Scene5_RealEstate(SeededScene):
     def construct(self):
         self.camera.background_color = "#0a0a0a"
         # Title
@@ -368,7 +360,7 @@ class Scene5_RealEstate(Scene):
         
         # Fill up grid cells (turn red when full)
         fill_order = list(range(len(buildings)))
-        np.random.shuffle(fill_order)
+        self.rng.shuffle(fill_order)
         
         for idx in fill_order[:12]:  # Fill 12 out of 16
             building, pos = buildings[idx]
@@ -1010,7 +1002,7 @@ class Scene10_Headlines(Scene):
         self.wait(1)
 
 
-class FullAnimation(Scene):
+class FullAnimation(SeededScene):
     """Combines all 10 scenes into one continuous video with smooth transitions.
     Configured for vertical/portrait format (9:16 aspect ratio, 1080x1920 pixels).
     """
@@ -1392,7 +1384,7 @@ class FullAnimation(Scene):
             # On second sentence, animate fills and vacancy shrink
             if i == 1:
                 fill_order = list(range(len(buildings5)))
-                np.random.shuffle(fill_order)
+                self.rng.shuffle(fill_order)
                 for idx in fill_order:
                     building, pos = buildings5[idx]
                     self.play(
@@ -1656,7 +1648,7 @@ class FullAnimation(Scene):
             neural_net.add(Dot(node, radius=0.09, color=YELLOW))
         for a in range(len(nn_nodes)):
             for b in range(len(nn_nodes)):
-                if a != b and np.random.rand() < 0.18:
+                if a != b and self.rng.random() < 0.18:
                     line = Line(nn_nodes[a], nn_nodes[b], color=YELLOW, stroke_width=1.5)
                     line.set_opacity(0.4)
                     neural_net.add(line)
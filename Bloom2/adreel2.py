@@ -1,6 +1,7 @@
 from __future__ import annotations
 
 import csv
+import os
 from datetime import datetime
 from pathlib import Path
 
@@ -26,7 +27,7 @@ LINE_COLOR_BLOOM = BLUE_D #change this (optional)
 LINE_COLOR_SPY = RED_D #change this (optional)
 
 
-def load_portfolio_data() -> tuple[
+def load_portfolio_data(data_path: Path | None = None) -> tuple[
     list[datetime],
     list[float],
     list[float],
@@ -34,14 +35,14 @@ def load_portfolio_data() -> tuple[
     str,
     bool,
 ]:
-    data_path = None
+    # REEL_PORTFOLIO_DATA points at another CSV (benchmarks, previews).
+    override = data_path or os.environ.get("REEL_PORTFOLIO_DATA")
     base_dir = Path(__file__).parent
-    for filename in DATA_FILES:
-        candidate = base_dir / filename
-        if candidate.exists():
-            data_path = candidate
-            break
+    candidates = [Path(override)] if override else [base_dir / filename for filename in DATA_FILES]
+    data_path = next((candidate for candidate in candidates if candidate.exists()), None)
 
+    if data_path is None and override:
+        raise FileNotFoundError(f"Portfolio data file {override} does not exist.")
     if data_path is None:
         raise FileNotFoundError(
             "Could not find Bloom 2 Video Data.csv (or .py) in the script folder."
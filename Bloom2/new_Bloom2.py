@@ -1,5 +1,13 @@
 from manim import *
 import numpy as np
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from reelkit.animations import Jitter, PacketFlow
+from reelkit.captions import caption_helper
+from reelkit.mobjects import ParticleEmitter
+from reelkit.rng import SeededScene
 
 """
 This script is optimized for vertical/portrait format (1080x1920 resolution, 9:16 aspect ratio).
@@ -27,6 +35,7 @@ TEXT_COLOR = WHITE
 GRAY_COLOR = GRAY_B
 
 
+@caption_helper()
 def make_caption(text: str, font_size: int):
     # Use Paragraph so multi-line captions are truly center-aligned.
     return Paragraph(
@@ -383,9 +392,6 @@ class Scene1_AIDataCenter(Scene):
         # Yellow dots flowing from data center to query box following the edges
         num_packets = 12
         
-        def create_packet():
-            return Dot(radius=0.15 * scale_factor, color=YELLOW)
-        
         # Helper function to find multiple paths from data center to query box
         def get_paths_from_dc_to_query(num_paths=3):
             paths = []
@@ -420,30 +426,18 @@ class Scene1_AIDataCenter(Scene):
             run_time=2.5
         )
         
-        # Yellow dots flowing from data center to query box following multiple paths
+        # Yellow dots flowing from data center to query box following multiple paths,
+        # one after another in one play instead of one play per packet segment
         num_paths = 3
         paths = get_paths_from_dc_to_query(num_paths)
-        
-        for i in range(num_packets):
-            # Choose a path for this packet (cycle through paths)
-            path_idx = i % num_paths
-            path_points = paths[path_idx]
-            
-            packet = create_packet()
-            packet.move_to(path_points[0])  # Start at data center
-            self.add(packet)
-            
-            # Animate along each segment of the path
-            for segment_idx in range(len(path_points) - 1):
-                start_point = path_points[segment_idx]
-                end_point = path_points[segment_idx + 1]
-                self.play(
-                    packet.animate.move_to(end_point),
-                    run_time=0.15,
-                    rate_func=linear
-                )
-            
-            self.remove(packet)
+        self.play(PacketFlow.staggered(
+            paths,
+            num_packets,
+            stagger=0.45,  # 3 segments of 0.15s each, so 5.4s in all
+            travel_time=0.45,
+            radius=0.15 * scale_factor,
+            color=YELLOW,
+        ))
         
         self.wait(0.5)
         
@@ -516,16 +510,9 @@ class Scene2_Constraints(Scene):
         # Start small so it can "grow into" the box
         data_center.scale(0.35)
 
-        def vibrate(mob: Mobject, amp=0.09, steps=56):
+        def vibrate(mob: Mobject, amp=0.09):
             # True vibration: fast, small positional jitter (no rotation / no squash)
-            orig = mob.get_center()
-            anims = []
-            for k in range(steps):
-                dx = (amp if k % 2 == 0 else -amp)
-                dy = (amp * 0.35 if (k // 2) % 2 == 0 else -(amp * 0.35))
-                anims.append(mob.animate.shift(RIGHT * dx + UP * dy))
-            anims.append(mob.animate.move_to(orig))
-            return Succession(*anims)
+            return Jitter(mob, amplitude=(amp / 2, amp * 0.35 / 2), frequency=10)
 
         # Compute a target scale so the data center nearly touches the constraint box
         # (keep a little padding so it reads as "hitting the wall" without clipping)
@@ -826,7 +813,7 @@ class Scene4_PowerGrid(Scene):
         self.wait(0.1)  # Brief black screen
 
 
-class Scene5_Cooling(Scene):
+class Scene5_Cooling(SeededScene):
     def construct(self):
         self.camera.background_color = BG_COLOR
         
@@ -893,40 +880,30 @@ class Scene5_Cooling(Scene):
             Circle(radius=0.14, color=GRAY, fill_opacity=0.5, stroke_width=0),
         ).arrange(RIGHT, buff=0.12)
 
-        def make_smoke_stream(count=10, spread=0.25):
+        def make_smoke_stream(rate=4.5, spread=0.25):
             stream_center = cpu.get_top() + UP * 0.6
             bottom_y = stream_center[1] - 0.3
             top_y = stream_center[1] + 1.0
             smoke_speed = 0.6
 
-            stream = VGroup()
-            for _ in range(count):
-                puff = puff_template.copy()
-                puff._smoke_x = stream_center[0] + np.random.uniform(-spread, spread)
-                start_y = bottom_y - np.random.uniform(0.05, 0.6)
-                puff.move_to(np.array([puff._smoke_x, start_y, 0]))
-                puff.set_opacity(0)
-
-                def puff_updater(mob, dt, bottom=bottom_y, top=top_y, speed=smoke_speed):
-                    mob.shift(UP * speed * dt)
-                    if mob.get_center()[1] > top:
-                        reset_y = bottom - np.random.uniform(0.05, 0.6)
-                        mob.move_to(np.array([mob._smoke_x, reset_y, 0]))
-                    y = mob.get_center()[1]
-                    alpha = np.clip((y - bottom) / (top - bottom), 0, 1)
-                    mob.set_opacity(0.8 * alpha)
-
-                puff.add_updater(puff_updater)
-                stream.add(puff)
-
-            return stream
+            # Puffs rise from bottom_y to top_y, fading in as they go
+            return ParticleEmitter(
+                puff_template,
+                origin=np.array([stream_center[0], bottom_y, 0]),
+                spread=(spread, 0),
+                rate=rate,
+                lifetime=(top_y - bottom_y) / smoke_speed,
+                velocity=UP * smoke_speed,
+                opacity=lambda f: 0.8 * f,
+                rng=self.rng,
+            )
 
         # Blue liquid drop below the CPU (circle only)
         drop = Circle(radius=0.2, color=ACCENT_COLOR, fill_opacity=0.9, stroke_width=0)
         drop.move_to(cpu.get_bottom() + DOWN * 1.2)
 
         # Smoke starts with captions and continues as a stream
-        smoke_stream = make_smoke_stream(count=12, spread=0.3)
+        smoke_stream = make_smoke_stream(rate=4.5, spread=0.3)
         self.add(smoke_stream)
         self.play(
             Write(caption, run_time=2.5),
@@ -942,8 +919,6 @@ class Scene5_Cooling(Scene):
             rate_func=linear,
         )
         smoke_stream.clear_updaters()
-        for puff in smoke_stream:
-            puff.clear_updaters()
         cooled_cpu = cpu.copy()
         for part in cooled_cpu:
             if isinstance(part, Mobject):
@@ -1,7 +1,13 @@
 from manim import *
 import math
-import random
 import numpy as np
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from reelkit.aspect import AnchoredScene
+from reelkit.captions import caption_helper
+from reelkit.sections import SectionedScene
 
 # --- FORCE 9:16 REEL COORDINATE FRAME ---
 config.pixel_width = 1080
@@ -15,7 +21,17 @@ config.frame_rate = 60
 #config.upto_animation_number = 6
 
 
-class SpaceEconomyIntro(Scene):
+class SpaceEconomyIntro(AnchoredScene, SectionedScene):
+    sections = (
+        "market",
+        "low_orbit",
+        "reusable_rockets",
+        "internet",
+        "competition",
+        "earth_mesh",
+    )
+    #resume_from = "earth_mesh"  # needs checkpoints from one full render
+
     # ---------------- Caption helpers (true centered multiline) ----------------
     def wrap_text_to_lines(self, text: str, font_size: int, max_width: float):
         words = text.split(" ")
@@ -48,6 +64,7 @@ class SpaceEconomyIntro(Scene):
             groups.append(VGroup(*cur))
         return groups
 
+    @caption_helper("sentence", mobject=lambda result: result[0])
     def make_caption(self, sentence: str, font_size: int, top_buff: float = 0.55, add_to_scene: bool = True):
         max_width = config.frame_width - 0.7
         lines = self.wrap_text_to_lines(sentence, font_size=font_size, max_width=max_width)
@@ -63,6 +80,7 @@ class SpaceEconomyIntro(Scene):
         caption_group = VGroup(*line_mobs).arrange(DOWN, buff=0.16, center=True)
         caption_group.to_edge(UP, buff=top_buff).shift(0.25 * OUT)
         caption_group.set_x(0)
+        self.anchor(caption_group, UP)
 
         if add_to_scene:
             self.add(caption_group)
@@ -185,10 +203,11 @@ class SpaceEconomyIntro(Scene):
         y = min(max(p[1], -half_h + margin), half_h - margin)
         return np.array([x, y, p[2]])
 
-    # ---------------- Main ----------------
-    def construct(self):
+    # ---------------- Sections ----------------
+    def setup(self):
         self.camera.background_color = "#02030A"
 
+    def section_market(self):
         # =========================
         # Stars (stay throughout until launchpad transition)
         # =========================
@@ -196,16 +215,17 @@ class SpaceEconomyIntro(Scene):
         BRIGHT_STARS = 35
         stars = VGroup()
         for _ in range(NORMAL_STARS):
-            x = random.uniform(-config.frame_width / 2,  config.frame_width / 2)
-            y = random.uniform(-config.frame_height / 2, config.frame_height / 2)
-            r = random.uniform(0.010, 0.018)
-            stars.add(Dot([x, y, 0], radius=r, color=WHITE).set_opacity(random.uniform(0.25, 0.80)))
+            x = self.rng.uniform(-config.frame_width / 2,  config.frame_width / 2)
+            y = self.rng.uniform(-config.frame_height / 2, config.frame_height / 2)
+            r = self.rng.uniform(0.010, 0.018)
+            stars.add(Dot([x, y, 0], radius=r, color=WHITE).set_opacity(self.rng.uniform(0.25, 0.80)))
         for _ in range(BRIGHT_STARS):
-            x = random.uniform(-config.frame_width / 2,  config.frame_width / 2)
-            y = random.uniform(-config.frame_height / 2, config.frame_height / 2)
-            r = random.uniform(0.018, 0.030)
-            stars.add(Dot([x, y, 0], radius=r, color=WHITE).set_opacity(random.uniform(0.65, 1.0)))
+            x = self.rng.uniform(-config.frame_width / 2,  config.frame_width / 2)
+            y = self.rng.uniform(-config.frame_height / 2, config.frame_height / 2)
+            r = self.rng.uniform(0.018, 0.030)
+            stars.add(Dot([x, y, 0], radius=r, color=WHITE).set_opacity(self.rng.uniform(0.65, 1.0)))
         self.add(stars)
+        self.stars = stars
 
         # =========================
         # Scene 1: Earth + $415B
@@ -280,10 +300,10 @@ class SpaceEconomyIntro(Scene):
         radii = [r1, r2, r3]
         for _ in range(28):
             dot = Dot(radius=0.018, color=WHITE)
-            dot.set_opacity(random.uniform(0.65, 1.0))
-            dot.theta = random.uniform(0, TAU)
-            dot.omega = random.uniform(0.6, 1.3) * (1 if random.random() > 0.5 else -1)
-            dot.rad = random.choice(radii)
+            dot.set_opacity(self.rng.uniform(0.65, 1.0))
+            dot.theta = self.rng.uniform(0, TAU)
+            dot.omega = self.rng.uniform(0.6, 1.3) * (1 if self.rng.random() > 0.5 else -1)
+            dot.rad = self.rng.choice(radii)
 
             def updater(mob, dt):
                 mob.theta += mob.omega * dt
@@ -369,10 +389,14 @@ class SpaceEconomyIntro(Scene):
 
         self.wait(0.35)
 
+        self.caption3 = caption3
+        self.chart = chart
+
+    def section_low_orbit(self):
         # =========================================================
         # Scene 4A: Low orbit + moving satellite (slide out top / in bottom)
         # =========================================================
-        old_scene3 = Group(caption3, chart)
+        old_scene3 = Group(self.caption3, self.chart)
 
         caption4a_text = "Most are in low orbit, just 100–1,200 miles above us and circling Earth every 90 minutes."
         caption4a, groups4a = self.make_caption(caption4a_text, font_size=22, top_buff=0.55, add_to_scene=False)
@@ -557,12 +581,13 @@ class SpaceEconomyIntro(Scene):
         self.play(prog.animate.set_value(1.0), run_time=2.8, rate_func=smooth)
         self.wait(0.35)
 
+    def section_reusable_rockets(self):
         # =========================================================
         # SCENE 5 (AS YOU HAVE IT)
         # =========================================================
         slide_amt = config.frame_height + 2.0
 
-        old_mobs = [m for m in list(self.mobjects) if m is not stars]
+        old_mobs = [m for m in list(self.mobjects) if m is not self.stars]
         if old_mobs:
             for m in old_mobs:
                 try:
@@ -594,23 +619,22 @@ class SpaceEconomyIntro(Scene):
         x_margin = 0.35
         target_w = 0.45
 
-        random.seed(3)
         for _ in range(NUM_STATIONS):
             st = ImageMobject("images/space-station.png")
             st.scale(target_w / st.width)
 
-            x = random.uniform(-config.frame_width / 2 + x_margin, config.frame_width / 2 - x_margin)
-            y = -config.frame_height / 2 - random.uniform(0.4, 1.6)
+            x = self.rng.uniform(-config.frame_width / 2 + x_margin, config.frame_width / 2 - x_margin)
+            y = -config.frame_height / 2 - self.rng.uniform(0.4, 1.6)
             st.move_to(np.array([x, y, 0.0]))
 
-            st.rotate(random.uniform(-8, 8) * DEGREES)
+            st.rotate(self.rng.uniform(-8, 8) * DEGREES)
             stations.add(st)
 
         self.add(stations)
 
         fly_anims = []
         for st in stations:
-            drift = random.uniform(-0.25, 0.25)
+            drift = self.rng.uniform(-0.25, 0.25)
             end_pos = st.get_center() + np.array([drift, config.frame_height + 3.0, 0.0])
             fly_anims.append(st.animate.move_to(end_pos))
 
@@ -720,6 +744,7 @@ class SpaceEconomyIntro(Scene):
         self.play(end_tag.animate.set_opacity(1), run_time=0.25)
         self.wait(0.5)
 
+    def section_internet(self):
         # =========================================================
         # SCENE 6:
         # - 6A pops in one-by-one: caption -> satellite -> mountains -> ships -> town -> beams extend
@@ -731,7 +756,7 @@ class SpaceEconomyIntro(Scene):
         # -------------------------
         slide_dx = config.frame_width + 2.0
 
-        prev_mobs = [m for m in list(self.mobjects) if m is not stars]
+        prev_mobs = [m for m in list(self.mobjects) if m is not self.stars]
         prev_group = Group(*prev_mobs) if prev_mobs else Group()
 
         # Build 6A group OFFSCREEN RIGHT (so the slide is smooth)
@@ -950,13 +975,14 @@ class SpaceEconomyIntro(Scene):
 
         self.wait(0.6)
 
+    def section_competition(self):
         # =========================================================
         # SCENE 7: "Competition is accelerating everything..." (Option A)
         # Visual: orbital slots filling up + crowding pulse
         # Transition IN: collapse previous visuals (keep stars)
         # =========================================================
 
-        keep = {stars}
+        keep = {self.stars}
         to_remove = [m for m in list(self.mobjects) if m not in keep]
         for m in to_remove:
             try:
@@ -1049,8 +1075,8 @@ class SpaceEconomyIntro(Scene):
         r_orbit   = earth7.width * orbit_factor
 
         angles = np.linspace(0.10, TAU + 0.10, sat_count, endpoint=False)
-        angles = [a + random.uniform(-0.05, 0.05) for a in angles]
-        random.shuffle(angles)
+        angles = [a + self.rng.uniform(-0.05, 0.05) for a in angles]
+        self.rng.shuffle(angles)
 
         satellites = Group()
         satellites.set_z_index(8)
@@ -1060,7 +1086,7 @@ class SpaceEconomyIntro(Scene):
             s = ImageMobject("images/satellite.png")
             s.set_width(sat_w)
             s.theta = float(theta)
-            s.omega = random.uniform(0.55, 0.95) * (1 if random.random() > 0.5 else -1)
+            s.omega = self.rng.uniform(0.55, 0.95) * (1 if self.rng.random() > 0.5 else -1)
             return s
 
         def sat_orbit_updater(mob, dt):
@@ -1101,10 +1127,19 @@ class SpaceEconomyIntro(Scene):
 
         self.wait(0.6)
 
+        self.earth7 = earth7
+        self.orbit_ring = orbit_ring
+        self.ticks = ticks
+        self.satellites = satellites
+        self.caption7 = caption7
+
+    def section_earth_mesh(self):
         # =========================================================
         # SCENE 8: "Quiet revolution right above us"
         # Visual: shift-zoom Earth to center, remove orbit/satellites, fade-in glowing mesh network
         # =========================================================
+        earth7, caption7 = self.earth7, self.caption7
+        orbit_ring, ticks, satellites = self.orbit_ring, self.ticks, self.satellites
 
         # --- Transition IN from Scene 7: remove orbit visuals + sats, zoom earth ---
         fade_group = Group()
@@ -1197,7 +1232,7 @@ class SpaceEconomyIntro(Scene):
                 if d <= MAX_EDGE_LEN * 0.95:
                     pairs.append((d, i, j))
         pairs.sort(key=lambda x: x[0])
-        random.shuffle(pairs)
+        self.rng.shuffle(pairs)
         added = 0
         for _, i, j in pairs:
             if added >= extra_edges:
@@ -1,7 +1,9 @@
 from manim import *
-import numpy as np
-import math
-import random
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from reelkit.rng import SeededScene
 
 # --- FORCE 9:16 REEL COORDINATE FRAME ---
 config.pixel_width = 1080
@@ -11,17 +13,17 @@ config.frame_width = config.frame_height * 9 / 16  # 4.5
 config.frame_rate = 60
 
 
-class ReusableRocketsTransition(Scene):
+class ReusableRocketsTransition(SeededScene):
     def construct(self):
         self.camera.background_color = "#02030A"
 
         # --- optional: a few stars before the transition (gets faded out) ---
         stars = VGroup()
         for _ in range(220):
-            x = random.uniform(-config.frame_width / 2, config.frame_width / 2)
-            y = random.uniform(-config.frame_height / 2, config.frame_height / 2)
-            r = random.uniform(0.010, 0.018)
-            stars.add(Dot([x, y, 0], radius=r, color=WHITE).set_opacity(random.uniform(0.25, 0.75)))
+            x = self.rng.uniform(-config.frame_width / 2, config.frame_width / 2)
+            y = self.rng.uniform(-config.frame_height / 2, config.frame_height / 2)
+            r = self.rng.uniform(0.010, 0.018)
+            stars.add(Dot([x, y, 0], radius=r, color=WHITE).set_opacity(self.rng.uniform(0.25, 0.75)))
         self.add(stars)
 
         # --- Earth (pre-transition) ---
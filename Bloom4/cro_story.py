@@ -1,5 +1,14 @@
 from manim import *
 import math
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from reelkit.aspect import AnchoredScene
+from reelkit.captions import Cue, SectionTiming, frame_count
+from reelkit.icons import icon
+from reelkit.mobjects import DNAHelix
+from reelkit.sections import SectionedScene
 
 # Canvas and palette for a 9:16 vertical look
 config.pixel_width = 1080
@@ -28,6 +37,7 @@ def soft_glow(mob, color=CYAN, width=18, opacity=0.35):
     return ring
 
 
+@icon
 def gear_icon(radius=0.6, teeth=8, color=SOFT_WHITE):
     base = Circle(radius=radius, stroke_width=2, stroke_color=color)
     spokes = VGroup()
@@ -44,27 +54,14 @@ def gear_icon(radius=0.6, teeth=8, color=SOFT_WHITE):
 
 
 def dna_helix(height=5, width=1.4, turns=3, color_a=CYAN, color_b=ORANGE):
-    strands = VGroup()
-    connectors = VGroup()
-    for i, color in enumerate([color_a, color_b]):
-        strand = VMobject(stroke_color=color, stroke_width=3)
-        points = []
-        for t in np.linspace(0, TAU * turns, 80):
-            x = ((-1) ** i) * math.sin(t) * width * 0.5
-            y = (t / (TAU * turns) - 0.5) * height
-            z = 0
-            points.append([x, y, z])
-        strand.set_points_smoothly(points)
-        strands.add(strand)
-    for t in np.linspace(0, TAU * turns, 14):
-        x = math.sin(t) * width * 0.5
-        y = (t / (TAU * turns) - 0.5) * height
-        bar = Line([x, y, 0], [-x, y, 0], stroke_width=2, stroke_color=SOFT_WHITE)
-        bar.set_opacity(0.65)
-        connectors.add(bar)
-    return VGroup(strands, connectors)
+    return DNAHelix(
+        height, width, turns,
+        color_a=color_a, color_b=color_b, rung_color=SOFT_WHITE,
+        stroke_width=3, rung_width=2,
+    )
 
 
+@icon
 def patient_icon(color=SOFT_WHITE, scale=1.0, outline_only=True):
     head = Circle(radius=0.18 * scale, stroke_color=color, stroke_width=3, fill_opacity=0 if outline_only else 1)
     body = RoundedRectangle(height=0.7 * scale, width=0.35 * scale, corner_radius=0.12 * scale,
@@ -73,11 +70,32 @@ def patient_icon(color=SOFT_WHITE, scale=1.0, outline_only=True):
     return VGroup(head, body)
 
 
-class CROStory(Scene):
-    def sentence_pause(self, chunk):
+class CROStory(AnchoredScene, SectionedScene):
+    # One caption per section; each section is a single play that ends with
+    # self.clear(), so sections can render on their own.
+    captions = {
+        "one": "One of the biggest beneficiaries of the new drug development isn't pharmaceutical companies themselves.",
+        "two": "It takes years to test and billions of dollars to bring to market — far more work than most biotech firms can handle alone.",
+        "three": "So companies are turning to contract research organizations — CROs — who design studies, enroll patients, and analyze results.",
+        "four": "The CRO market is expected to reach nearly $138 billion by 2031 as drug pipelines expand and trials become more complex.",
+        "five": "More complexity means CROs need to evolve — those that do are poised for the most growth.",
+        "six": "The best CROs will be able to work with precision medicine.",
+        "seven": "Breakthroughs in sequencing and gene therapies demand trials built around DNA, biomarkers, and highly targeted patient groups.",
+        "eight": "Critical bottleneck: after COVID, 70% of trials fail to enroll enough patients while demand for patients will triple by 2032.",
+        "nine": "Remote consent, mobile sampling, and virtual check-ins proved trials don’t need to stay tied to hospitals — patient-centric designs unlock value.",
+        "ten": "AI may prove the ultimate lever — automation flows into the CRO core.",
+        "eleven": "Up to $18B of CRO work could shift to automation — from reports to genetic insights.",
+        "twelve": "The future of medicine is limitless — CROs that evolve sit at the center of the story.",
+    }
+    sections = tuple(captions)
+    independent_sections = True
+
+    @staticmethod
+    def sentence_pause(chunk):
         return CAPTION_SENTENCE_PAUSE if chunk.rstrip().endswith((".", "!", "?")) else 0.0
 
-    def split_caption(self, text, max_words=5):
+    @staticmethod
+    def split_caption(text, max_words=5):
         words = text.split()
         chunks = [" ".join(words[i:i + max_words]) for i in range(0, len(words), max_words)]
         if len(chunks) > 1 and len(chunks[-1].split()) == 1:
@@ -87,6 +105,38 @@ class CROStory(Scene):
             chunks[-1] = f"{prev_words[-1]} {last_word}".strip()
         return [c for c in chunks if c]
 
+    @classmethod
+    def caption_cues(cls, text, start=0.0):
+        # Each chunk writes in, holds (longer after a sentence) and fades out
+        # before the next one starts; see caption_animation.
+        cues = []
+        for chunk in cls.split_caption(text, max_words=5):
+            pause = cls.sentence_pause(chunk)
+            end = (
+                start
+                + max(CAPTION_APPEAR_TIME, CAPTION_WRITE_TIME)
+                + CAPTION_HOLD_TIME
+                + pause
+                + CAPTION_FADE_TIME
+            )
+            cues.append(Cue(chunk, start, end, pause))
+            start = end
+        return cues
+
+    @classmethod
+    def caption_schedule(cls, frame_rate=None):
+        """Every section's place on the output timeline, before rendering."""
+        frame_rate = frame_rate or config.frame_rate
+        schedule = []
+        frame = 0
+        for name in cls.sections:
+            start = frame / frame_rate
+            cues = cls.caption_cues(cls.captions[name], start)
+            # The play runs for the caption's length, rounded up to frames.
+            frame += frame_count(cues[-1].end - start, frame_rate)
+            schedule.append(SectionTiming(name, start, frame / frame_rate - start, cues))
+        return schedule
+
     def format_caption_text(self, text, max_width=CAPTION_MAX_WIDTH):
         base = Text(text, color=SOFT_WHITE).scale(0.6)
         if base.width <= max_width or " " not in text:
@@ -121,14 +171,15 @@ class CROStory(Scene):
         group = VGroup(box, caption)
         group.move_to(DOWN * 2.6)  # shift captions slightly downward
         caption.move_to(box.get_center())
+        # same relative height in taller frames
+        self.anchor(group, DOWN * 2.6 / config.frame_y_radius)
         return group
 
     def caption_animation(self, text):
         anims = []
         prev_cap = None
-        for chunk in self.split_caption(text, max_words=5):
-            cap = self.make_caption(chunk)
-            extra_pause = self.sentence_pause(chunk)
+        for cue in self.caption_cues(text):
+            cap = self.make_caption(cue.text)
             if prev_cap is not None:
                 anims.append(FadeOut(prev_cap, run_time=CAPTION_FADE_TIME))
             anims.append(AnimationGroup(
@@ -136,43 +187,23 @@ class CROStory(Scene):
                 Write(cap[1], run_time=CAPTION_WRITE_TIME),
                 lag_ratio=0.0,
             ))
-            anims.append(Wait(CAPTION_HOLD_TIME + extra_pause))
+            anims.append(Wait(CAPTION_HOLD_TIME + cue.pause))
             prev_cap = cap
         if prev_cap is not None:
             anims.append(FadeOut(prev_cap, run_time=CAPTION_FADE_TIME))
         return Succession(*anims, group=VGroup())
 
-    def play_with_caption(self, visual_anim, text):
-        chunks = self.split_caption(text, max_words=5)
-        caption_total = 0.0
-        for chunk in chunks:
-            caption_total += (
-                max(CAPTION_APPEAR_TIME, CAPTION_WRITE_TIME)
-                + CAPTION_HOLD_TIME
-                + self.sentence_pause(chunk)
-                + CAPTION_FADE_TIME
-            )
-        visual_anim.set_run_time(caption_total)
+    def play_with_caption(self, visual_anim, text=None):
+        text = text or self.captions[self.current_section]
+        visual_anim.set_run_time(self.caption_cues(text)[-1].end)
         # Prevent Manim from pre-adding all visual mobjects at time 0
         visual_anim = Succession(visual_anim, group=VGroup())
         caption_anim = self.caption_animation(text)
         self.play(visual_anim, caption_anim)
         self.clear()
 
-    def construct(self):
+    def setup(self):
         self.camera.background_color = NAVY
-        self.section_one()
-        self.section_two()
-        self.section_three()
-        self.section_four()
-        self.section_five()
-        self.section_six()
-        self.section_seven()
-        self.section_eight()
-        self.section_nine()
-        self.section_ten()
-        self.section_eleven()
-        self.section_twelve()
 
     # 1. Pill + pharma struggles
     def section_one(self):
@@ -204,10 +235,7 @@ class CROStory(Scene):
             Wait(0.4),
             FadeOut(VGroup(pill, factory, glow, label)),
         )
-        self.play_with_caption(
-            visual_anim,
-            "One of the biggest beneficiaries of the new drug development isn't pharmaceutical companies themselves.",
-        )
+        self.play_with_caption(visual_anim)
 
     # 2. Long timelines + cost curve
     def section_two(self):
@@ -238,10 +266,7 @@ class CROStory(Scene):
             Wait(0.4),
             FadeOut(VGroup(line, ticks, dollar, capacity_group)),
         )
-        self.play_with_caption(
-            visual_anim,
-            "It takes years to test and billions of dollars to bring to market — far more work than most biotech firms can handle alone.",
-        )
+        self.play_with_caption(visual_anim)
 
     # 3. CRO hub with inflows
     def section_three(self):
@@ -285,10 +310,7 @@ class CROStory(Scene):
             Wait(0.4),
             FadeOut(VGroup(cro_group, pharma_nodes, arrows, label_group)),
         )
-        self.play_with_caption(
-            visual_anim,
-            "So companies are turning to contract research organizations — CROs — who design studies, enroll patients, and analyze results.",
-        )
+        self.play_with_caption(visual_anim)
 
     # 4. Market growth line
     def section_four(self):
@@ -318,10 +340,7 @@ class CROStory(Scene):
             Wait(0.4),
             FadeOut(VGroup(path, glow, label, dna_bg)),
         )
-        self.play_with_caption(
-            visual_anim,
-            "The CRO market is expected to reach nearly $138 billion by 2031 as drug pipelines expand and trials become more complex.",
-        )
+        self.play_with_caption(visual_anim)
 
     # 5. Gears evolving
     def section_five(self):
@@ -344,10 +363,7 @@ class CROStory(Scene):
             Wait(0.4),
             FadeOut(VGroup(gears)),
         )
-        self.play_with_caption(
-            visual_anim,
-            "More complexity means CROs need to evolve — those that do are poised for the most growth.",
-        )
+        self.play_with_caption(visual_anim)
 
     # 6. Precision medicine DNA
     def section_six(self):
@@ -369,10 +385,7 @@ class CROStory(Scene):
             Wait(0.4),
             FadeOut(VGroup(dna, markers, text)),
         )
-        self.play_with_caption(
-            visual_anim,
-            "The best CROs will be able to work with precision medicine.",
-        )
+        self.play_with_caption(visual_anim)
 
     # 7. Targeted groups + matching network
     def section_seven(self):
@@ -412,10 +425,7 @@ class CROStory(Scene):
             Wait(0.5),
             FadeOut(VGroup(dna, patients, tags, nodes, links)),
         )
-        self.play_with_caption(
-            visual_anim,
-            "Breakthroughs in sequencing and gene therapies demand trials built around DNA, biomarkers, and highly targeted patient groups.",
-        )
+        self.play_with_caption(visual_anim)
 
     # 8. Enrollment bottleneck
     def section_eight(self):
@@ -450,10 +460,7 @@ class CROStory(Scene):
             Wait(0.3),
             FadeOut(VGroup(silhouettes, fail_group, demand_group)),
         )
-        self.play_with_caption(
-            visual_anim,
-            "Critical bottleneck: after COVID, 70% of trials fail to enroll enough patients while demand for patients will triple by 2032.",
-        )
+        self.play_with_caption(visual_anim)
 
     # 9. Patient-centric decentralized map
     def section_nine(self):
@@ -485,10 +492,7 @@ class CROStory(Scene):
             Wait(0.4),
             FadeOut(VGroup(map_box, nodes, links, hub, icons, hospital)),
         )
-        self.play_with_caption(
-            visual_anim,
-            "Remote consent, mobile sampling, and virtual check-ins proved trials don’t need to stay tied to hospitals — patient-centric designs unlock value.",
-        )
+        self.play_with_caption(visual_anim)
 
     # 10. AI mesh with CRO core
     def section_ten(self):
@@ -499,7 +503,7 @@ class CROStory(Scene):
             for j in range(rows):
                 x = -3.2 + i * (6.4 / (cols - 1))
                 y = -2.2 + j * (4.4 / (rows - 1))
-                jitter = np.array([np.random.uniform(-0.18, 0.18), np.random.uniform(-0.18, 0.18), 0])
+                jitter = np.array([self.rng.uniform(-0.18, 0.18), self.rng.uniform(-0.18, 0.18), 0])
                 pos = np.array([x, y, 0]) + jitter
                 node = Dot(pos, radius=0.035, color=SOFT_WHITE)
                 nodes.add(node)
@@ -552,10 +556,7 @@ class CROStory(Scene):
             Wait(0.4),
             FadeOut(VGroup(edges, nodes, cro_label)),
         )
-        self.play_with_caption(
-            visual_anim,
-            "AI may prove the ultimate lever — automation flows into the CRO core.",
-        )
+        self.play_with_caption(visual_anim)
 
     # 11. Automation value shift
     def section_eleven(self):
@@ -584,10 +585,7 @@ class CROStory(Scene):
             Wait(0.3),
             FadeOut(VGroup(divider, manual_stack, ai_stack, money)),
         )
-        self.play_with_caption(
-            visual_anim,
-            "Up to $18B of CRO work could shift to automation — from reports to genetic insights.",
-        )
+        self.play_with_caption(visual_anim)
 
     # 12. Future mesh + CRO center
     def section_twelve(self):
@@ -633,7 +631,4 @@ class CROStory(Scene):
             ),
             Wait(0.4),
         )
-        self.play_with_caption(
-            visual_anim,
-            "The future of medicine is limitless — CROs that evolve sit at the center of the story.",
-        )
+        self.play_with_caption(visual_anim)
@@ -1,9 +1,16 @@
 from __future__ import annotations
 
 import textwrap
-import math
 import numpy as np
 from manim import *
+import sys
+from pathlib import Path
+
+sys.path.append(str(Path(__file__).resolve().parents[1]))
+from reelkit.beats import Beat, BeatPlan
+from reelkit.captions import caption_helper
+from reelkit.icons import icon
+from reelkit.mobjects import DNAHelix
 
 
 BACKGROUND_COLOR = "#0b0b0b"
@@ -17,6 +24,7 @@ def wrap_lines(text: str, width: int = 48) -> list[str]:
     return textwrap.wrap(text, width=width, break_long_words=False)
 
 
+@caption_helper()
 def make_sentence(text: str, font_size: int = 34) -> Paragraph:
     lines = wrap_lines(text, width=42)  # Reduced width to ensure better wrapping
     sentence = Paragraph(*lines, alignment="center", font_size=font_size, color=PRIMARY_COLOR)
@@ -28,27 +36,15 @@ def make_sentence(text: str, font_size: int = 34) -> Paragraph:
     return sentence
 
 
-def dna_helix(height=5, width=1.4, turns=3, color_a=ACCENT_COLOR, color_b=HIGHLIGHT_COLOR, stroke_width=4) -> VGroup:
-    strands = VGroup()
-    connectors = VGroup()
-    for i, color in enumerate([color_a, color_b]):
-        strand = VMobject(stroke_color=color, stroke_width=stroke_width)
-        points = []
-        for t in np.linspace(0, TAU * turns, 80):
-            x = ((-1) ** i) * math.sin(t) * width * 0.5
-            y = (t / (TAU * turns) - 0.5) * height
-            points.append([x, y, 0])
-        strand.set_points_smoothly(points)
-        strands.add(strand)
-    for t in np.linspace(0, TAU * turns, 14):
-        x = math.sin(t) * width * 0.5
-        y = (t / (TAU * turns) - 0.5) * height
-        bar = Line([x, y, 0], [-x, y, 0], stroke_width=max(2, stroke_width - 1), stroke_color=PRIMARY_COLOR)
-        bar.set_opacity(0.65)
-        connectors.add(bar)
-    return VGroup(strands, connectors)
+def dna_helix(height=5, width=1.4, turns=3, color_a=ACCENT_COLOR, color_b=HIGHLIGHT_COLOR, stroke_width=4) -> DNAHelix:
+    return DNAHelix(
+        height, width, turns,
+        color_a=color_a, color_b=color_b, rung_color=PRIMARY_COLOR,
+        stroke_width=stroke_width, rung_width=max(2, stroke_width - 1),
+    )
 
 
+@icon
 def make_capsule(color: str = ACCENT_COLOR) -> VGroup:
     radius = 0.35
     left = Circle(radius=radius)
@@ -60,6 +56,7 @@ def make_capsule(color: str = ACCENT_COLOR) -> VGroup:
     return parts
 
 
+@icon
 def make_clipboard(color: str = PRIMARY_COLOR) -> VGroup:
     board = RoundedRectangle(width=1.6, height=2.1, corner_radius=0.1)
     clip = RoundedRectangle(width=0.6, height=0.25, corner_radius=0.08)
@@ -74,6 +71,7 @@ def make_clipboard(color: str = PRIMARY_COLOR) -> VGroup:
     return clipboard
 
 
+@icon
 def make_chain_link(color: str = PRIMARY_COLOR) -> VGroup:
     left = Circle(radius=0.18).shift(LEFT * 0.12)
     right = Circle(radius=0.18).shift(RIGHT * 0.12)
@@ -83,6 +81,7 @@ def make_chain_link(color: str = PRIMARY_COLOR) -> VGroup:
     return link
 
 
+@icon
 def make_flask(color: str = PRIMARY_COLOR) -> VGroup:
     # Flask outline
     neck = RoundedRectangle(width=0.6, height=1.4, corner_radius=0.2)
@@ -148,6 +147,7 @@ def make_flask(color: str = PRIMARY_COLOR) -> VGroup:
     return VGroup(flask_fill, outline, liquid, bubbles, ticks, plus)
 
 
+@icon
 def make_dna(color: str = ACCENT_COLOR) -> VGroup:
     curve_a = ParametricFunction(
         lambda t: np.array([0.25 * np.sin(t), 0.3 * t, 0.0]),
@@ -162,6 +162,7 @@ def make_dna(color: str = ACCENT_COLOR) -> VGroup:
     return dna
 
 
+@icon
 def make_target(color: str = PRIMARY_COLOR) -> VGroup:
     outer = Circle(radius=0.32)
     inner = Circle(radius=0.16)
@@ -173,6 +174,7 @@ def make_target(color: str = PRIMARY_COLOR) -> VGroup:
     return target
 
 
+@icon
 def make_biomarker_chart(color: str = PRIMARY_COLOR) -> VGroup:
     axis_x = Line(LEFT * 0.4, RIGHT * 0.4)
     axis_y = Line(DOWN * 0.4, UP * 0.4)
@@ -181,6 +183,7 @@ def make_biomarker_chart(color: str = PRIMARY_COLOR) -> VGroup:
     return VGroup(axis, dot)
 
 
+@icon
 def make_phone(color: str = PRIMARY_COLOR) -> VGroup:
     body = RoundedRectangle(width=0.6, height=1.1, corner_radius=0.08)
     button = Circle(radius=0.04).move_to(body.get_bottom() + UP * 0.12)
@@ -190,6 +193,7 @@ def make_phone(color: str = PRIMARY_COLOR) -> VGroup:
     return phone
 
 
+@icon
 def make_signal_waves(color: str = PRIMARY_COLOR) -> VGroup:
     wave1 = Arc(radius=0.2, start_angle=-PI / 3, angle=PI / 1.5)
     wave2 = Arc(radius=0.32, start_angle=-PI / 3, angle=PI / 1.5)
@@ -199,6 +203,7 @@ def make_signal_waves(color: str = PRIMARY_COLOR) -> VGroup:
     return waves
 
 
+@icon
 def make_gear(color: str = PRIMARY_COLOR) -> VGroup:
     core = Circle(radius=0.22)
     teeth = VGroup(
@@ -213,6 +218,7 @@ def make_gear(color: str = PRIMARY_COLOR) -> VGroup:
     return gear
 
 
+@icon
 def make_house(color: str = PRIMARY_COLOR) -> VGroup:
     base = Square(side_length=0.3)
     roof = Polygon(LEFT * 0.18, RIGHT * 0.18, UP * 0.18).shift(UP * 0.18)
@@ -223,19 +229,37 @@ def make_house(color: str = PRIMARY_COLOR) -> VGroup:
 
 
 class BaseBloomScene(Scene):
+    # Beat durations, checked against the scene total at import time
+    plan: BeatPlan | None = None
+
     def setup(self):
         self.camera.background_color = BACKGROUND_COLOR
 
+    def beat(self, *names: str) -> float:
+        return self.plan.span(*names)
+
+    def hold(self, *names: str) -> None:
+        duration = self.beat(*names)
+        if duration > 0:
+            self.wait(duration)
+
     def fade_out_all(self, run_time: float = 0.6) -> None:
         if self.mobjects:
             self.play(FadeOut(Group(*self.mobjects)), run_time=run_time)
 
 
 class TitleScene(BaseBloomScene):
-    def construct(self):
-        total_time = 3.0
-        used = 0.0
+    plan = BeatPlan(
+        4.1,
+        ("intro", 1.0),
+        ("converge", 0.7),
+        ("loosen", 0.4),
+        ("tighten", 0.4),
+        ("hold", 1.0),  # hold the final visual before the fade-out
+        ("fade", 0.6),
+    )
 
+    def construct(self):
         title = make_sentence("Pharma's Future Rests with Contract Research Organizations", font_size=46)
 
         # Load pill image
@@ -261,12 +285,10 @@ class TitleScene(BaseBloomScene):
             FadeIn(pill),
             FadeIn(diagnosis),
             FadeIn(tether),
-            run_time=1.0,
+            run_time=self.beat("intro"),
         )
-        used += 1.0
 
-        self.play(pill.animate.shift(RIGHT * 3.5), diagnosis.animate.shift(LEFT * 3.5), run_time=0.7)
-        used += 0.7
+        self.play(pill.animate.shift(RIGHT * 3.5), diagnosis.animate.shift(LEFT * 3.5), run_time=self.beat("converge"))
 
         # Circle that tightens around both icons (after they've moved)
         icons_group = Group(pill, diagnosis)
@@ -289,33 +311,35 @@ class TitleScene(BaseBloomScene):
         tight_circle.move_to(center_point)
         tight_circle.set_fill(opacity=0)
 
-        self.play(FadeOut(tether), Create(loose_circle), run_time=0.4)
+        self.play(FadeOut(tether), Create(loose_circle), run_time=self.beat("loosen"))
         tether.clear_updaters()
         self.remove(tether)
-        used += 0.4
-        self.play(Transform(loose_circle, tight_circle), run_time=0.4)
-        used += 0.4
+        self.play(Transform(loose_circle, tight_circle), run_time=self.beat("tighten"))
 
-        # Use renderer time to guarantee total scene length
-        # Hold the final visual an extra second before timing the fade-out
-        self.wait(1.0)
-        remaining = max(total_time - self.renderer.time - 0.6, 0)
-        if remaining > 0:
-            self.wait(remaining)
-        self.fade_out_all(run_time=0.6)
+        self.hold("hold")
+        self.fade_out_all(run_time=self.beat("fade"))
 
 
 class OutsourcingScene(BaseBloomScene):
+    plan = BeatPlan(
+        9.0,
+        ("lead_in", 0.5),
+        ("caption", 3.0),
+        Beat("visuals", 6.0, overlap=3.0),  # starts with the caption
+        ("fade", 0.25),
+        ("black", None),
+    )
+
     def construct(self):
-        self.wait(0.5)
+        self.hold("lead_in")
 
         sentence = make_sentence(
             "Developing new drugs is costly, so pharma increasingly outsources clinical trials "
             "to contract research organizations, or CROs.",
             font_size=30,
         )
-        caption_time = 3.0
-        visuals_time = 6.0
+        caption_time = self.beat("caption")
+        visuals_time = self.beat("visuals")
 
         cro_box = RoundedRectangle(width=2.8, height=1.4, corner_radius=0.12)
         cro_box.set_stroke("#3da5ff", width=3)
@@ -372,16 +396,24 @@ class OutsourcingScene(BaseBloomScene):
             Write(sentence, run_time=caption_time),
             visuals_anim,
         )
-        self.fade_out_all(run_time=0.25)
-        self.wait(2.25)
+        self.fade_out_all(run_time=self.beat("fade"))
+        self.hold("black")
 
 
 class TrendsOverviewScene(BaseBloomScene):
+    plan = BeatPlan(
+        6.4,
+        ("lead_in", 0.5),
+        ("intro", 3.0),
+        ("branches", 1.2),
+        ("icons", 1.2),
+        ("pad", None),
+        ("fade", 0.25),
+        ("black", 0.25),
+    )
+
     def construct(self):
-        total_time = 5.0
-        used = 0.0
-        self.wait(0.5)
-        used += 0.5
+        self.hold("lead_in")
 
         sentence = Text(
             "But there are three trends that will\n"
@@ -395,8 +427,7 @@ class TrendsOverviewScene(BaseBloomScene):
         cro_label = Text("CRO", font_size=34, color=PRIMARY_COLOR)
         cro_group = VGroup(cro_box, cro_label).set_stroke(PRIMARY_COLOR, width=2).move_to(DOWN * 1.8)
 
-        self.play(Write(sentence), FadeIn(cro_group), run_time=3.0)
-        used += 3.0
+        self.play(Write(sentence), FadeIn(cro_group), run_time=self.beat("intro"))
 
         dna_icon = make_dna(color="#4ec9f5").scale(1.2).move_to(cro_group.get_top() + UP * 1.2 + LEFT * 2.6 + DOWN * 0.2)
         digital_icon = VGroup(
@@ -427,36 +458,37 @@ class TrendsOverviewScene(BaseBloomScene):
         branch_mid = branch_to_icon(digital_icon)
         branch_right = branch_to_icon(gear_icon)
 
-        self.play(Create(branch_left), run_time=0.4)
-        self.play(Create(branch_mid), run_time=0.4)
-        self.play(Create(branch_right), run_time=0.4)
-        used += 1.2
+        for branch in (branch_left, branch_mid, branch_right):
+            self.play(Create(branch), run_time=self.beat("branches") / 3)
 
-        self.play(FadeIn(dna_icon, scale=0.9), run_time=0.4)
-        self.play(FadeIn(digital_icon, scale=0.9), run_time=0.4)
-        self.play(FadeIn(gear_icon, scale=0.9), run_time=0.4)
-        used += 1.2
+        for icon_group in (dna_icon, digital_icon, gear_icon):
+            self.play(FadeIn(icon_group, scale=0.9), run_time=self.beat("icons") / 3)
 
-        remaining = max(total_time - used - 0.6, 0)
-        if remaining > 0:
-            self.wait(remaining)
-        self.fade_out_all(run_time=0.25)
-        self.wait(0.25)
+        self.hold("pad")
+        self.fade_out_all(run_time=self.beat("fade"))
+        self.hold("black")
 
 
 class TrendPrecisionScene(BaseBloomScene):
+    plan = BeatPlan(
+        8.5,
+        ("lead_in", 0.5),
+        ("caption", 4.5),
+        ("hold", 1.0),
+        ("pad", None),
+        ("fade", 0.25),
+        ("black", 0.25),
+    )
+
     def construct(self):
-        total_time = 8.5
-        used = 0.0
-        self.wait(0.5)
-        used += 0.5
+        self.hold("lead_in")
 
         sentence = make_sentence(
             "First, medicine is shifting toward precision therapies driven by genetics and biomarkers, "
             "requiring CROs to improve capabilities.",
             font_size=30,
         )
-        caption_time = 4.5
+        caption_time = self.beat("caption")
         dna = dna_helix(height=9, width=1.6, turns=3, stroke_width=7).rotate(PI / 2).move_to(DOWN * 0.3)
         strands = dna[0]
         connectors = dna[1]
@@ -501,25 +533,28 @@ class TrendPrecisionScene(BaseBloomScene):
             visuals_anim,
             run_time=caption_time,
         )
-        used += caption_time
 
-        extra_hold = 1.0
-        self.wait(extra_hold)
-        used += extra_hold
+        # Keep the helix turning while the caption holds
+        self.add(dna.twist(rate=0.8))
 
-        remaining = max(total_time - used - 0.6, 0)
-        if remaining > 0:
-            self.wait(remaining)
-        self.fade_out_all(run_time=0.25)
-        self.wait(0.25)
+        self.hold("hold", "pad")
+        self.fade_out_all(run_time=self.beat("fade"))
+        self.hold("black")
 
 
 class TrendDigitalScene(BaseBloomScene):
+    plan = BeatPlan(
+        7.0,
+        ("lead_in", 0.75),
+        ("caption", 3.0),
+        Beat("visuals", 4.5, overlap=3.0),  # starts with the caption
+        ("pad", None),
+        ("fade", 0.25),
+        ("black", 0.25),
+    )
+
     def construct(self):
-        total_time = 7.0
-        used = 0.0
-        self.wait(0.75)
-        used += 0.75
+        self.hold("lead_in")
 
         sentence = Text(
             "Next, CROs that adopt digital tools will\n"
@@ -529,8 +564,8 @@ class TrendDigitalScene(BaseBloomScene):
             color=PRIMARY_COLOR,
         )
         sentence.to_edge(UP, buff=0.5)
-        caption_time = 3.0
-        visuals_time = 4.5
+        caption_time = self.beat("caption")
+        visuals_time = self.beat("visuals")
 
         map_box = RoundedRectangle(
             width=6.6,
@@ -576,21 +611,27 @@ class TrendDigitalScene(BaseBloomScene):
             visual_anim,
             run_time=visuals_time,
         )
-        used += visuals_time
 
-        remaining = max(total_time - used - 0.5, 0)
-        if remaining > 0:
-            self.wait(remaining)
-        self.fade_out_all(run_time=0.25)
-        self.wait(0.25)
+        self.hold("pad")
+        self.fade_out_all(run_time=self.beat("fade"))
+        self.hold("black")
 
 
 class TrendAutomationScene(BaseBloomScene):
+    plan = BeatPlan(
+        8.0,
+        ("lead_in", 0.5),
+        ("intro", 2.5),
+        ("spin", 0.8),
+        ("pull", 2.3),
+        ("absorb", 0.3),
+        ("pad", None),
+        ("fade", 0.25),
+        ("black", 0.25),
+    )
+
     def construct(self):
-        total_time = 8.0
-        used = 0.0
-        self.wait(0.5)
-        used += 0.5
+        self.hold("lead_in")
 
         sentence = make_sentence(
             "Finally, as trial costs rise, automation and AI are becoming essential to making drug development faster and more efficient.",
@@ -627,7 +668,7 @@ class TrendAutomationScene(BaseBloomScene):
 
         gear = ImageMobject("gear.png").set_height(2.3).move_to(RIGHT * 3.5 + DOWN * 0.6)
 
-        intro_time = 2.5
+        intro_time = self.beat("intro")
         def spin_updater(mob, dt):
             mob.rotate(PI * dt)
 
@@ -641,39 +682,37 @@ class TrendAutomationScene(BaseBloomScene):
             FadeIn(gear),
             run_time=intro_time,
         )
-        used += intro_time
 
-        spin_time = 0.8
-        self.wait(spin_time)
-        used += spin_time
+        self.hold("spin")
 
-        pull_time = 2.3
+        pull_time = self.beat("pull")
         self.play(
             network.animate.move_to(cro_group).scale(0.2),
             gear.animate.move_to(cro_group).scale(0.2),
             cro_group.animate.scale(2.0),
             run_time=pull_time,
         )
-        used += pull_time
 
-        absorb_time = 0.3
-        self.play(FadeOut(network), FadeOut(gear), run_time=absorb_time)
-        used += absorb_time
+        self.play(FadeOut(network), FadeOut(gear), run_time=self.beat("absorb"))
         gear.remove_updater(spin_updater)
 
-        remaining = max(total_time - used - 0.6, 0)
-        if remaining > 0:
-            self.wait(remaining)
-        self.fade_out_all(run_time=0.25)
-        self.wait(0.25)
+        self.hold("pad")
+        self.fade_out_all(run_time=self.beat("fade"))
+        self.hold("black")
 
 
 class CtaScene(BaseBloomScene):
+    plan = BeatPlan(
+        5.0,
+        ("lead_in", 0.5),
+        ("intro", 0.6),
+        ("pad", None),
+        ("fade", 0.25),
+        ("black", 0.25),
+    )
+
     def construct(self):
-        total_time = 5.0
-        used = 0.0
-        self.wait(0.5)
-        used += 0.5
+        self.hold("lead_in")
 
         sentence = make_sentence(
             "To learn more, check out the full article on Bloom using the link below.",
@@ -683,11 +722,8 @@ class CtaScene(BaseBloomScene):
         link.set_stroke(PRIMARY_COLOR, width=2)
         link_text = Text("bloom.com/article", font_size=24, color=PRIMARY_COLOR).move_to(link)
         link_group = VGroup(link, link_text).move_to(DOWN * 0.6)
-        self.play(Write(sentence), FadeIn(link_group), run_time=0.6)
-        used += 0.6
-
-        remaining = max(total_time - used - 0.6, 0)
-        if remaining > 0:
-            self.wait(remaining)
-        self.fade_out_all(run_time=0.25)
-        self.wait(0.25)
\ No newline at end of file
+        self.play(Write(sentence), FadeIn(link_group), run_time=self.beat("intro"))
+
+        self.hold("pad")
+        self.fade_out_all(run_time=self.beat("fade"))
+        self.hold("black")
\ No newline at end of file
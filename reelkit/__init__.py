@@ -0,0 +1,10 @@
+"""
+Shared rendering helpers for the Bloom reel scenes.
+
+Scene files import the pieces they need from the submodules, e.g.
+
+    from reelkit.sections import SectionedScene
+
+Importing the package itself stays free of manim so tooling can use it
+without a full render environment.
+"""
@@ -0,0 +1,463 @@
+"""
+Command line entry point for the reel tooling:
+
+    python -m reelkit chunk Bloom3/bloom3.py SpaceEconomyIntro --workers 8
+
+Commands import manim lazily, so the ones that do not render stay fast.
+"""
+from __future__ import annotations
+
+import argparse
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+
+def _preflight(targets: list[tuple[str, list[str]]]) -> None:
+    """Check the assets of every (file, scenes) target; exit listing all errors."""
+    from reelkit.preflight import check_file, preflight_enabled
+
+    if not preflight_enabled():
+        return
+    issues = [issue for file, scenes in targets for issue in check_file(Path(file), scenes)]
+    for issue in issues:
+        print(issue, file=sys.stderr)
+    if any(issue.error for issue in issues):
+        sys.exit("preflight failed, nothing rendered (REEL_PREFLIGHT=0 skips the check)")
+
+
+def _chunk(args: argparse.Namespace) -> None:
+    from reelkit.chunked import render_chunked, render_sections
+
+    resolution = tuple(int(v) for v in args.resolution.split(",")) if args.resolution else None
+    if args.sections:
+        output = Path(args.output).resolve() if args.output else None
+        print(render_sections(
+            Path(args.file), args.scene, workers=args.workers, output=output,
+            quality=args.quality, resolution=resolution,
+        ))
+        return
+    output = render_chunked(
+        Path(args.file),
+        args.scene,
+        workers=args.workers,
+        chunks=args.chunks,
+        beats=args.beats,
+        output=Path(args.output).resolve() if args.output else None,
+        quality=args.quality,
+        resolution=resolution,
+    )
+    print(output)
+
+
+def _aspects(args: argparse.Namespace) -> None:
+    from reelkit.aspect import render_aspects
+
+    resolution = tuple(int(v) for v in args.resolution.split(",")) if args.resolution else None
+    for output in render_aspects(Path(args.file), args.scene, tuple(args.aspects.split(",")), resolution, args.quality):
+        print(output)
+
+
+def _preview(args: argparse.Namespace) -> None:
+    from reelkit.proxy import render_preview
+
+    movie, log_dir = render_preview(Path(args.file), args.scene, scale=args.scale, step=args.step)
+    print(movie)
+    if args.promote == "background":
+        # Detached, so the preview returns while the final render runs.
+        subprocess.Popen(
+            [sys.executable, "-m", "reelkit", "promote", str(log_dir)],
+            cwd=Path(__file__).resolve().parents[1],
+            start_new_session=True,
+        )
+        print(f"promoting {log_dir} in the background")
+
+
+def _promote(args: argparse.Namespace) -> None:
+    from reelkit.proxy import promote
+
+    print(promote(Path(args.log_dir), Path(args.output).resolve() if args.output else None))
+
+
+def _subtitles(args: argparse.Namespace) -> None:
+    from reelkit.subtitles import export_subtitles
+
+    output_dir = Path(args.output_dir).resolve() if args.output_dir else None
+    for output in export_subtitles(Path(args.file), args.scene, output_dir, args.formats.split(","), args.frame_rate):
+        print(output)
+
+
+def _timeline(args: argparse.Namespace) -> None:
+    import json
+
+    from reelkit.timeline import PLATFORM_LIMITS, timeline_report
+
+    limit = args.max_seconds or PLATFORM_LIMITS.get(args.platform)
+    reports = [timeline_report(Path(args.file), scene, limit) for scene in args.scenes]
+    total = sum(r["duration"] for r in reports)
+    problems = [f"{r['scene']}: {p}" for r in reports for p in r["problems"]]
+    if len(reports) > 1 and limit is not None and total > limit:
+        problems.append(f"all scenes together run {total:.2f}s, over the {limit:g}s limit")
+    summary = {
+        "duration": total,
+        "estimated_render_seconds": round(sum(r["estimated_render_seconds"] for r in reports), 1),
+        "limit": limit,
+        "problems": problems,
+        "scenes": reports,
+    }
+
+    text = json.dumps(summary, indent=2)
+    if args.output:
+        Path(args.output).write_text(text, encoding="utf-8")
+    else:
+        print(text)
+    for problem in problems:
+        print(problem, file=sys.stderr)
+    if problems:
+        sys.exit(1)
+
+
+def _render(args: argparse.Namespace) -> None:
+    from reelkit.telemetry import render_with_telemetry
+
+    report_dir = Path(args.report_dir).resolve() if args.report_dir else None
+    for scene in args.scenes:
+        movie, reports = render_with_telemetry(
+            Path(args.file), scene, args.quality, report_dir, memory=args.memory or args.trace, trace=args.trace,
+        )
+        print(movie)
+        for report in reports:
+            print(report)
+
+
+def _batch(args: argparse.Namespace) -> None:
+    from reelkit.batch import Job, parse_size, run_batch
+
+    jobs = [Job.parse(spec, args.quality) for spec in args.jobs]
+    _preflight([(job.file, [job.scene]) for job in jobs])
+    results = run_batch(jobs, parse_size(args.budget) if args.budget else None, args.workers)
+    for r in results:
+        status = "ok" if r.returncode == 0 else f"failed ({r.returncode})"
+        print(f"{r.job.file}:{r.job.scene:<32} {status:<12} {r.wall:7.1f}s {r.peak_rss / 2**20:8.0f} MB")
+    if any(r.returncode for r in results):
+        sys.exit(1)
+
+
+def _bench(args: argparse.Namespace) -> None:
+    from reelkit.bench import BASELINE, compare, load_baseline, run_suite, save_baseline, summary_table
+
+    baseline_path = Path(args.baseline).resolve() if args.baseline else BASELINE
+    baseline = load_baseline(baseline_path)
+    sizes = tuple(int(v) for v in args.portfolio_sizes.split(",") if v)
+    results = run_suite(args.only, args.height, args.fps, sizes, args.timeout)
+    regressions = compare(results, baseline, args.threshold)
+    print(summary_table(results, baseline, regressions))
+    if args.update_baseline:
+        save_baseline(results, baseline_path)
+    elif regressions:
+        sys.exit(1)
+
+
+def _list(args: argparse.Namespace) -> None:
+    import json
+    from dataclasses import asdict
+
+    from reelkit.discovery import discover, scan_errors
+
+    scenes = discover(args.patterns, renderable_only=not args.all)
+    patterns = [p.replace("\\", "/").removeprefix("./") for p in args.patterns]
+    errors = {f: e for f, e in scan_errors().items() if not patterns or any(p in f for p in patterns)}
+    if args.json:
+        print(json.dumps([asdict(s) for s in scenes], indent=2))
+    else:
+        for s in scenes:
+            details = [f"lines {s.start}-{s.end}"]
+            if s.plan_total is not None:
+                details.append(f"{s.plan_total:g}s plan")
+            if s.sections:
+                details.append(f"sections: {', '.join(s.sections)}")
+            if not s.renderable:
+                details.append("base class")
+            print(f"{s.key:<56} {'  '.join(details)}")
+    # Their scenes are missing from the list above.
+    for file, error in sorted(errors.items()):
+        print(f"{file}: SyntaxError: {error}", file=sys.stderr)
+    if errors:
+        sys.exit(1)
+
+
+def _worker(args: argparse.Namespace) -> None:
+    from reelkit.worker import SOCKET, Worker
+
+    Worker(Path(args.socket) if args.socket else SOCKET).serve()
+
+
+def _submit(args: argparse.Namespace) -> None:
+    import json
+
+    from reelkit.worker import SOCKET, request
+
+    overrides = {}
+    for item in args.set:
+        key, _, value = item.partition("=")
+        try:
+            overrides[key] = json.loads(value)
+        except ValueError:
+            overrides[key] = value
+    payload = {"file": str(Path(args.file).resolve()), "scene": args.scene, "quality": args.quality, "config": overrides}
+    reply = request(payload, Path(args.socket) if args.socket else SOCKET)
+    if not reply["ok"]:
+        sys.exit(reply["error"])
+    print(reply["output"])
+
+
+def _queue(args: argparse.Namespace) -> None:
+    from reelkit.batch import Job, parse_size
+    from reelkit.jobs import add_job, clear, connect, run_queue, status
+
+    db = connect()
+    if args.action == "add":
+        for spec in args.jobs:
+            job = Job.parse(spec)
+            job_id = add_job(db, job.file, job.scene, args.quality or "", args.aspect or "", args.priority, args.retries + 1)
+            print(f"{job_id}  {spec}")
+    elif args.action == "run":
+        try:
+            run_queue(db, parse_size(args.budget) if args.budget else None, args.cores, stop_when_empty=not args.forever)
+        except RuntimeError as exc:
+            sys.exit(str(exc))
+        if db.execute("SELECT 1 FROM jobs WHERE state = 'failed'").fetchone():
+            sys.exit(1)
+    elif args.action == "status":
+        for row in status(db):
+            target = f"{row['file']}:{row['scene']}"
+            options = " ".join(filter(None, (row["quality"] and f"-q {row['quality']}", row["aspect"])))
+            detail = row["error"] if row["state"] == "failed" else row["output"] or ""
+            print(f"{row['id']:>4} {row['state']:<8} p{row['priority']:<3} {row['attempts']}/{row['max_attempts']} "
+                  f"{target:<48} {options:<12} {detail}")
+    elif args.action == "clear":
+        print(f"removed {clear(db, ('done',) if args.done else ('done', 'failed', 'queued'))} jobs")
+
+
+def _store(args: argparse.Namespace) -> None:
+    from reelkit.batch import parse_size
+    from reelkit.store import ArtifactStore
+
+    store = ArtifactStore()
+    if args.action == "gc":
+        older_than = args.older_than * 86400 if args.older_than is not None else None
+        result = store.gc(parse_size(args.max_size) if args.max_size else None, older_than)
+        print(f"removed {result.removed} artifacts ({result.freed / 2**20:.0f} MB) and {result.orphans} orphans, "
+              f"kept {result.kept} ({result.size / 2**20:.0f} MB)")
+        return
+    stats = store.stats()
+    print(f"{stats['root']}: {stats['size'] / 2**20:.0f} of {stats['max_size'] / 2**20:.0f} MB")
+    for kind, entry in stats["kinds"].items():
+        print(f"  {kind:<8} {entry['count']:>6} artifacts {entry['size'] / 2**20:>8.0f} MB {entry['hits']:>6} hits")
+
+
+def _deliver(args: argparse.Namespace) -> None:
+    from reelkit.deliver import PROFILES, deliver, with_settings
+
+    settings: dict[str, dict[str, str]] = {}
+    for item in args.set:
+        key, _, value = item.partition("=")
+        name, _, option = key.partition(".")
+        settings.setdefault(name, {})[option] = value
+    names = args.profiles.split(",")
+    unknown = [n for n in names + list(settings) if n not in PROFILES]
+    if unknown:
+        sys.exit(f"Unknown profiles {unknown}, expected some of {list(PROFILES)}")
+    profiles = [with_settings(PROFILES[n], settings.get(n, {})) for n in names]
+    output_dir = Path(args.output_dir).resolve() if args.output_dir else None
+    for output in deliver(Path(args.file), args.scene, profiles, args.quality, output_dir):
+        print(output)
+
+
+def _check(args: argparse.Namespace) -> None:
+    from reelkit.discovery import discover
+    from reelkit.preflight import check_file
+
+    scenes: dict[str, list[str]] = {}
+    for scene in discover(args.patterns):
+        scenes.setdefault(scene.file, []).append(scene.name)
+    issues = [issue for file, names in scenes.items() for issue in check_file(Path(file), names)]
+    for issue in issues:
+        print(issue)
+    errors = sum(issue.error for issue in issues)
+    print(f"{sum(map(len, scenes.values()))} scenes checked: {errors} errors, {len(issues) - errors} warnings")
+    if errors:
+        sys.exit(1)
+
+
+def _watch(args: argparse.Namespace) -> None:
+    from reelkit.watch import serve
+
+    serve([Path(f) for f in args.files], args.quality, args.scene, args.port, args.open)
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog="python -m reelkit")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    chunk = commands.add_parser("chunk", help="render one scene in parallel frame ranges and stitch them")
+    chunk.add_argument("file")
+    chunk.add_argument("scene")
+    chunk.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    chunk.add_argument("--chunks", type=int, default=None, help="number of frame ranges (default: one per worker)")
+    chunk.add_argument("--beats", action="store_true", help="cut on the scene's beat boundaries instead (every chunk still replays from the start)")
+    chunk.add_argument("--sections", action="store_true", help="render independent sections in separate workers")
+    chunk.add_argument("-q", "--quality", choices=("l", "m", "h", "p", "k"), default=None)
+    chunk.add_argument("--resolution", default=None, help="W,H, overrides the quality's size")
+    chunk.add_argument("-o", "--output", default=None)
+    chunk.set_defaults(func=_chunk)
+
+    aspects = commands.add_parser("aspects", help="render several aspect ratios from one construct pass")
+    aspects.add_argument("file")
+    aspects.add_argument("scene")
+    aspects.add_argument("--aspects", default="9:16,1:1,16:9")
+    aspects.add_argument("--resolution", default=None, help="design resolution W,H for scenes that do not set one")
+    aspects.add_argument("-q", "--quality", choices=("l", "m", "h", "p", "k"), default=None)
+    aspects.set_defaults(func=_aspects)
+
+    preview = commands.add_parser("preview", help="render a low-res proxy and record its frames for promotion")
+    preview.add_argument("file")
+    preview.add_argument("scene")
+    preview.add_argument("--scale", type=float, default=0.25, help="fraction of the final resolution")
+    preview.add_argument("--step", type=int, default=4, help="rasterize every N-th frame; every frame is recorded for promotion")
+    preview.add_argument("--promote", choices=("no", "background"), default="no")
+    preview.set_defaults(func=_preview)
+
+    promote = commands.add_parser("promote", help="render a recorded preview at full quality")
+    promote.add_argument("log_dir", help="media/proxies/<Scene>")
+    promote.add_argument("-o", "--output", default=None)
+    promote.set_defaults(func=_promote)
+
+    subtitles = commands.add_parser(
+        "subtitles",
+        help="write SRT/WebVTT captions from a dry run (scenes without a caption_schedule still run construct)",
+    )
+    subtitles.add_argument("file")
+    subtitles.add_argument("scene")
+    subtitles.add_argument("--formats", default="srt,vtt")
+    subtitles.add_argument("--frame-rate", type=float, default=None, help="frame rate the video is rendered at, over the scene file's own")
+    subtitles.add_argument("-o", "--output-dir", default=None, help="default: media/subtitles next to the scene file")
+    subtitles.set_defaults(func=_subtitles)
+
+    render = commands.add_parser("render", help="render scenes and write a telemetry report for each")
+    render.add_argument("file")
+    render.add_argument("scenes", nargs="+", metavar="scene")
+    render.add_argument("-q", "--quality", choices=("l", "m", "h", "p", "k"), default=None)
+    render.add_argument("--report-dir", default=None, help="default: media/telemetry next to the scene file")
+    render.add_argument("--memory", action="store_true", help="also sample RSS and live mobjects per play")
+    render.add_argument("--trace", action="store_true", help="--memory plus tracemalloc's top allocators")
+    render.set_defaults(func=_render)
+
+    list_ = commands.add_parser("list", help="list scenes by parsing the scene files (no manim import)")
+    list_.add_argument("patterns", nargs="*", help="only file:Scene keys containing any of these")
+    list_.add_argument("--all", action="store_true", help="include base classes without construct")
+    list_.add_argument("--json", action="store_true")
+    list_.set_defaults(func=_list)
+
+    bench = commands.add_parser("bench", help="benchmark every scene at low resolution against a baseline")
+    bench.add_argument("--only", default=None, help="only scenes whose file:Scene key contains this")
+    bench.add_argument("--height", type=int, default=480, help="pixel height; width follows each scene's aspect")
+    bench.add_argument("--fps", type=int, default=15)
+    bench.add_argument("--portfolio-sizes", default="250,1000,4000", help="rows of synthetic PortfolioComparison data")
+    bench.add_argument("--threshold", type=float, default=0.15, help="allowed growth before a regression")
+    bench.add_argument("--timeout", type=float, default=900, help="seconds per scene")
+    bench.add_argument("--baseline", default=None, help="default: .reelkit/bench-baseline.json")
+    bench.add_argument("--update-baseline", action="store_true")
+    bench.set_defaults(func=_bench)
+
+    batch = commands.add_parser("batch", help="render many scenes concurrently within a memory budget")
+    batch.add_argument("jobs", nargs="+", metavar="file:Scene")
+    batch.add_argument("-q", "--quality", choices=("l", "m", "h", "p", "k"), default=None)
+    batch.add_argument("--budget", default=None, help="e.g. 12G (default: REEL_MEMORY_BUDGET or 80%% of free memory)")
+    batch.add_argument("--workers", type=int, default=os.cpu_count() or 1)
+    batch.set_defaults(func=_batch)
+
+    worker = commands.add_parser("worker", help="keep manim loaded and render jobs sent with submit")
+    worker.add_argument("--socket", default=None, help="default: .reelkit/worker.sock")
+    worker.set_defaults(func=_worker)
+
+    submit = commands.add_parser("submit", help="render a scene on a running worker")
+    submit.add_argument("file")
+    submit.add_argument("scene")
+    submit.add_argument("-q", "--quality", choices=("l", "m", "h", "p", "k"), default=None)
+    submit.add_argument("--set", action="append", default=[], metavar="KEY=VALUE", help="config override, repeatable")
+    submit.add_argument("--socket", default=None)
+    submit.set_defaults(func=_submit)
+
+    timeline = commands.add_parser("timeline", help="dump the play-by-play timeline as JSON without rendering")
+    timeline.add_argument("file")
+    timeline.add_argument("scenes", nargs="+", metavar="scene")
+    timeline.add_argument("--platform", choices=("shorts", "reels", "tiktok"), default=None)
+    timeline.add_argument("--max-seconds", type=float, default=None, help="length limit, overrides --platform")
+    timeline.add_argument("-o", "--output", default=None, help="write the JSON here instead of stdout")
+    timeline.set_defaults(func=_timeline)
+
+    queue = commands.add_parser("queue", help="a persistent render queue with priorities and retries")
+    queue_actions = queue.add_subparsers(dest="action", required=True)
+    queue_add = queue_actions.add_parser("add", help="queue scenes, or queue them again")
+    queue_add.add_argument("jobs", nargs="+", metavar="file:Scene")
+    queue_add.add_argument("-q", "--quality", choices=("l", "m", "h", "p", "k"), default=None)
+    queue_add.add_argument("--aspect", default=None, help="render this aspect ratio, e.g. 1:1")
+    queue_add.add_argument("--priority", type=int, default=0, help="higher runs first")
+    queue_add.add_argument("--retries", type=int, default=2)
+    queue_run = queue_actions.add_parser("run", help="render queued jobs until none are left")
+    queue_run.add_argument("--budget", default=None, help="e.g. 12G (default: REEL_MEMORY_BUDGET or 80%% of free memory)")
+    queue_run.add_argument("--cores", type=float, default=None, help="default: every core")
+    queue_run.add_argument("--forever", action="store_true", help="keep waiting for new jobs")
+    queue_actions.add_parser("status", help="list jobs, running and queued first")
+    queue_clear = queue_actions.add_parser("clear", help="remove finished, failed and queued jobs")
+    queue_clear.add_argument("--done", action="store_true", help="only remove finished jobs")
+    queue.set_defaults(func=_queue)
+
+    deliver = commands.add_parser("deliver", help="encode master, MP4, WebM and preview from one raster pass")
+    deliver.add_argument("file")
+    deliver.add_argument("scene")
+    deliver.add_argument("-q", "--quality", choices=("l", "m", "h", "p", "k"), default=None)
+    deliver.add_argument("--profiles", default="master,mp4,webm,gif", help="of master, mp4, webm, gif, webp")
+    deliver.add_argument("--set", action="append", default=[], metavar="PROFILE.KEY=VALUE",
+                         help="height, frame_rate, seconds, bitrate, codec, pix_fmt or a codec option; repeatable")
+    deliver.add_argument("-o", "--output-dir", default=None, help="default: media/deliverables/<Scene>")
+    deliver.set_defaults(func=_deliver)
+
+    preflight = commands.add_parser("preflight", help="check images, data files and fonts of scenes before rendering")
+    preflight.add_argument("patterns", nargs="*", help="only file:Scene keys containing any of these")
+    preflight.set_defaults(func=_check)
+
+    watch = commands.add_parser("watch", help="re-render the edited scene or section and show it in a browser")
+    watch.add_argument("files", nargs="+", metavar="file")
+    watch.add_argument("-q", "--quality", choices=("l", "m", "h", "p", "k"), default="l")
+    watch.add_argument("--scene", default=None, help="scene to render for edits outside every scene")
+    watch.add_argument("--port", type=int, default=8765)
+    watch.add_argument("--open", action="store_true", help="open the page in a browser")
+    watch.set_defaults(func=_watch)
+
+    store = commands.add_parser("store", help="inspect or shrink the shared partial movie store")
+    store_actions = store.add_subparsers(dest="action", required=True)
+    store_actions.add_parser("stats", help="size, artifacts and hits per kind")
+    store_gc = store_actions.add_parser("gc", help="drop orphans, then least recently used artifacts over the size")
+    store_gc.add_argument("--max-size", default=None, help="e.g. 5G (default: REEL_STORE_SIZE or 20G)")
+    store_gc.add_argument("--older-than", type=float, default=None, metavar="DAYS", help="also drop artifacts unused this long")
+    store.set_defaults(func=_store)
+
+    return parser
+
+
+# Commands that render a file's scenes; batch and queue check their own jobs.
+PREFLIGHTED = {"chunk", "aspects", "preview", "render", "deliver", "submit"}
+
+
+def main(argv: list[str] | None = None) -> None:
+    args = build_parser().parse_args(argv)
+    if args.command in PREFLIGHTED:
+        _preflight([(args.file, getattr(args, "scenes", None) or [args.scene])])
+    args.func(args)
+
+
+if __name__ == "__main__":
+    main()
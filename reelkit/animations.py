@@ -0,0 +1,146 @@
+"""
+Animations that drive many moving parts from arrays in a single play:
+
+    flow = PacketFlow.staggered(paths, count=12, stagger=0.25, travel_time=0.45)
+    self.play(flow)
+    self.play(Jitter(box, amplitude=(0.05, 0.02), frequency=10), run_time=2.8)
+"""
+from __future__ import annotations
+
+from typing import Callable, Sequence
+
+import numpy as np
+from manim import YELLOW, Animation, ParsableManimColor, linear
+
+from reelkit.mobjects import DotBatch
+
+
+class _Polyline:
+    """Arc-length lookup along a polyline."""
+
+    def __init__(self, points):
+        self.points = np.asarray(points, dtype=float).reshape(-1, 3)
+        self.segments = np.diff(self.points, axis=0)
+        self.lengths = np.linalg.norm(self.segments, axis=1)
+        self.cumulative = np.concatenate([[0.0], np.cumsum(self.lengths)])
+        self.length = self.cumulative[-1]
+
+    def at(self, progress: np.ndarray) -> np.ndarray:
+        if len(self.segments) == 0:
+            return np.repeat(self.points[:1], len(progress), axis=0)
+        s = np.clip(progress, 0, 1) * self.length
+        i = np.clip(np.searchsorted(self.cumulative, s, side="right") - 1, 0, len(self.segments) - 1)
+        f = np.divide(s - self.cumulative[i], self.lengths[i], out=np.zeros_like(s), where=self.lengths[i] > 0)
+        return self.points[i] + f[:, None] * self.segments[i]
+
+
+class PacketFlow(Animation):
+    """Dots travelling along polylines, all of them in one animation.
+
+    ``schedule`` holds one ``(path_index, start, duration)`` row per packet,
+    in seconds from the start of the play. Packets move at constant speed
+    along their path and are only drawn while in flight.
+    """
+
+    def __init__(
+        self,
+        paths: Sequence,
+        schedule,
+        radius: float = 0.08,
+        color: ParsableManimColor = YELLOW,
+        packet_rate_func: Callable[[float], float] = linear,
+        **kwargs,
+    ):
+        self.paths = [_Polyline(p) for p in paths]
+        schedule = np.asarray(schedule, dtype=float).reshape(-1, 3)
+        self.path_index = schedule[:, 0].astype(int)
+        self.starts = schedule[:, 1]
+        self.durations = np.maximum(schedule[:, 2], 1e-9)
+        self.radius = radius
+        self.packet_rate_func = packet_rate_func
+        # Built once; rate functions take one float at a time.
+        self.packet_rates = np.vectorize(packet_rate_func, otypes=[float])
+        kwargs.setdefault("run_time", float(np.max(self.starts + self.durations, initial=0.0)))
+        kwargs.setdefault("rate_func", linear)
+        super().__init__(
+            DotBatch(np.empty((0, 3)), radius=radius, color=color),
+            introducer=True,
+            remover=True,
+            **kwargs,
+        )
+
+    @classmethod
+    def staggered(cls, paths: Sequence, count: int, stagger: float = 0.25, travel_time: float = 0.45,
+                  **kwargs) -> PacketFlow:
+        """``count`` packets cycling through ``paths``, one every ``stagger`` seconds."""
+        k = np.arange(count)
+        schedule = np.stack([k % len(paths), k * stagger, np.full(count, travel_time)], axis=1)
+        return cls(paths, schedule, **kwargs)
+
+    def positions(self, t: float) -> np.ndarray:
+        progress = (t - self.starts) / self.durations
+        active = (progress >= 0) & (progress <= 1)
+        progress = self.packet_rates(progress[active])
+        index = self.path_index[active]
+        centers = np.empty((len(index), 3))
+        for p in np.unique(index):
+            mask = index == p
+            centers[mask] = self.paths[p].at(progress[mask])
+        return centers
+
+    def interpolate_mobject(self, alpha: float) -> None:
+        t = self.rate_func(alpha) * self.run_time
+        self.mobject.set_centers(self.positions(t), self.radius)
+
+
+class Jitter(Animation):
+    """Shake a mobject in place and bring it back where it started.
+
+    The offset is a function of time: two sine waves per axis with seeded
+    phases, scaled by ``amplitude`` (one value or an ``(x, y)`` pair),
+    damped by ``exp(-decay * t)`` and eased in and out over the first and
+    last ``ramp`` of the run. Each frame shifts the mobject by the change in
+    offset, so nothing is copied and other animations on the same mobject
+    still apply.
+    """
+
+    def __init__(
+        self,
+        mobject,
+        amplitude: float | tuple[float, float] = 0.05,
+        frequency: float = 10.0,
+        decay: float = 0.0,
+        seed: int = 0,
+        ramp: float = 0.05,
+        **kwargs,
+    ):
+        amplitude = np.broadcast_to(np.asarray(amplitude, dtype=float), 2)
+        self.amplitude = np.array([*amplitude, 0.0])
+        self.frequency = frequency
+        self.decay = decay
+        self.ramp = ramp
+        self.phases = np.random.default_rng(seed).uniform(0, 2 * np.pi, (2, 3))
+        self.applied = np.zeros(3)
+        kwargs.setdefault("rate_func", linear)
+        super().__init__(mobject, **kwargs)
+
+    def create_starting_mobject(self):
+        # Offsets are relative; no copy of the mobject is needed.
+        return self.mobject
+
+    def offset(self, t: float, alpha: float) -> np.ndarray:
+        w = 2 * np.pi * self.frequency * t
+        wave = (np.sin(w + self.phases[0]) + 0.5 * np.sin(1.7 * w + self.phases[1])) / 1.5
+        ramp = max(self.ramp, 1e-9)
+        envelope = np.exp(-self.decay * t) * min(1.0, alpha / ramp, (1 - alpha) / ramp)
+        return self.amplitude * envelope * wave
+
+    def begin(self) -> None:
+        self.applied = np.zeros(3)
+        super().begin()
+
+    def interpolate_mobject(self, alpha: float) -> None:
+        alpha = self.rate_func(alpha)
+        target = self.offset(alpha * self.run_time, alpha)
+        self.mobject.shift(target - self.applied)
+        self.applied = target
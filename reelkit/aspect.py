@@ -0,0 +1,274 @@
+"""
+Render one scene definition in several aspect ratios in a single run.
+
+Construct runs once (text shaping, image decoding and geometry are shared);
+every frame is then rasterized once per output aspect by its own camera and
+encoded by its own file writer. Each output frame is the scene's design
+frame reshaped to the output aspect at the same area: a 9:16 design grows
+wider and shorter in 1:1 and 16:9, so content near its top and bottom edges
+falls outside unless it is anchored. Mobjects registered as layout anchors
+are moved towards the matching side of the output frame while they are drawn
+(anchors that are not on screen are left alone):
+
+    self.anchor(caption, UP)         # stays glued to the top edge
+    self.anchor(legend, DL)          # bottom-left corner
+    self.anchor(chart, 0.5 * RIGHT)  # halfway to the right edge
+
+    python -m reelkit aspects Bloom3/bloom3.py SpaceEconomyIntro --aspects 9:16,1:1,16:9
+"""
+from __future__ import annotations
+
+import zlib
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Iterator
+
+import numpy as np
+from manim import UP, Mobject, Scene, config, logger, tempconfig
+from manim.camera.camera import Camera
+from manim.renderer.cairo_renderer import CairoRenderer
+from manim.scene.scene_file_writer import SceneFileWriter
+from manim.utils.hashing import get_hash_from_play_call
+from manim.utils.iterables import list_update
+
+from reelkit.runner import QUALITIES, load_scene_class, scene_environment
+
+ASPECTS = {
+    "9:16": (9, 16),
+    "1:1": (1, 1),
+    "4:5": (4, 5),
+    "16:9": (16, 9),
+}
+
+
+class AnchoredScene(Scene):
+    def anchor(self, mob: Mobject, direction: np.ndarray = UP) -> Mobject:
+        # Kept on the scene (not the class) so section checkpoints carry it.
+        if not hasattr(self, "layout_anchors"):
+            self.layout_anchors: list[tuple[Mobject, np.ndarray]] = []
+        self.layout_anchors.append((mob, np.asarray(direction, dtype=float)))
+        return mob
+
+
+class VariantWriter(SceneFileWriter):
+    # Every variant writes under its own name, whatever -o says.
+    force_output_as_scene_name = True
+
+
+@dataclass
+class Variant:
+    aspect: str
+    pixel_width: int
+    pixel_height: int
+    frame_width: float
+    frame_height: float
+    design_width: float
+    design_height: float
+    camera: Any = None
+    file_writer: Any = None
+    static_image: np.ndarray | None = field(default=None, repr=False)
+
+    @property
+    def tag(self) -> str:
+        return self.aspect.replace(":", "x")
+
+    def offset(self, direction: np.ndarray) -> np.ndarray:
+        return np.array([
+            direction[0] * (self.frame_width - self.design_width) / 2,
+            direction[1] * (self.frame_height - self.design_height) / 2,
+            0.0,
+        ])
+
+    @contextmanager
+    def config(self) -> Iterator[None]:
+        # File writers read sizes from the global config when they open streams.
+        keys = ("pixel_width", "pixel_height", "frame_width", "frame_height")
+        saved = {k: config[k] for k in keys}
+        for k in keys:
+            config[k] = getattr(self, k)
+        try:
+            yield
+        finally:
+            for k, v in saved.items():
+                config[k] = v
+
+
+def make_variant(aspect: str) -> Variant:
+    if aspect not in ASPECTS:
+        raise ValueError(f"Unknown aspect {aspect!r}, expected one of {list(ASPECTS)}")
+    aw, ah = ASPECTS[aspect]
+    ratio = aw / ah
+    # Keep the short side of the current quality, e.g. 1080 for 1080x1920.
+    short = min(config.pixel_width, config.pixel_height)
+    if ratio < 1:
+        pixel_width, pixel_height = short, round(short / ratio / 2) * 2
+    else:
+        pixel_width, pixel_height = round(short * ratio / 2) * 2, short
+
+    # The camera keeps frame_width and derives the height from the pixel
+    # shape, which is what --resolution 1080,1920 scenes rely on.
+    design_width = config.frame_width
+    design_height = design_width * config.pixel_height / config.pixel_width
+    # Same area as the design, so both axes change and UP/DOWN anchors move
+    # too; containing the whole design would only ever add width or height.
+    frame_width = float(np.sqrt(design_width * design_height * ratio))
+    return Variant(
+        aspect=aspect,
+        pixel_width=pixel_width,
+        pixel_height=pixel_height,
+        frame_width=frame_width,
+        frame_height=frame_width / ratio,
+        design_width=design_width,
+        design_height=design_height,
+    )
+
+
+class MultiAspectRenderer(CairoRenderer):
+    def __init__(self, aspects: tuple[str, ...] = ("9:16", "1:1", "16:9"), **kwargs):
+        super().__init__(**kwargs)
+        self.aspects = aspects
+        self.variants: list[Variant] = []
+
+    def init_scene(self, scene):
+        for aspect in self.aspects:
+            variant = make_variant(aspect)
+            with variant.config():
+                variant.camera = Camera()
+                variant.file_writer = VariantWriter(self, f"{scene.__class__.__name__}_{variant.tag}")
+            self.variants.append(variant)
+        # The scene talks to the first variant (background color, sections).
+        self.camera = self.variants[0].camera
+        self.file_writer = self.variants[0].file_writer
+
+    @staticmethod
+    def live_anchors(scene) -> list[tuple[Mobject, np.ndarray]]:
+        # Anchors stay registered after their mobject leaves the scene.
+        anchors = getattr(scene, "layout_anchors", [])
+        if not anchors:
+            return []
+        shown = {id(m) for m in scene.get_mobject_family_members()}
+        return [(mob, d) for mob, d in anchors if id(mob) in shown]
+
+    @contextmanager
+    def anchored(self, scene, variant: Variant, anchors: list[tuple[Mobject, np.ndarray]]) -> Iterator[None]:
+        shifts = [(mob, variant.offset(d)) for mob, d in anchors]
+        for mob, delta in shifts:
+            mob.shift(delta)
+        try:
+            yield
+        finally:
+            for mob, delta in shifts:
+                mob.shift(-delta)
+
+    def variant_hash(self, scene, variant: Variant, base: str) -> str:
+        # Every registered anchor: mobjects a play introduces join the scene
+        # only after the hash is taken.
+        offsets = [tuple(np.round(variant.offset(d), 6)) for _, d in getattr(scene, "layout_anchors", [])]
+        layout = zlib.crc32(repr((variant.frame_width, variant.frame_height, offsets)).encode())
+        return f"{base}_{layout}"
+
+    def play(self, scene, *args, **kwargs):
+        self.skip_animations = self._original_skipping_status
+        self.update_skipping_status()
+        scene.compile_animation_data(*args, **kwargs)
+
+        hashes = [None] * len(self.variants)
+        if self.skip_animations:
+            self.time += scene.duration
+        else:
+            if config["disable_caching"]:
+                base = f"uncached_{self.num_plays:05}"
+            else:
+                # Hashing serializes every mobject; do it once for all variants.
+                base = get_hash_from_play_call(scene, self.camera, scene.animations, scene.mobjects)
+            hashes = [self.variant_hash(scene, v, base) for v in self.variants]
+            cached = not config["disable_caching"] and all(
+                v.file_writer.is_already_cached(h) for v, h in zip(self.variants, hashes)
+            )
+            if cached:
+                logger.info("Animation %d : Using cached data for every aspect", self.num_plays)
+                self.skip_animations = True
+                self.time += scene.duration
+        for variant, h in zip(self.variants, hashes):
+            variant.file_writer.add_partial_movie_file(h)
+        self.animations_hashes.append(hashes[0])
+
+        for variant in self.variants:
+            with variant.config():
+                variant.file_writer.begin_animation(not self.skip_animations)
+        scene.begin_animations()
+
+        self.save_static_frame_data(scene, scene.static_mobjects)
+
+        if scene.is_current_animation_frozen_frame():
+            self.update_frame(scene, mobjects=scene.moving_mobjects)
+            self.freeze_current_frame(scene.duration)
+        else:
+            scene.play_internal()
+        for variant in self.variants:
+            variant.file_writer.end_animation(not self.skip_animations)
+
+        self.num_plays += 1
+
+    def save_static_frame_data(self, scene, static_mobjects):
+        self.static_image = None
+        for variant in self.variants:
+            variant.static_image = None
+        if not static_mobjects:
+            return None
+        self.update_frame(scene, mobjects=static_mobjects)
+        for variant in self.variants:
+            variant.static_image = np.array(variant.camera.pixel_array)
+        self.static_image = self.variants[0].static_image
+        return self.static_image
+
+    def update_frame(self, scene, mobjects=None, include_submobjects=True, ignore_skipping=True, **kwargs):
+        if self.skip_animations and not ignore_skipping:
+            return
+        if not mobjects:
+            mobjects = list_update(scene.mobjects, scene.foreground_mobjects)
+        kwargs["include_submobjects"] = include_submobjects
+        anchors = self.live_anchors(scene)
+
+        primary = self.variants[0].camera
+        for variant in self.variants:
+            camera = variant.camera
+            if camera is not primary and camera.background_color is not primary.background_color:
+                camera.background_color = primary.background_color
+            # play_internal clears self.static_image when a play ends.
+            if self.static_image is not None and variant.static_image is not None:
+                camera.set_frame_to_background(variant.static_image)
+            else:
+                camera.reset()
+            with self.anchored(scene, variant, anchors):
+                camera.capture_mobjects(mobjects, **kwargs)
+
+    def add_frame(self, frame, num_frames: int = 1):
+        if self.skip_animations:
+            return
+        self.time += num_frames / self.camera.frame_rate
+        # Each variant writes its own raster of the frame.
+        for variant in self.variants:
+            variant.file_writer.write_frame(np.array(variant.camera.pixel_array), num_frames=num_frames)
+
+    def scene_finished(self, scene):
+        if not self.num_plays:
+            return super().scene_finished(scene)
+        for variant in self.variants:
+            with variant.config():
+                variant.file_writer.finish()
+
+
+def render_aspects(path: Path, scene_name: str, aspects: tuple[str, ...],
+                   resolution: tuple[int, int] | None = None, quality: str | None = None) -> list[Path]:
+    path = Path(path).resolve()
+    overrides = {"pixel_width": resolution[0], "pixel_height": resolution[1]} if resolution else {}
+    with scene_environment(path), tempconfig({}):
+        if quality:
+            config.quality = QUALITIES[quality]
+        config.update(overrides)  # an explicit resolution wins over the quality's
+        scene_class = load_scene_class(path, scene_name)
+        renderer = MultiAspectRenderer(aspects)
+        scene_class(renderer=renderer).render()
+        return [v.file_writer.movie_file_path.resolve() for v in renderer.variants]
@@ -0,0 +1,151 @@
+"""
+Render many scenes at once without running out of memory.
+
+Every job runs ``python -m reelkit render`` in its own process. Jobs start
+while the peak memory expected from the ones already running, plus the
+new one, fits the budget. Each job's expectation is the peak RSS it
+reached last time (kept in ``.reelkit/memory.json``) plus a safety margin,
+or DEFAULT_ESTIMATE before it has run once. The biggest jobs start first;
+smaller ones fill the gaps, but once a job has waited MAX_WAIT seconds for
+room, no new job starts until it fits, so a big job is never starved by a
+stream of small ones.
+
+    python -m reelkit batch Bloom4/new_Bloom4.py:TitleScene Bloom3/bloom3.py:SpaceEconomyIntro \\
+        --budget 12G --workers 6 -q l
+
+The budget defaults to REEL_MEMORY_BUDGET, or 80% of the memory available
+when the batch starts.
+"""
+from __future__ import annotations
+
+import json
+import os
+import subprocess
+import sys
+import time
+from dataclasses import dataclass
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parents[1]
+ESTIMATES = ROOT / ".reelkit" / "memory.json"
+DEFAULT_ESTIMATE = 2 * 2**30
+MARGIN = 1.15
+MAX_WAIT = 60.0  # seconds a job may be passed over before the others wait for it
+
+
+@dataclass
+class Job:
+    file: str
+    scene: str
+    quality: str | None = None
+
+    @property
+    def key(self) -> str:
+        return f"{self.file}:{self.scene}:{self.quality or '-'}"
+
+    @classmethod
+    def parse(cls, spec: str, quality: str | None = None) -> Job:
+        file, _, scene = spec.rpartition(":")
+        if not file or not scene:
+            raise ValueError(f"Expected <file>:<Scene>, got {spec!r}")
+        return cls(file, scene, quality)
+
+
+@dataclass
+class Result:
+    job: Job
+    returncode: int
+    peak_rss: int
+    wall: float
+
+
+def parse_size(text: str) -> int:
+    """``"8G"``, ``"512M"``, ``"2.5GiB"`` or plain bytes."""
+    text = text.strip().upper().removesuffix("IB").removesuffix("B")
+    units = {"K": 2**10, "M": 2**20, "G": 2**30, "T": 2**40}
+    if text and text[-1] in units:
+        return int(float(text[:-1]) * units[text[-1]])
+    return int(text)
+
+
+def available_memory() -> int:
+    try:
+        with open("/proc/meminfo", encoding="ascii") as fp:
+            for line in fp:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except OSError:
+        pass
+    return os.sysconf("SC_PAGE_SIZE") * os.sysconf("SC_PHYS_PAGES")
+
+
+def default_budget() -> int:
+    budget = os.environ.get("REEL_MEMORY_BUDGET")
+    return parse_size(budget) if budget else int(available_memory() * 0.8)
+
+
+def load_estimates(path: Path = ESTIMATES) -> dict[str, int]:
+    return json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+
+
+def save_estimates(estimates: dict[str, int], path: Path = ESTIMATES) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_text(json.dumps(estimates, indent=2, sort_keys=True), encoding="utf-8")
+    tmp.replace(path)
+
+
+def _command(job: Job) -> list[str]:
+    # Resolved here: the child runs from the repository root.
+    command = [sys.executable, "-m", "reelkit", "render", str(Path(job.file).resolve()), job.scene]
+    return command + (["-q", job.quality] if job.quality else [])
+
+
+def run_batch(jobs: list[Job], budget: int | None = None, workers: int | None = None,
+              poll: float = 0.2, max_wait: float = MAX_WAIT) -> list[Result]:
+    budget = budget or default_budget()
+    workers = workers or os.cpu_count() or 1
+    estimates = load_estimates()
+
+    def expected(job: Job) -> int:
+        return int(estimates.get(job.key, DEFAULT_ESTIMATE) * MARGIN)
+
+    pending = sorted(jobs, key=expected, reverse=True)
+    running: dict[int, tuple[Job, subprocess.Popen, float]] = {}
+    results: list[Result] = []
+    blocked: dict[int, float] = {}  # id(job): when it was first passed over
+
+    while pending or running:
+        reserved = sum(expected(job) for job, _, _ in running.values())
+        now = time.perf_counter()
+        for job in list(pending):
+            if len(running) >= workers:
+                break
+            # A job bigger than the whole budget still runs, but alone.
+            if running and reserved + expected(job) > budget:
+                since = blocked.setdefault(id(job), now)
+                if now - since >= max_wait:
+                    # Let the running jobs drain until this one fits.
+                    break
+                continue
+            blocked.pop(id(job), None)
+            print(f"starting {job.file}:{job.scene} (expects {expected(job) / 2**20:.0f} MB, "
+                  f"{(reserved + expected(job)) / 2**20:.0f}/{budget / 2**20:.0f} MB reserved)", file=sys.stderr)
+            proc = subprocess.Popen(_command(job), cwd=ROOT)
+            running[proc.pid] = (job, proc, time.perf_counter())
+            reserved += expected(job)
+            pending.remove(job)
+
+        time.sleep(poll)
+        for pid, (job, proc, started) in list(running.items()):
+            done, status, usage = os.wait4(pid, os.WNOHANG)
+            if not done:
+                continue
+            proc.returncode = os.waitstatus_to_exitcode(status)
+            del running[pid]
+            peak = usage.ru_maxrss * 1024  # KiB on Linux
+            results.append(Result(job, proc.returncode, peak, time.perf_counter() - started))
+            if proc.returncode == 0:
+                estimates[job.key] = peak
+                save_estimates(estimates)
+    return results
@@ -0,0 +1,110 @@
+"""
+Declarative timing for fixed-length scenes.
+
+A scene declares its beats once, as a class attribute, and the plan checks
+that they add up to the scene's total when the class is defined, before
+anything renders:
+
+    plan = BeatPlan(
+        8.5,
+        ("lead_in", 0.5),
+        ("caption", 4.5),
+        Beat("arrows", 1.5, overlap=1.5),   # starts with the caption's last 1.5 s
+        ("hold", 1.0),
+        ("pad", None),                      # absorbs whatever is left
+        ("fade", 0.25),
+    )
+
+    self.play(..., run_time=plan.span("caption", "arrows"))
+    plan.frame_ranges(60)  # [("lead_in", 0, 30), ("caption", 30, 300), ...]
+
+The frame ranges are where a render can be split between beats for
+parallel workers (``python -m reelkit chunk --beats``).
+"""
+from __future__ import annotations
+
+from dataclasses import dataclass
+from typing import Iterator
+
+EPSILON = 1e-6
+
+
+@dataclass
+class Beat:
+    name: str
+    duration: float | None  # None: fill the time left over
+    overlap: float = 0.0  # seconds before the previous beat ends
+    start: float = 0.0
+
+    @property
+    def end(self) -> float:
+        return self.start + (self.duration or 0.0)
+
+
+class BeatPlan:
+    def __init__(self, total: float, *beats: Beat | tuple):
+        self.total = total
+        self.beats = [b if isinstance(b, Beat) else Beat(*b) for b in beats]
+        names = [b.name for b in self.beats]
+        duplicates = {n for n in names if names.count(n) > 1}
+        if duplicates:
+            raise ValueError(f"Beat names must be unique, repeated: {sorted(duplicates)}")
+        fills = [b for b in self.beats if b.duration is None]
+        if len(fills) > 1:
+            raise ValueError(f"Only one beat can fill the remaining time, got {[b.name for b in fills]}")
+
+        end = self._layout()
+        if fills:
+            fills[0].duration = 0.0
+            end = self._layout()
+            if end > total + EPSILON:
+                raise ValueError(f"Beats take {end:.2f}s, {end - total:.2f}s over the {total}s total")
+            fills[0].duration = total - end
+            end = self._layout()
+        if abs(end - total) > EPSILON:
+            raise ValueError(f"Beats take {end:.2f}s but the total is {total}s")
+
+    def _layout(self) -> float:
+        cursor = 0.0
+        previous = None
+        for beat in self.beats:
+            if previous is not None and beat.overlap > (previous.duration or 0.0) + EPSILON:
+                raise ValueError(f"{beat.name!r} overlaps {beat.overlap}s, longer than {previous.name!r}")
+            # Overlapping beats hang off the previous beat; others follow everything.
+            beat.start = max(previous.end - beat.overlap, 0.0) if beat.overlap and previous else cursor
+            cursor = max(cursor, beat.end)
+            previous = beat
+        return cursor
+
+    def __getitem__(self, name: str) -> Beat:
+        for beat in self.beats:
+            if beat.name == name:
+                return beat
+        raise KeyError(f"No beat named {name!r}")
+
+    def __iter__(self) -> Iterator[Beat]:
+        return iter(self.beats)
+
+    def span(self, *names: str) -> float:
+        """Seconds from the first of ``names`` starting to the last ending."""
+        beats = [self[n] for n in names]
+        return max(b.end for b in beats) - min(b.start for b in beats)
+
+    def boundaries(self) -> list[float]:
+        """Times where no beat is in progress, so a render can be cut."""
+        cuts = {0.0, self.total}
+        for beat in self.beats:
+            if not any(b.start < beat.end - EPSILON and b.end > beat.end + EPSILON for b in self.beats):
+                cuts.add(round(beat.end, 9))
+        return sorted(cuts)
+
+    def frame_ranges(self, frame_rate: float) -> list[tuple[str, int, int]]:
+        """``(first beat name, first frame, end frame)`` between boundaries."""
+        cuts = self.boundaries()
+        ranges = []
+        for a, b in zip(cuts, cuts[1:]):
+            first, last = round(a * frame_rate), round(b * frame_rate)
+            if last > first:
+                name = next(beat.name for beat in self.beats if beat.end > a + EPSILON)
+                ranges.append((name, first, last))
+        return ranges
@@ -0,0 +1,184 @@
+"""
+Render benchmarks for every reel scene in the repository.
+
+Each scene renders in its own process at a fixed low resolution with
+caching off, into a throwaway media folder, so runs are comparable and
+peak RSS is the scene's own. PortfolioComparison (Bloom2/adreel2.py) runs
+on synthetic CSVs of increasing length instead of the real data:
+
+    python -m reelkit bench                       # compare with the baseline
+    python -m reelkit bench --only Bloom4 --update-baseline
+
+Results are compared with ``.reelkit/bench-baseline.json``; a scene whose
+render time or peak RSS grew by more than the threshold is a regression
+and makes the command exit non-zero.
+"""
+from __future__ import annotations
+
+import csv
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from datetime import date, timedelta
+from pathlib import Path
+
+import numpy as np
+
+from reelkit.discovery import discover
+
+ROOT = Path(__file__).resolve().parents[1]
+BASELINE = ROOT / ".reelkit" / "bench-baseline.json"
+
+# Scene files in the suite. Bloom3/test.py is a scratch file and
+# adreel2.py needs data, so it runs separately on synthetic series.
+SUITE = (
+    "Bloom2/Bloom2.py",
+    "Bloom2/new_Bloom2.py",
+    "Bloom3/bloom3.py",
+    "Bloom3/asa.py",
+    "Bloom4/new_Bloom4.py",
+    "Bloom4/cro_story.py",
+)
+PORTFOLIO = ("Bloom2/adreel2.py", "PortfolioComparison")
+PORTFOLIO_SIZES = (250, 1000, 4000)
+
+# Metrics that count as a regression when they grow past the threshold.
+COMPARED = ("render", "peak_rss")
+
+
+def synthetic_portfolio(path: Path, rows: int, seed: int = 0) -> Path:
+    """Write a CSV in the shape adreel2 reads: two cumulative return series."""
+    rng = np.random.default_rng(seed)
+    portfolio = np.cumsum(rng.normal(0.08, 1.2, rows))
+    spy = np.cumsum(rng.normal(0.04, 0.9, rows))
+    start = date(2015, 1, 1)
+    with path.open("w", newline="", encoding="utf-8") as fp:
+        writer = csv.writer(fp)
+        writer.writerow(["Date", "Cumulative Portfolio Return", "Cumulative S&P 500 Index (SPY) Return"])
+        for i in range(rows):
+            writer.writerow([(start + timedelta(days=i)).isoformat(), f"{portfolio[i]:.4f}", f"{spy[i]:.4f}"])
+    return path
+
+
+def _child(args: list[str], env: dict[str, str] | None = None, timeout: float | None = None) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-m", "reelkit.bench", *args],
+        cwd=ROOT,
+        env={**os.environ, **(env or {})},
+        capture_output=True,
+        text=True,
+        timeout=timeout,
+    )
+    if result.returncode != 0:
+        tail = result.stderr.strip().splitlines()[-1:] or ["no output"]
+        return {"error": tail[0]}
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def measure(path: Path, scene_name: str, height: int, frame_rate: int) -> dict:
+    """Render one scene in this process; meant to run in a fresh one."""
+    import resource
+    import time
+
+    start = time.perf_counter()
+    from manim import config
+
+    from reelkit.runner import load_scene_class, scene_environment
+    from reelkit.telemetry import Telemetry
+
+    with scene_environment(path), tempfile.TemporaryDirectory() as media:
+        scene_class = load_scene_class(path, scene_name)
+        imported = time.perf_counter()
+        # After the import: scene files pin their own size and frame rate.
+        width = round(height * config.pixel_width / config.pixel_height / 2) * 2
+        config.pixel_width, config.pixel_height = width, height
+        config.frame_rate = frame_rate
+        config.disable_caching = True
+        config.media_dir = media
+        config.progress_bar = "none"
+        scene = scene_class()
+        telemetry = Telemetry.attach(scene)
+        scene.render()
+        rendered = time.perf_counter()
+        totals = telemetry.report()["totals"]
+
+    render = rendered - imported
+    return {
+        "import": imported - start,
+        "construct": totals["construct"],
+        "render": render,
+        "frames": totals["frames"],
+        "fps": totals["frames"] / render if render else 0.0,
+        "peak_rss": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024,  # KiB on Linux
+    }
+
+
+def run_suite(only: str | None = None, height: int = 480, frame_rate: int = 15,
+              portfolio_sizes=PORTFOLIO_SIZES, timeout: float = 900) -> dict[str, dict]:
+    results: dict[str, dict] = {}
+    jobs: list[tuple[str, str, str, dict]] = []
+    for scene in discover(SUITE):
+        jobs.append((scene.key, scene.file, scene.name, {}))
+
+    with tempfile.TemporaryDirectory() as data_dir:
+        file, scene = PORTFOLIO
+        for rows in portfolio_sizes:
+            data = synthetic_portfolio(Path(data_dir) / f"portfolio_{rows}.csv", rows)
+            jobs.append((f"{file}:{scene}[{rows}]", file, scene, {"REEL_PORTFOLIO_DATA": str(data)}))
+
+        for key, file, scene, env in jobs:
+            if only and only not in key:
+                continue
+            print(f"benchmarking {key}", file=sys.stderr)
+            try:
+                results[key] = _child([file, scene, str(height), str(frame_rate)], env, timeout)
+            except subprocess.TimeoutExpired:
+                results[key] = {"error": f"timed out after {timeout:g}s"}
+    return results
+
+
+def compare(results: dict[str, dict], baseline: dict[str, dict], threshold: float) -> dict[str, list[str]]:
+    regressions: dict[str, list[str]] = {}
+    for key, result in results.items():
+        before = baseline.get(key)
+        if "error" in result or not before or "error" in before:
+            continue
+        for metric in COMPARED:
+            if before[metric] and result[metric] > before[metric] * (1 + threshold):
+                regressions.setdefault(key, []).append(metric)
+    return regressions
+
+
+def summary_table(results: dict[str, dict], baseline: dict[str, dict], regressions: dict[str, list[str]]) -> str:
+    header = f"{'scene':<52} {'frames':>6} {'constr s':>8} {'render s':>8} {'fps':>6} {'peak MB':>8} {'vs base':>8}"
+    lines = [header, "-" * len(header)]
+    for key, r in results.items():
+        if "error" in r:
+            lines.append(f"{key:<52} error: {r['error']}")
+            continue
+        before = baseline.get(key, {})
+        change = f"{r['render'] / before['render'] - 1:+.0%}" if before.get("render") else "new"
+        flag = "  REGRESSED " + ",".join(regressions[key]) if key in regressions else ""
+        lines.append(
+            f"{key:<52} {r['frames']:>6} {r['construct']:>8.2f} {r['render']:>8.2f} {r['fps']:>6.1f} "
+            f"{r['peak_rss'] / 2**20:>8.0f} {change:>8}{flag}"
+        )
+    return "\n".join(lines)
+
+
+def load_baseline(path: Path = BASELINE) -> dict[str, dict]:
+    return json.loads(path.read_text(encoding="utf-8")) if path.exists() else {}
+
+
+def save_baseline(results: dict[str, dict], path: Path = BASELINE) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    merged = {**load_baseline(path), **{k: v for k, v in results.items() if "error" not in v}}
+    path.write_text(json.dumps(merged, indent=2, sort_keys=True), encoding="utf-8")
+
+
+if __name__ == "__main__":
+    # Child process entry: ``<file> <scene> <height> <fps>``.
+    file, scene, height, fps = sys.argv[1:5]
+    print(json.dumps(measure(ROOT / file, scene, int(height), int(fps))))
@@ -0,0 +1,92 @@
+"""
+Caption timing computed ahead of the render.
+
+Scenes whose captions follow fixed rules can describe the whole video's
+caption track without building a single Text: every chunk's on-screen
+interval and every section's start and length on the output timeline.
+
+    for section in CROStory.caption_schedule(frame_rate=60):
+        print(section.name, section.start, section.duration)
+        for cue in section.cues:
+            print(f"  {cue.start:6.2f} {cue.end:6.2f} {cue.text}")
+
+The schedule is what lets independent sections render in separate
+processes (``python -m reelkit chunk --sections``) and what subtitle
+export reads. Scenes without one mark their caption builders with
+``caption_helper`` and reelkit.subtitles times them in a dry run.
+"""
+from __future__ import annotations
+
+import functools
+import inspect
+import math
+from contextlib import contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterator
+
+
+@dataclass
+class Cue:
+    text: str
+    start: float  # seconds on the output timeline
+    end: float
+    pause: float = 0.0  # extra hold after a sentence ends
+
+
+@dataclass
+class SectionTiming:
+    name: str
+    start: float
+    duration: float
+    cues: list[Cue] = field(default_factory=list)
+
+    @property
+    def end(self) -> float:
+        return self.start + self.duration
+
+
+def frame_count(duration: float, frame_rate: float) -> int:
+    """Frames an animated play of ``duration`` seconds renders."""
+    # len(np.arange(0, duration, 1 / frame_rate)), as manim steps a play.
+    return max(0, math.ceil(duration / (1 / frame_rate)))
+
+
+_listeners: list[Callable[[str, Any], None]] = []
+
+
+def caption_helper(text_arg: str = "text", mobject: Callable[[Any], Any] = lambda result: result):
+    """Mark a function that builds an on-screen caption.
+
+    Outside a subtitle dry run this only calls the function. During one,
+    the caption's text and the mobject that shows it (picked from the
+    return value by ``mobject``) are reported, so the run can note when it
+    appears and leaves the screen:
+
+        @caption_helper("sentence", mobject=lambda result: result[0])
+        def make_caption(self, sentence, font_size): ...
+    """
+
+    def decorate(func):
+        signature = inspect.signature(func)
+
+        @functools.wraps(func)
+        def helper(*args, **kwargs):
+            result = func(*args, **kwargs)
+            if _listeners:
+                text = signature.bind(*args, **kwargs).arguments[text_arg]
+                for listener in _listeners:
+                    listener(text, mobject(result))
+            return result
+
+        return helper
+
+    return decorate
+
+
+@contextmanager
+def listen_for_captions(callback: Callable[[str, Any], None]) -> Iterator[None]:
+    _listeners.append(callback)
+    try:
+        yield
+    finally:
+        _listeners.remove(callback)
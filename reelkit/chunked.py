@@ -0,0 +1,288 @@
+"""
+Render one long scene in parallel by splitting its timeline into frame ranges.
+
+A dry run first measures every play (see reelkit.timeline). Each worker then
+renders one contiguous frame range, so the range starts from identical
+state, every worker first replays the plays before it without rasterizing:
+
+- a play with no updaters in play jumps straight to its end, as manim's own
+  skipping does, and costs about as much as one frame;
+- a play with updaters is stepped frame by frame, so every updater sees the
+  same dt as in a full render. That costs the play's construct-side work
+  (interpolation, updaters) but no Cairo; the last chunk of an updater-heavy
+  scene pays it for almost the whole timeline.
+
+Plays that straddle a range boundary are cut to the frame. The segments
+share codec settings and each starts on a keyframe, so they are stitched by
+copying packets, without re-encoding:
+
+    python -m reelkit chunk Bloom3/bloom3.py SpaceEconomyIntro --workers 8 -q h
+
+Scenes with a BeatPlan (see reelkit.beats) can be cut on their beat
+boundaries instead, so no seam falls in the middle of a beat. Every chunk
+still replays the scene from the start up to its range, so an edit anywhere
+runs every chunk again; only plays whose hash is unchanged are skipped as
+cached:
+
+    python -m reelkit chunk Bloom4/new_Bloom4.py TrendPrecisionScene --beats
+
+Scenes with independent sections (see reelkit.sections) skip the dry run
+altogether: each worker renders whole sections and nothing before them,
+longest first when the scene publishes a ``caption_schedule()``:
+
+    python -m reelkit chunk Bloom4/cro_story.py CROStory --sections
+"""
+from __future__ import annotations
+
+import multiprocessing
+import os
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+
+import av
+from manim import config, logger, tempconfig
+from manim.animation.updaters.update import UpdateFromAlphaFunc, UpdateFromFunc
+from manim.renderer.cairo_renderer import CairoRenderer
+from manim.utils.exceptions import EndSceneEarlyException
+from manim.utils.hashing import get_hash_from_play_call
+
+from reelkit.beats import BeatPlan
+from reelkit.runner import QUALITIES, load_scene_class, scene_environment
+from reelkit.timeline import PlayRecord, play_frame_count, record_timeline
+
+
+def _steps_per_frame(scene) -> bool:
+    # Updaters (and function-driven animations) may depend on being called
+    # once per frame; anything else ends in the same state after one jump.
+    if getattr(scene, "stop_condition", None) is not None:
+        return True
+    if any(isinstance(a, (UpdateFromFunc, UpdateFromAlphaFunc)) for a in scene.animations):
+        return True
+    family = scene.get_mobject_family_members()
+    family += [m for a in scene.animations for m in a.mobject.get_family()]
+    return any(m.updaters for m in family)
+
+
+class ChunkRenderer(CairoRenderer):
+    def __init__(self, start_frame: int, end_frame: int, **kwargs):
+        super().__init__(**kwargs)
+        self.start_frame = start_frame
+        self.end_frame = end_frame
+        self.frame_index = 0  # output frame number of the next frame
+        self.play_frame = 0  # same, counted from the start of the current play
+        self.window = (0, 0)  # frames of the current play that fall in the chunk
+        self.fast_forward = False
+
+    def play(self, scene, *args, **kwargs):
+        self.skip_animations = self._original_skipping_status
+        self.update_skipping_status()
+        scene.compile_animation_data(*args, **kwargs)
+
+        frames = 0 if self.skip_animations else play_frame_count(scene, config.frame_rate)
+        if frames and self.frame_index >= self.end_frame:
+            raise EndSceneEarlyException()
+        lo = max(self.start_frame - self.frame_index, 0)
+        hi = min(self.end_frame - self.frame_index, frames)
+        self.window = (lo, hi)
+        self.play_frame = 0
+        self.fast_forward = hi <= lo
+
+        if self.skip_animations or self.fast_forward:
+            hash_current_animation = None
+        else:
+            if config["disable_caching"]:
+                hash_current_animation = f"uncached_{self.num_plays:05}"
+            else:
+                hash_current_animation = get_hash_from_play_call(
+                    scene,
+                    self.camera,
+                    scene.animations,
+                    scene.mobjects,
+                )
+            if (lo, hi) != (0, frames):
+                # A cut play holds different frames than the full one.
+                hash_current_animation += f"_{lo}-{hi}"
+            if not config["disable_caching"] and self.file_writer.is_already_cached(hash_current_animation):
+                logger.info("Animation %d : Using cached data", self.num_plays)
+                self.fast_forward = True
+        self.file_writer.add_partial_movie_file(hash_current_animation)
+        self.animations_hashes.append(hash_current_animation)
+
+        writing = not (self.skip_animations or self.fast_forward)
+        self.file_writer.begin_animation(writing)
+        scene.begin_animations()
+        if writing:
+            self.save_static_frame_data(scene, scene.static_mobjects)
+
+        frozen = scene.is_current_animation_frozen_frame()
+        if frames and self.fast_forward and not frozen and not _steps_per_frame(scene):
+            # Straight to the play's end: one update, no per-frame loop.
+            self.skip_animations = True
+            scene.play_internal()
+            self.frame_index += frames
+            self.time += frames / self.camera.frame_rate
+        elif frozen:
+            if writing:
+                self.update_frame(scene, mobjects=scene.moving_mobjects)
+            self.freeze_current_frame(scene.duration)
+        else:
+            scene.play_internal()
+        self.file_writer.end_animation(writing)
+
+        self.num_plays += 1
+
+    def render(self, scene, time, moving_mobjects):
+        lo, hi = self.window
+        if self.fast_forward or not lo <= self.play_frame < hi:
+            # Step the clock only; the updaters already ran for this frame.
+            self.add_frame(None)
+            return
+        super().render(scene, time, moving_mobjects)
+
+    def add_frame(self, frame, num_frames: int = 1):
+        if self.skip_animations:
+            return
+        lo, hi = self.window
+        keep = max(0, min(self.play_frame + num_frames, hi) - max(self.play_frame, lo))
+        self.play_frame += num_frames
+        self.frame_index += num_frames
+        self.time += num_frames / self.camera.frame_rate
+        if keep and not self.fast_forward:
+            self.file_writer.write_frame(frame, num_frames=keep)
+
+
+def plan_chunks(plays: list[PlayRecord], chunks: int) -> list[tuple[int, int]]:
+    total = sum(p.frames for p in plays)
+    chunks = max(1, min(chunks, total))
+    bounds = [round(total * k / chunks) for k in range(chunks + 1)]
+    return [(a, b) for a, b in zip(bounds, bounds[1:]) if b > a]
+
+
+def plan_beat_chunks(plays: list[PlayRecord], plan: BeatPlan) -> list[tuple[int, int]]:
+    # Scale the plan's cut times onto the measured frames, so rounding can
+    # never leave frames before the first cut or after the last.
+    total = sum(p.frames for p in plays)
+    bounds = [round(total * t / plan.total) for t in plan.boundaries()]
+    return [(a, b) for a, b in zip(bounds, bounds[1:]) if b > a]
+
+
+def _output_settings(quality: str | None, resolution: tuple[int, int] | None) -> None:
+    # Before the scene file is imported, like manim's own -q and -r.
+    if quality:
+        config.quality = QUALITIES[quality]
+    if resolution:
+        config.pixel_width, config.pixel_height = resolution
+
+
+def render_chunk(path: str, scene_name: str, index: int, start_frame: int, end_frame: int,
+                 quality: str | None = None, resolution: tuple[int, int] | None = None) -> str:
+    path = Path(path).resolve()
+    with scene_environment(path), tempconfig({}):
+        _output_settings(quality, resolution)
+        scene_class = load_scene_class(path, scene_name)
+        config.output_file = f"{scene_name}_chunk{index:03}"
+        # Own partial movie folder per chunk, so workers never clean or
+        # overwrite each other's files.
+        config.partial_movie_dir = f"{{video_dir}}/partial_movie_files/{{scene_name}}/chunk{index:03}"
+        config.progress_bar = "none"
+        scene = scene_class(renderer=ChunkRenderer(start_frame, end_frame))
+        scene.render()
+        return str(scene.renderer.file_writer.movie_file_path.resolve())
+
+
+def render_section(path: str, scene_name: str, name: str, quality: str | None = None,
+                   resolution: tuple[int, int] | None = None) -> str:
+    path = Path(path).resolve()
+    # The section to render comes from the class, not the caller's shell.
+    os.environ.pop("REEL_RESUME", None)
+    os.environ.pop("REEL_STOP_AFTER", None)
+    with scene_environment(path), tempconfig({}):
+        _output_settings(quality, resolution)
+        scene_class = load_scene_class(path, scene_name)
+        scene_class.resume_from = scene_class.stop_after = name
+        config.output_file = f"{scene_name}_{name}"
+        config.partial_movie_dir = f"{{video_dir}}/partial_movie_files/{{scene_name}}/{name}"
+        config.progress_bar = "none"
+        scene = scene_class()
+        scene.render()
+        return str(scene.renderer.file_writer.movie_file_path.resolve())
+
+
+def stitch(segments: list[str], output: Path) -> Path:
+    # Same packet-copy concat manim uses for partial movie files.
+    file_list = output.with_suffix(".txt")
+    with file_list.open("w", encoding="utf-8") as fp:
+        for segment in segments:
+            fp.write(f"file 'file:{Path(segment).as_posix()}'\n")
+
+    source = av.open(str(file_list), options={"safe": "0", "an": "1"}, format="concat")
+    stream = source.streams.video[0]
+    target = av.open(str(output), mode="w")
+    out_stream = target.add_stream(template=stream)
+    for packet in source.demux(stream):
+        if packet.dts is None:
+            continue
+        packet.dts = None
+        packet.stream = out_stream
+        target.mux(packet)
+    source.close()
+    target.close()
+    file_list.unlink()
+    return output
+
+
+def render_chunked(path: Path, scene_name: str, workers: int, chunks: int | None = None,
+                   output: Path | None = None, beats: bool = False, quality: str | None = None,
+                   resolution: tuple[int, int] | None = None) -> Path:
+    path = Path(path).resolve()
+    plays = record_timeline(path, scene_name, quality, resolution)
+    if beats:
+        with scene_environment(path):
+            plan = getattr(load_scene_class(path, scene_name), "plan", None)
+        if plan is None:
+            raise ValueError(f"{scene_name} has no beat plan")
+        ranges = plan_beat_chunks(plays, plan)
+    else:
+        ranges = plan_chunks(plays, chunks or workers)
+    logger.info("Rendering %s in %d chunks over %d workers", scene_name, len(ranges), workers)
+
+    # spawn, not fork: every worker imports the scene with a clean config.
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        futures = [
+            pool.submit(render_chunk, str(path), scene_name, k, a, b, quality, resolution)
+            for k, (a, b) in enumerate(ranges)
+        ]
+        segments = [f.result() for f in futures]
+
+    output = output or Path(segments[0]).with_name(f"{scene_name}{Path(segments[0]).suffix}")
+    stitch(segments, output)
+    logger.info("Stitched %d chunks into %s", len(segments), output)
+    return output
+
+
+def render_sections(path: Path, scene_name: str, workers: int, output: Path | None = None,
+                    quality: str | None = None, resolution: tuple[int, int] | None = None) -> Path:
+    path = Path(path).resolve()
+    with scene_environment(path):
+        scene_class = load_scene_class(path, scene_name)
+        if not getattr(scene_class, "independent_sections", False):
+            raise ValueError(f"{scene_name} does not declare independent sections")
+        names = list(scene_class.sections)
+        schedule = getattr(scene_class, "caption_schedule", None)
+        durations = {s.name: s.duration for s in schedule()} if schedule else {}
+    # Longest sections first, so a long one never starts last.
+    order = sorted(names, key=lambda name: -durations.get(name, 0.0))
+    logger.info("Rendering %s as %d sections over %d workers", scene_name, len(names), workers)
+
+    context = multiprocessing.get_context("spawn")
+    with ProcessPoolExecutor(max_workers=workers, mp_context=context) as pool:
+        futures = {
+            name: pool.submit(render_section, str(path), scene_name, name, quality, resolution) for name in order
+        }
+        segments = [futures[name].result() for name in names]
+
+    output = output or Path(segments[0]).with_name(f"{scene_name}{Path(segments[0]).suffix}")
+    stitch(segments, output)
+    logger.info("Stitched %d sections into %s", len(segments), output)
+    return output
@@ -0,0 +1,228 @@
+"""
+Every deliverable of a reel from one render pass.
+
+A reel ships as a high-bitrate master, a platform MP4, a WebM and a short
+GIF preview. Rendering each one separately rasterizes every frame again,
+and Cairo is most of the render time. Here the scene is rasterized once:
+each frame goes to one encoder thread per profile, which scales it to the
+profile's height, drops frames for a lower frame rate and encodes it with
+its own codec and rate settings (PyAV releases the GIL while encoding, so
+the encoders run side by side):
+
+    python -m reelkit deliver Bloom4/new_Bloom4.py TitleScene -q h
+    python -m reelkit deliver Bloom3/bloom3.py SpaceEconomyIntro --profiles mp4,gif --set mp4.bitrate=6M --set gif.seconds=4
+
+The outputs go to ``media/deliverables/<Scene>/``. manim's own movie and
+partial movie cache are turned off for these renders: a cached play would
+have no frames to hand to the encoders.
+"""
+from __future__ import annotations
+
+import functools
+import math
+import queue
+import threading
+from dataclasses import dataclass, field, replace
+from fractions import Fraction
+from pathlib import Path
+
+import av
+import numpy as np
+from manim import Scene, config, logger, tempconfig
+
+from reelkit.runner import QUALITIES, load_scene_class, scene_environment
+
+QUEUE_FRAMES = 8  # per encoder; the tee blocks when the slowest falls behind
+
+
+@dataclass
+class Profile:
+    name: str
+    suffix: str
+    codec: str
+    pix_fmt: str
+    height: int | None = None  # None: the render's own size
+    frame_rate: float | None = None  # None: the render's own rate
+    seconds: float | None = None  # only the first seconds, for previews
+    bitrate: str | None = None
+    options: dict[str, str] = field(default_factory=dict)  # codec options
+    container_options: dict[str, str] = field(default_factory=dict)
+
+
+PROFILES = {
+    "master": Profile("master", ".mov", "prores_ks", "yuv422p10le", options={"profile": "3"}),
+    "mp4": Profile(
+        "mp4", ".mp4", "libx264", "yuv420p", bitrate="8M",
+        options={"preset": "medium", "maxrate": "10M", "bufsize": "16M"},
+        container_options={"movflags": "+faststart"},
+    ),
+    "webm": Profile(
+        "webm", ".webm", "libvpx-vp9", "yuv420p", bitrate="4M",
+        options={"deadline": "good", "cpu-used": "4", "row-mt": "1"},
+    ),
+    "gif": Profile("gif", ".gif", "gif", "rgb8", height=480, frame_rate=12, seconds=6),
+    "webp": Profile(
+        "webp", ".webp", "libwebp_anim", "yuva420p", height=480, frame_rate=15, seconds=6,
+        options={"quality": "75", "loop": "0"},
+    ),
+}
+
+
+def with_settings(profile: Profile, settings: dict[str, str]) -> Profile:
+    """``profile`` with fields (height, bitrate, ...) or codec options replaced."""
+    fields = {}
+    options = dict(profile.options)
+    for key, value in settings.items():
+        if key in ("height", "frame_rate", "seconds"):
+            fields[key] = float(value) if key != "height" else int(value)
+        elif key in ("codec", "pix_fmt", "suffix", "bitrate"):
+            fields[key] = value
+        else:
+            options[key] = value
+    return replace(profile, options=options, **fields)
+
+
+class Encoder:
+    """One profile's output, fed by its own thread."""
+
+    def __init__(self, profile: Profile, path: Path, width: int, height: int, frame_rate: float):
+        self.profile = profile
+        self.path = path
+        scale = (profile.height or height) / height
+        # Even sizes: most codecs subsample chroma by two.
+        self.width = max(2, round(width * scale / 2) * 2)
+        self.height = max(2, round(height * scale / 2) * 2)
+        # Never above the render's rate: there are no frames in between.
+        self.rate = Fraction(min(profile.frame_rate or frame_rate, frame_rate)).limit_denominator(1001)
+        self.ratio = self.rate / Fraction(frame_rate).limit_denominator(1001)  # output frames per source frame
+        self.limit = round(profile.seconds * frame_rate) if profile.seconds else None
+        self.source_frames = 0  # frames offered, at the render's rate
+        self.frames = 0  # frames encoded
+
+        path.parent.mkdir(parents=True, exist_ok=True)
+        self.container = av.open(str(path), mode="w", options=profile.container_options)
+        self.stream = self.container.add_stream(profile.codec, rate=self.rate, options=profile.options)
+        self.stream.width = self.width
+        self.stream.height = self.height
+        self.stream.pix_fmt = profile.pix_fmt
+        if profile.bitrate:
+            self.stream.codec_context.bit_rate = _bits(profile.bitrate)
+        self.queue: queue.Queue = queue.Queue(maxsize=QUEUE_FRAMES)
+        self.error: BaseException | None = None
+        self.thread = threading.Thread(target=self._run, name=f"encode-{profile.name}", daemon=True)
+        self.thread.start()
+
+    @property
+    def done(self) -> bool:
+        return self.limit is not None and self.source_frames >= self.limit
+
+    def slot(self, source_frame: int) -> int:
+        """Output frame whose time span source frame ``source_frame`` starts in."""
+        return math.floor(source_frame * self.ratio)
+
+    def offer(self, pixels: np.ndarray, num_frames: int) -> None:
+        # A source frame is kept when it is the first one at or after an
+        # output frame's timestamp, so 60 -> 12 fps keeps every 5th and
+        # 30 -> 12 fps keeps frames 0, 3, 5, 8, 10, ...
+        keep = 0
+        for _ in range(num_frames):
+            if self.done:
+                break
+            if self.source_frames == 0 or self.slot(self.source_frames) != self.slot(self.source_frames - 1):
+                keep += 1
+            self.source_frames += 1
+        if keep:
+            self.queue.put((pixels, keep))
+
+    def _run(self) -> None:
+        try:
+            while (item := self.queue.get()) is not None:
+                pixels, repeat = item
+                frame = av.VideoFrame.from_ndarray(pixels, format="rgba")
+                frame = frame.reformat(width=self.width, height=self.height, format=self.profile.pix_fmt)
+                for _ in range(repeat):
+                    frame.pts = self.frames
+                    frame.time_base = 1 / self.rate
+                    self.container.mux(self.stream.encode(frame))
+                    self.frames += 1
+            self.container.mux(self.stream.encode())
+        except BaseException as exc:  # reported by close()
+            self.error = exc
+            while self.queue.get() is not None:  # keep the tee from blocking
+                pass
+        finally:
+            self.container.close()
+
+    def close(self) -> None:
+        self.queue.put(None)
+        self.thread.join()
+        if self.error is not None:
+            raise RuntimeError(f"{self.profile.name} encoder failed: {self.error}") from self.error
+
+
+def _bits(text: str) -> int:
+    text = text.strip().upper()
+    units = {"K": 10**3, "M": 10**6, "G": 10**9}
+    return int(float(text[:-1]) * units[text[-1]]) if text[-1] in units else int(text)
+
+
+def attach(scene: Scene, profiles: list[Profile], directory: Path) -> list[Encoder]:
+    """Tee every frame the scene writes to one encoder per profile."""
+    name = type(scene).__name__
+    encoders = [
+        Encoder(p, directory / f"{name}_{p.name}{p.suffix}", config.pixel_width, config.pixel_height, config.frame_rate)
+        for p in profiles
+    ]
+    renderer, writer = scene.renderer, scene.renderer.file_writer
+    write_frame = writer.write_frame
+    scene_finished = renderer.scene_finished
+
+    @functools.wraps(write_frame)
+    def tee(frame_or_renderer, num_frames: int = 1):
+        # get_frame() hands over a fresh copy, so the encoders can share it.
+        pixels = np.asarray(frame_or_renderer)
+        for encoder in encoders:
+            encoder.offer(pixels, num_frames)
+        return write_frame(frame_or_renderer, num_frames)
+
+    @functools.wraps(scene_finished)
+    def finished(scene):
+        try:
+            return scene_finished(scene)
+        finally:
+            for encoder in encoders:
+                encoder.close()
+
+    writer.write_frame = tee
+    renderer.scene_finished = finished
+    return encoders
+
+
+def deliver(path: Path, scene_name: str, profiles: list[Profile], quality: str | None = None,
+            output_dir: Path | None = None) -> list[Path]:
+    path = Path(path).resolve()
+    with scene_environment(path), tempconfig({}):
+        if quality:
+            config.quality = QUALITIES[quality]
+        scene_class = load_scene_class(path, scene_name)
+        # The encoders are the outputs; nothing may be skipped as cached.
+        config.write_to_movie = False
+        config.disable_caching = True
+        scene = scene_class()
+        directory = Path(output_dir) if output_dir else config.get_dir("media_dir") / "deliverables" / scene_name
+        encoders = attach(scene, profiles, directory.resolve())
+        try:
+            scene.render()
+        finally:
+            # scene_finished closes them on success; after an error nothing
+            # else would, leaving threads blocked and files unfinished.
+            for encoder in encoders:
+                if encoder.thread.is_alive():
+                    try:
+                        encoder.close()
+                    except RuntimeError as exc:  # the first error is the one raised
+                        logger.error("%s", exc)
+    for encoder in encoders:
+        logger.info("%s: %d frames, %dx%d at %s fps -> %s", encoder.profile.name, encoder.frames,
+                    encoder.width, encoder.height, float(encoder.rate), encoder.path)
+    return [encoder.path for encoder in encoders]
@@ -0,0 +1,213 @@
+"""
+Find the scenes in the repository without importing manim.
+
+Scene files are parsed, not imported: a class is a scene when one of its
+bases is a manim/reelkit scene class or another scene in the same file.
+Shared bases that never define ``construct`` (new_Bloom4's BaseBloomScene)
+are kept in the index but not listed as renderable. For each scene the
+index records its source range, docstring, the line range of every
+method, the declared ``sections`` and a BeatPlan total when there is one.
+
+The index is cached in ``.reelkit/index.json`` and only files whose size
+or mtime changed are parsed again:
+
+    python -m reelkit list
+    python -m reelkit list Bloom4 --json
+"""
+from __future__ import annotations
+
+import ast
+import json
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Iterable
+
+ROOT = Path(__file__).resolve().parents[1]
+INDEX = ROOT / ".reelkit" / "index.json"
+INDEX_VERSION = 1
+
+# Scene classes that come from manim or reelkit rather than the file itself.
+SCENE_BASES = {
+    "Scene", "MovingCameraScene", "ThreeDScene", "ZoomedScene", "VectorScene", "LinearTransformationScene",
+    "SeededScene", "SectionedScene", "AnchoredScene",
+}
+# External bases that already implement construct.
+CONSTRUCT_BASES = {"SectionedScene"}
+SKIPPED_DIRS = {"reelkit", "media", "__pycache__", "venv", ".venv"}
+
+
+@dataclass
+class SceneInfo:
+    file: str  # relative to the repository root
+    name: str
+    bases: list[str]
+    start: int
+    end: int
+    renderable: bool
+    doc: str | None = None
+    sections: list[str] = field(default_factory=list)
+    methods: dict[str, list[int]] = field(default_factory=dict)  # name: [first line, last line]
+    plan_total: float | None = None
+
+    @property
+    def key(self) -> str:
+        return f"{self.file}:{self.name}"
+
+
+def _base_name(node: ast.expr) -> str | None:
+    if isinstance(node, ast.Name):
+        return node.id
+    if isinstance(node, ast.Attribute):
+        return node.attr
+    return None
+
+
+def _class_assignments(node: ast.ClassDef) -> dict[str, ast.expr]:
+    values = {}
+    for stmt in node.body:
+        if isinstance(stmt, ast.Assign):
+            for target in stmt.targets:
+                if isinstance(target, ast.Name):
+                    values[target.id] = stmt.value
+        elif isinstance(stmt, ast.AnnAssign) and isinstance(stmt.target, ast.Name) and stmt.value is not None:
+            values[stmt.target.id] = stmt.value
+    return values
+
+
+def _sections(values: dict[str, ast.expr]) -> list[str]:
+    value = values.get("sections")
+    if isinstance(value, (ast.Tuple, ast.List)):
+        return [e.value for e in value.elts if isinstance(e, ast.Constant) and isinstance(e.value, str)]
+    # sections = tuple(captions), with captions a dict literal in the class
+    if isinstance(value, ast.Call) and _base_name(value.func) == "tuple" and value.args:
+        source = values.get(_base_name(value.args[0]) or "")
+        if isinstance(source, ast.Dict):
+            return [k.value for k in source.keys if isinstance(k, ast.Constant) and isinstance(k.value, str)]
+    return []
+
+
+def _plan_total(values: dict[str, ast.expr]) -> float | None:
+    plan = values.get("plan")
+    if isinstance(plan, ast.Call) and _base_name(plan.func) == "BeatPlan" and plan.args:
+        first = plan.args[0]
+        if isinstance(first, ast.Constant) and isinstance(first.value, (int, float)):
+            return float(first.value)
+    return None
+
+
+def scan_file(path: Path, root: Path = ROOT) -> list[SceneInfo]:
+    """Every scene class in one file, renderable or not."""
+    tree = ast.parse(path.read_bytes(), filename=str(path))
+    classes = {node.name: node for node in tree.body if isinstance(node, ast.ClassDef)}
+    bases = {name: [b for b in map(_base_name, node.bases) if b] for name, node in classes.items()}
+
+    def is_scene(name: str, seen: frozenset = frozenset()) -> bool:
+        if name in SCENE_BASES:
+            return True
+        if name not in classes or name in seen:
+            return False
+        return any(is_scene(b, seen | {name}) for b in bases[name])
+
+    def has_construct(name: str, seen: frozenset = frozenset()) -> bool:
+        if name in CONSTRUCT_BASES:
+            return True
+        if name not in classes or name in seen:
+            return False
+        node = classes[name]
+        if any(isinstance(s, ast.FunctionDef) and s.name == "construct" for s in node.body):
+            return True
+        return any(has_construct(b, seen | {name}) for b in bases[name])
+
+    relative = path.resolve().relative_to(root.resolve()).as_posix()
+    scenes = []
+    for name, node in classes.items():
+        if not is_scene(name):
+            continue
+        values = _class_assignments(node)
+        doc = ast.get_docstring(node)
+        scenes.append(SceneInfo(
+            file=relative,
+            name=name,
+            bases=bases[name],
+            start=node.decorator_list[0].lineno if node.decorator_list else node.lineno,
+            end=node.end_lineno,
+            renderable=has_construct(name),
+            doc=doc.strip().splitlines()[0] if doc else None,
+            sections=_sections(values),
+            methods={
+                s.name: [s.decorator_list[0].lineno if s.decorator_list else s.lineno, s.end_lineno]
+                for s in node.body if isinstance(s, (ast.FunctionDef, ast.AsyncFunctionDef))
+            },
+            plan_total=_plan_total(values),
+        ))
+    return scenes
+
+
+def scene_files(root: Path = ROOT) -> list[Path]:
+    return sorted(
+        p for p in root.rglob("*.py")
+        if not any(part in SKIPPED_DIRS or part.startswith(".") for part in p.relative_to(root).parts[:-1])
+    )
+
+
+def build_index(root: Path = ROOT, index_path: Path = INDEX) -> dict[str, list[SceneInfo]]:
+    """Scenes per file, reparsing only files that changed since the cached index."""
+    return _build(root, index_path)[0]
+
+
+def scan_errors(root: Path = ROOT, index_path: Path = INDEX) -> dict[str, str]:
+    """Files that could not be parsed, with the error; their scenes are missing from the index."""
+    return _build(root, index_path)[1]
+
+
+def _build(root: Path, index_path: Path) -> tuple[dict[str, list[SceneInfo]], dict[str, str]]:
+    cached = {}
+    if index_path.exists():
+        data = json.loads(index_path.read_text(encoding="utf-8"))
+        if data.get("version") == INDEX_VERSION:
+            cached = data["files"]
+
+    files, index, errors, changed = {}, {}, {}, False
+    for path in scene_files(root):
+        relative = path.relative_to(root).as_posix()
+        stat = path.stat()
+        stamp = [stat.st_mtime_ns, stat.st_size]
+        entry = cached.get(relative)
+        if entry is None or entry["stamp"] != stamp:
+            entry = {"stamp": stamp, "scenes": []}
+            try:
+                entry["scenes"] = [asdict(s) for s in scan_file(path, root)]
+            except SyntaxError as exc:
+                entry["error"] = f"{exc.msg} (line {exc.lineno})"
+            changed = True
+        files[relative] = entry
+        index[relative] = [SceneInfo(**s) for s in entry["scenes"]]
+        if "error" in entry:
+            errors[relative] = entry["error"]
+
+    if changed or set(files) != set(cached):
+        index_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp = index_path.with_suffix(".tmp")
+        tmp.write_text(json.dumps({"version": INDEX_VERSION, "files": files}, indent=1), encoding="utf-8")
+        tmp.replace(index_path)
+    return index, errors
+
+
+def discover(patterns: Iterable[str] = (), renderable_only: bool = True, root: Path = ROOT) -> list[SceneInfo]:
+    """Scenes whose ``file:Scene`` key contains any of ``patterns`` (all if none)."""
+    patterns = [p.replace("\\", "/").removeprefix("./") for p in patterns]
+    scenes = [s for file_scenes in build_index(root).values() for s in file_scenes]
+    return [
+        s for s in scenes
+        if (s.renderable or not renderable_only) and (not patterns or any(p in s.key for p in patterns))
+    ]
+
+
+def scene_at(file: str, line: int, root: Path = ROOT) -> tuple[SceneInfo, str | None] | None:
+    """The scene and method (if any) that ``line`` of ``file`` belongs to."""
+    relative = Path(file).resolve().relative_to(root.resolve()).as_posix()
+    for scene in build_index(root).get(relative, []):
+        if scene.start <= line <= scene.end:
+            method = next((m for m, (a, b) in scene.methods.items() if a <= line <= b), None)
+            return scene, method
+    return None
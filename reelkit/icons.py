@@ -0,0 +1,160 @@
+"""
+Build each icon once per argument set and hand out copies.
+
+    @icon
+    def make_gear(color=PRIMARY_COLOR):
+        ...
+
+    make_gear(color="#9b7bff")  # builds and keeps the prototype
+    make_gear(color="#9b7bff")  # copies it
+
+Set REEL_ICON_CACHE to a folder to also keep frozen prototypes on disk.
+A frozen icon keeps every attribute of every mobject in its tree. Mobjects
+that attributes refer to (a Rectangle's grid_lines, say) are frozen with
+it and stay shared with the tree. An icon that holds something pickle
+cannot store, such as a lambda given to ParametricFunction, stays in
+memory only. Later renders load the frozen icon instead of building it.
+The file name hashes the factory's source, the arguments and the module
+constants it reads, so editing any of them rebuilds the icon.
+"""
+from __future__ import annotations
+
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+from pathlib import Path
+from types import ModuleType
+from typing import Any, Callable, TypeVar
+
+from manim import Mobject, __version__ as manim_version
+
+from reelkit.snapshot import holds_mobject
+
+F = TypeVar("F", bound=Callable[..., Mobject])
+FORMAT = 2  # part of the file name; bump when freeze changes
+
+_prototypes: dict[tuple, Mobject] = {}
+
+
+class _Ref:
+    """A mobject inside a frozen icon, by its index in the node list."""
+
+    __slots__ = ("index",)
+
+    def __init__(self, index: int):
+        self.index = index
+
+
+def _encode(value: Any, visit: Callable[[Mobject], int]) -> Any:
+    if isinstance(value, Mobject):
+        return _Ref(visit(value))
+    if not holds_mobject(value):
+        return value
+    if isinstance(value, dict):
+        return {k: _encode(v, visit) for k, v in value.items()}
+    return type(value)(_encode(v, visit) for v in value)
+
+
+def _decode(value: Any, mobs: list[Mobject]) -> Any:
+    if isinstance(value, _Ref):
+        return mobs[value.index]
+    if isinstance(value, dict):
+        return {k: _decode(v, mobs) for k, v in value.items()}
+    if isinstance(value, (list, tuple)) and any(isinstance(v, _Ref) for v in value):
+        return type(value)(_decode(v, mobs) for v in value)
+    return value
+
+
+def freeze(mob: Mobject) -> list[tuple]:
+    """``mob`` and every mobject reachable from it as (class, state, children) nodes.
+
+    Nodes refer to each other by index, so shared mobjects stay shared.
+    """
+    index: dict[int, int] = {}
+    nodes: list[tuple | None] = []
+
+    def visit(m: Mobject) -> int:
+        if id(m) not in index:
+            index[id(m)] = i = len(nodes)
+            nodes.append(None)
+            state = {name: _encode(value, visit) for name, value in vars(m).items() if name != "submobjects"}
+            nodes[i] = (type(m), state, [visit(sub) for sub in m.submobjects])
+        return index[id(m)]
+
+    visit(mob)
+    return nodes
+
+
+def thaw(nodes: list[tuple]) -> Mobject:
+    mobs = [cls.__new__(cls) for cls, _, _ in nodes]
+    for mob, (_, state, children) in zip(mobs, nodes):
+        mob.__dict__.update({name: _decode(value, mobs) for name, value in state.items()})
+        mob.submobjects = [mobs[i] for i in children]
+    return mobs[0]
+
+
+def _cache_dir() -> Path | None:
+    folder = os.environ.get("REEL_ICON_CACHE")
+    return Path(folder) if folder else None
+
+
+def _disk_key(func: Callable, args: str) -> str:
+    # Module constants the factory reads (colors, sizes) are part of the icon.
+    constants = {
+        name: repr(value) for name, value in inspect.getclosurevars(func).globals.items()
+        if not isinstance(value, ModuleType) and not callable(value)
+    }
+    source = inspect.getsource(func)
+    blob = repr((FORMAT, manim_version, func.__qualname__, source, args, sorted(constants.items())))
+    return hashlib.sha256(blob.encode()).hexdigest()[:20]
+
+
+def _load(path: Path) -> Mobject | None:
+    try:
+        with path.open("rb") as fp:
+            return thaw(pickle.load(fp))
+    except (OSError, EOFError, pickle.UnpicklingError, AttributeError, ImportError):
+        return None
+
+
+def _save(path: Path, mob: Mobject) -> None:
+    try:
+        frozen = pickle.dumps(freeze(mob), protocol=pickle.HIGHEST_PROTOCOL)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        return  # some attribute cannot be frozen; keep the icon in memory only
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_suffix(".tmp")
+    tmp.write_bytes(frozen)
+    tmp.replace(path)
+
+
+def icon(func: F) -> F:
+    """Memoize an icon factory; every call returns a fresh copy."""
+    signature = inspect.signature(func)
+
+    @functools.wraps(func)
+    def factory(*args, **kwargs):
+        bound = signature.bind(*args, **kwargs)
+        bound.apply_defaults()
+        arguments = repr(sorted(bound.arguments.items()))
+        key = (func.__module__, func.__qualname__, arguments)
+        prototype = _prototypes.get(key)
+        if prototype is None:
+            folder = _cache_dir()
+            path = folder / f"{func.__name__}-{_disk_key(func, arguments)}.pkl" if folder else None
+            prototype = _load(path) if path and path.exists() else None
+            if prototype is None:
+                prototype = func(*args, **kwargs)
+                if path:
+                    _save(path, prototype)
+            _prototypes[key] = prototype
+        return prototype.copy()
+
+    factory.build = func
+    return factory
+
+
+def clear_icons() -> None:
+    _prototypes.clear()
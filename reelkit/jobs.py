@@ -0,0 +1,346 @@
+"""
+A render queue kept in SQLite, for nightly and batch renders.
+
+A job is (scene file, scene, quality, aspect) with a priority and a retry
+limit. ``run`` starts the highest-priority jobs as subprocesses as long as
+their expected CPU and memory fit the machine: the cores and peak RSS a
+job used last time (measured with wait4) or a default before its first
+run. Failed jobs go back in the queue with a growing delay until they run
+out of attempts.
+
+Jobs start in priority order: when the next job does not fit, nothing
+behind it starts until it does, so small jobs cannot keep a big one
+waiting forever. Only one ``run`` works on the queue at a time (it holds
+``.reelkit/jobs.lock``).
+
+Everything lives in ``.reelkit/jobs.db``, so a restarted ``run`` picks up
+where the last one stopped: jobs left "running" by a dead scheduler are
+queued again, and their renders are stopped if they are still running
+(checked by boot id and command line, so a reused pid is left alone). A job whose inputs (the scene's folder, reelkit, the
+quality and aspect) hash the same as at its last successful render, and
+whose output still exists, is skipped. A job whose assets fail the
+reelkit.preflight check fails at once, without retries:
+
+    python -m reelkit queue add Bloom4/new_Bloom4.py:TitleScene Bloom4/cro_story.py:CROStory -q h --priority 5
+    python -m reelkit queue add Bloom3/bloom3.py:SpaceEconomyIntro --aspect 1:1
+    python -m reelkit queue run --budget 24G
+    python -m reelkit queue status
+"""
+from __future__ import annotations
+
+import fcntl
+import hashlib
+import os
+import signal
+import sqlite3
+import subprocess
+import sys
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Iterator
+
+from reelkit.batch import DEFAULT_ESTIMATE, MARGIN, default_budget
+from reelkit.preflight import PreflightError, require_assets
+
+ROOT = Path(__file__).resolve().parents[1]
+DATABASE = ROOT / ".reelkit" / "jobs.db"
+LOCK = ROOT / ".reelkit" / "jobs.lock"
+LOGS = ROOT / ".reelkit" / "logs"
+DEFAULT_CORES = 1.5  # Cairo on the main thread plus the encoder thread
+RETRY_DELAY = 30.0  # seconds, doubled on every further attempt
+VIDEO_SUFFIXES = {".mp4", ".mov", ".webm", ".gif", ".png"}
+SKIPPED_INPUTS = {"media", "__pycache__"}
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS jobs (
+    id INTEGER PRIMARY KEY,
+    file TEXT NOT NULL,
+    scene TEXT NOT NULL,
+    quality TEXT NOT NULL DEFAULT '',
+    aspect TEXT NOT NULL DEFAULT '',
+    priority INTEGER NOT NULL DEFAULT 0,
+    state TEXT NOT NULL DEFAULT 'queued',  -- queued, running, done, failed
+    attempts INTEGER NOT NULL DEFAULT 0,
+    max_attempts INTEGER NOT NULL DEFAULT 3,
+    not_before REAL NOT NULL DEFAULT 0,
+    pid INTEGER,
+    boot_id TEXT,  -- of the machine the pid ran on
+    input_hash TEXT,  -- inputs of the running or last successful render
+    output TEXT,
+    error TEXT,
+    started REAL,
+    finished REAL,
+    UNIQUE (file, scene, quality, aspect)
+);
+CREATE TABLE IF NOT EXISTS usage (
+    key TEXT PRIMARY KEY,
+    peak_rss INTEGER NOT NULL,
+    cores REAL NOT NULL,
+    wall REAL NOT NULL
+);
+"""
+
+
+@dataclass
+class QueuedJob:
+    id: int
+    file: str
+    scene: str
+    quality: str
+    aspect: str
+    priority: int
+    attempts: int
+    max_attempts: int
+    input_hash: str | None
+    output: str | None
+
+    @property
+    def key(self) -> str:
+        return f"{self.file}:{self.scene}:{self.quality or '-'}:{self.aspect or '-'}"
+
+    def command(self) -> list[str]:
+        if self.aspect:
+            command = [sys.executable, "-m", "reelkit", "aspects", self.file, self.scene, "--aspects", self.aspect]
+        else:
+            command = [sys.executable, "-m", "reelkit", "render", self.file, self.scene]
+        return command + (["-q", self.quality] if self.quality else [])
+
+
+def connect(path: Path = DATABASE) -> sqlite3.Connection:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    db = sqlite3.connect(path, isolation_level=None, timeout=30)
+    db.row_factory = sqlite3.Row
+    db.execute("PRAGMA journal_mode=WAL")
+    db.executescript(SCHEMA)
+    columns = {row["name"] for row in db.execute("PRAGMA table_info(jobs)")}
+    if "boot_id" not in columns:  # databases from before boot ids were kept
+        db.execute("ALTER TABLE jobs ADD COLUMN boot_id TEXT")
+    return db
+
+
+@contextmanager
+def scheduler_lock(path: Path = LOCK) -> Iterator[None]:
+    """Hold the queue for one ``run``; fail at once if another one has it."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with path.open("w") as fp:
+        try:
+            fcntl.flock(fp, fcntl.LOCK_EX | fcntl.LOCK_NB)
+        except BlockingIOError:
+            raise RuntimeError(f"Another 'queue run' is already working on the queue ({path} is locked)") from None
+        fp.write(str(os.getpid()))
+        fp.flush()
+        yield
+
+
+def boot_id() -> str:
+    try:
+        return Path("/proc/sys/kernel/random/boot_id").read_text(encoding="ascii").strip()
+    except OSError:
+        return ""
+
+
+def retry_delay(attempts: int) -> float:
+    """Seconds to wait after the ``attempts``-th failed attempt."""
+    return RETRY_DELAY * 2 ** (attempts - 1)
+
+
+def add_job(db: sqlite3.Connection, file: str, scene: str, quality: str = "", aspect: str = "",
+            priority: int = 0, max_attempts: int = 3) -> int:
+    """Queue a job, or queue an existing one again with the new settings."""
+    file = Path(file).resolve().relative_to(ROOT).as_posix()
+    db.execute(
+        """
+        INSERT INTO jobs (file, scene, quality, aspect, priority, max_attempts)
+        VALUES (?, ?, ?, ?, ?, ?)
+        ON CONFLICT (file, scene, quality, aspect) DO UPDATE SET
+            priority = excluded.priority, max_attempts = excluded.max_attempts,
+            state = 'queued', attempts = 0, not_before = 0, error = NULL
+        WHERE state != 'running'
+        """,
+        (file, scene, quality, aspect, priority, max_attempts),
+    )
+    row = db.execute(
+        "SELECT id FROM jobs WHERE file = ? AND scene = ? AND quality = ? AND aspect = ?",
+        (file, scene, quality, aspect),
+    ).fetchone()
+    return row["id"]
+
+
+def input_hash(job: QueuedJob) -> str:
+    """Hash of everything a render reads: the scene's folder and reelkit."""
+    digest = hashlib.sha256(repr((job.scene, job.quality, job.aspect)).encode())
+    scene_dir = (ROOT / job.file).parent
+    for folder in (scene_dir, ROOT / "reelkit"):
+        for path in sorted(folder.rglob("*")):
+            if path.is_file() and not SKIPPED_INPUTS.intersection(path.relative_to(folder).parts):
+                digest.update(path.relative_to(ROOT).as_posix().encode())
+                digest.update(path.read_bytes())
+    return digest.hexdigest()
+
+
+def _is_our_render(pid: int | None, boot: str | None, job: sqlite3.Row) -> bool:
+    """Whether ``pid`` is still the render this queue started for ``job``."""
+    if not pid or not boot or boot != boot_id():
+        return False  # after a reboot the pid belongs to someone else
+    try:
+        argv = Path(f"/proc/{pid}/cmdline").read_bytes().decode(errors="replace").split("\0")
+    except OSError:
+        return False
+    return "reelkit" in argv and job["file"] in argv and job["scene"] in argv
+
+
+def recover(db: sqlite3.Connection) -> int:
+    """Queue again the jobs a previous scheduler left running.
+
+    Call it with the scheduler lock held: then no other scheduler is alive
+    and every render still running for a job is an orphan.
+    """
+    rows = db.execute("SELECT id, file, scene, pid, boot_id FROM jobs WHERE state = 'running'").fetchall()
+    for row in rows:
+        if _is_our_render(row["pid"], row["boot_id"], row):
+            # Its result would be lost with its parent; start it over.
+            os.kill(row["pid"], signal.SIGTERM)
+        db.execute("UPDATE jobs SET state = 'queued', pid = NULL, boot_id = NULL WHERE id = ?", (row["id"],))
+    return len(rows)
+
+
+def _ready(db: sqlite3.Connection) -> list[QueuedJob]:
+    rows = db.execute(
+        """
+        SELECT id, file, scene, quality, aspect, priority, attempts, max_attempts, input_hash, output
+        FROM jobs WHERE state = 'queued' AND not_before <= ?
+        ORDER BY priority DESC, id
+        """,
+        (time.time(),),
+    ).fetchall()
+    return [QueuedJob(**dict(row)) for row in rows]
+
+
+def _usage(db: sqlite3.Connection, job: QueuedJob) -> tuple[int, float]:
+    row = db.execute("SELECT peak_rss, cores FROM usage WHERE key = ?", (job.key,)).fetchone()
+    if row is None:
+        return int(DEFAULT_ESTIMATE * MARGIN), DEFAULT_CORES
+    return int(row["peak_rss"] * MARGIN), max(row["cores"], 0.5)
+
+
+def _output_from_log(log: Path) -> str | None:
+    # The render commands print their outputs last, after manim's log.
+    lines = log.read_text(encoding="utf-8", errors="replace").splitlines() if log.exists() else []
+    for line in reversed(lines):
+        candidate = Path(line.strip())
+        if candidate.suffix in VIDEO_SUFFIXES and candidate.is_absolute() and candidate.exists():
+            return str(candidate)
+    return None
+
+
+def run_queue(db: sqlite3.Connection, budget: int | None = None, cores: float | None = None,
+              poll: float = 0.5, stop_when_empty: bool = True, lock: Path = LOCK) -> None:
+    with scheduler_lock(lock):
+        _run_queue(db, budget or default_budget(), cores or float(os.cpu_count() or 1), poll, stop_when_empty)
+
+
+def _run_queue(db: sqlite3.Connection, budget: int, cores: float, poll: float, stop_when_empty: bool) -> None:
+    boot = boot_id()
+    recovered = recover(db)
+    if recovered:
+        print(f"requeued {recovered} jobs left running by an earlier run", file=sys.stderr)
+
+    LOGS.mkdir(parents=True, exist_ok=True)
+    running: dict[int, tuple[QueuedJob, subprocess.Popen, float, int, float, str]] = {}
+
+    while True:
+        used_memory = sum(r[3] for r in running.values())
+        used_cores = sum(r[4] for r in running.values())
+        for job in _ready(db):
+            memory, job_cores = _usage(db, job)
+            # The first job always starts, however big; others must fit. Jobs
+            # behind one that does not fit wait too, or it could wait forever.
+            if running and (used_memory + memory > budget or used_cores + job_cores > cores):
+                break
+            # Only now, so waiting jobs are not hashed and checked every poll.
+            digest = input_hash(job)
+            if digest == job.input_hash and job.output and Path(job.output).exists():
+                db.execute("UPDATE jobs SET state = 'done', finished = ? WHERE id = ?", (time.time(), job.id))
+                print(f"up to date: {job.key}", file=sys.stderr)
+                continue
+            try:
+                require_assets(ROOT / job.file, [job.scene])
+            except PreflightError as exc:
+                # Retrying cannot bring a missing asset back.
+                db.execute(
+                    "UPDATE jobs SET state = 'failed', error = ?, finished = ? WHERE id = ?",
+                    (f"preflight: {exc}", time.time(), job.id),
+                )
+                print(f"failed {job.key} preflight:\n{exc}", file=sys.stderr)
+                continue
+            with (LOGS / f"{job.id}.log").open("w", encoding="utf-8") as log:
+                proc = subprocess.Popen(job.command(), cwd=ROOT, stdout=log, stderr=subprocess.STDOUT)
+            db.execute(
+                "UPDATE jobs SET state = 'running', pid = ?, boot_id = ?, attempts = attempts + 1, started = ? "
+                "WHERE id = ?",
+                (proc.pid, boot, time.time(), job.id),
+            )
+            running[proc.pid] = (job, proc, time.perf_counter(), memory, job_cores, digest)
+            used_memory += memory
+            used_cores += job_cores
+            print(f"started {job.key} (attempt {job.attempts + 1})", file=sys.stderr)
+
+        if not running:
+            waiting = db.execute("SELECT MIN(not_before) FROM jobs WHERE state = 'queued'").fetchone()[0]
+            if waiting is None and stop_when_empty:
+                return
+            time.sleep(max(poll, min((waiting or 0) - time.time(), 5.0)))
+            continue
+
+        time.sleep(poll)
+        for pid, (job, proc, started, _, _, digest) in list(running.items()):
+            done, status, usage = os.wait4(pid, os.WNOHANG)
+            if not done:
+                continue
+            del running[pid]
+            proc.returncode = os.waitstatus_to_exitcode(status)
+            wall = time.perf_counter() - started
+            output = _output_from_log(LOGS / f"{job.id}.log")
+            if proc.returncode == 0 and output:
+                db.execute(
+                    "INSERT OR REPLACE INTO usage (key, peak_rss, cores, wall) VALUES (?, ?, ?, ?)",
+                    (job.key, usage.ru_maxrss * 1024, (usage.ru_utime + usage.ru_stime) / max(wall, 1e-3), wall),
+                )
+                db.execute(
+                    "UPDATE jobs SET state = 'done', pid = NULL, boot_id = NULL, input_hash = ?, output = ?, error = NULL, "
+                    "finished = ? WHERE id = ?",
+                    (digest, output, time.time(), job.id),
+                )
+                print(f"done {job.key} in {wall:.0f}s", file=sys.stderr)
+                continue
+
+            log = LOGS / f"{job.id}.log"
+            error = f"exit code {proc.returncode}, see {log}" if proc.returncode else f"no output found, see {log}"
+            attempts = job.attempts + 1
+            if attempts < job.max_attempts:
+                delay = retry_delay(attempts)
+                db.execute(
+                    "UPDATE jobs SET state = 'queued', pid = NULL, boot_id = NULL, error = ?, not_before = ? WHERE id = ?",
+                    (error, time.time() + delay, job.id),
+                )
+                print(f"failed {job.key}, retrying in {delay:.0f}s", file=sys.stderr)
+            else:
+                db.execute(
+                    "UPDATE jobs SET state = 'failed', pid = NULL, boot_id = NULL, error = ?, finished = ? WHERE id = ?",
+                    (error, time.time(), job.id),
+                )
+                print(f"failed {job.key} after {attempts} attempts", file=sys.stderr)
+
+
+def status(db: sqlite3.Connection) -> list[sqlite3.Row]:
+    return db.execute(
+        "SELECT id, file, scene, quality, aspect, priority, state, attempts, max_attempts, output, error "
+        "FROM jobs ORDER BY state != 'running', state != 'queued', priority DESC, id"
+    ).fetchall()
+
+
+def clear(db: sqlite3.Connection, states: tuple[str, ...] = ("done", "failed")) -> int:
+    placeholders = ",".join("?" * len(states))
+    return db.execute(f"DELETE FROM jobs WHERE state IN ({placeholders})", states).rowcount
@@ -0,0 +1,125 @@
+"""
+Memory use of one render, sampled play by play.
+
+``MemoryProbe.attach(scene)`` wraps the scene's renderer (one instance,
+nothing global) and after every play records the process RSS and how
+many mobjects the scene holds. Every ``census_every`` plays it also counts
+all Mobject instances still alive, which catches leaks the scene no longer
+references (an always_redraw building a new group each frame, caches).
+With ``trace=True`` tracemalloc runs too and the report lists the source
+lines holding the most memory at the end:
+
+    python -m reelkit render Bloom3/bloom3.py SpaceEconomyIntro --memory --trace
+
+The report goes to ``media/memory/<Scene>.json``.
+"""
+from __future__ import annotations
+
+import functools
+import gc
+import json
+import resource
+import time
+import tracemalloc
+from dataclasses import asdict, dataclass
+from pathlib import Path
+from typing import Any
+
+from manim import Mobject, Scene, config
+
+PAGE_SIZE = resource.getpagesize()
+
+
+def current_rss() -> int:
+    try:
+        with open("/proc/self/statm", encoding="ascii") as fp:
+            return int(fp.read().split()[1]) * PAGE_SIZE
+    except OSError:  # not Linux: fall back to the peak
+        return peak_rss()
+
+
+def peak_rss() -> int:
+    return resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * 1024  # KiB on Linux
+
+
+@dataclass
+class MemorySample:
+    play: int
+    time: float  # scene time, seconds
+    rss: int
+    scene_mobjects: int  # family members the scene draws
+    live_mobjects: int | None = None  # every Mobject alive, on census plays
+
+
+class MemoryProbe:
+    def __init__(self, scene: Scene, census_every: int = 10, trace: bool = False, top: int = 15):
+        self.scene = scene
+        self.census_every = census_every
+        self.trace = trace
+        self.top = top
+        self.samples: list[MemorySample] = []
+        self.started = time.perf_counter()
+
+    @classmethod
+    def attach(cls, scene: Scene, **kwargs) -> MemoryProbe:
+        probe = cls(scene, **kwargs)
+        if probe.trace and not tracemalloc.is_tracing():
+            tracemalloc.start(10)
+        original = scene.renderer.play
+
+        @functools.wraps(original)
+        def play(scene, *args, **kwargs):
+            try:
+                return original(scene, *args, **kwargs)
+            finally:
+                probe.sample()
+
+        scene.renderer.play = play
+        return probe
+
+    def sample(self) -> None:
+        index = len(self.samples)
+        census = self.census_every and index % self.census_every == 0
+        self.samples.append(MemorySample(
+            play=index,
+            time=self.scene.renderer.time,
+            rss=current_rss(),
+            scene_mobjects=len(self.scene.get_mobject_family_members()),
+            live_mobjects=live_mobject_count() if census else None,
+        ))
+
+    def top_allocators(self) -> list[dict[str, Any]]:
+        if not tracemalloc.is_tracing():
+            return []
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, "<frozen importlib._bootstrap*>"),
+        ])
+        return [
+            {"where": f"{stat.traceback[0].filename}:{stat.traceback[0].lineno}", "bytes": stat.size, "blocks": stat.count}
+            for stat in snapshot.statistics("lineno")[: self.top]
+        ]
+
+    def report(self) -> dict[str, Any]:
+        return {
+            "scene": type(self.scene).__name__,
+            "file": config.input_file,
+            "resolution": [config.pixel_width, config.pixel_height],
+            "peak_rss": peak_rss(),
+            "final_rss": current_rss(),
+            "wall": time.perf_counter() - self.started,
+            "top_allocators": self.top_allocators(),
+            "samples": [asdict(s) for s in self.samples],
+        }
+
+
+def live_mobject_count() -> int:
+    return sum(1 for obj in gc.get_objects() if isinstance(obj, Mobject))
+
+
+def write_report(report: dict[str, Any], directory: Path | None = None) -> Path:
+    directory = Path(directory) if directory else config.get_dir("media_dir") / "memory"
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{report['scene']}.json"
+    path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return path
@@ -0,0 +1,336 @@
+"""
+Batched mobjects for scenes that draw many small identical shapes.
+
+One VMobject with many subpaths is one family member for the camera, one
+cairo path and one set of style arrays, where a VGroup of Lines or Dots is
+hundreds of mobjects to copy, hash, sort and stroke every frame:
+
+    graph = NodeGraph(positions, [spokes, links], edge_width=(0.5, 0.3), hub=0)
+    self.play(Create(graph.edges))
+    self.play(FadeIn(graph.nodes))
+    self.play(graph.pulse().animate.set_opacity(0))
+
+    helix = DNAHelix(height=5, width=1.4, turns=3).twist(rate=0.8)
+
+    smoke = ParticleEmitter(puff, origin=chimney, rate=4.5, lifetime=2.2,
+                            velocity=0.6 * UP, opacity=lambda f: 0.8 * f, rng=self.rng)
+    self.add(smoke)
+"""
+from __future__ import annotations
+
+from functools import lru_cache
+from typing import Callable, Sequence
+
+import numpy as np
+from manim import (
+    BLUE,
+    GRAY,
+    ORANGE,
+    ORIGIN,
+    TAU,
+    TEAL,
+    UP,
+    WHITE,
+    YELLOW,
+    Circle,
+    Dot,
+    ParsableManimColor,
+    VGroup,
+    VMobject,
+)
+
+
+@lru_cache(maxsize=None)
+def _unit_circle() -> np.ndarray:
+    points = Circle(radius=1).points
+    points.setflags(write=False)
+    return points
+
+
+class SegmentBatch(VMobject):
+    """Straight segments ``starts[i] -> ends[i]``, each its own subpath."""
+
+    def __init__(self, starts, ends, **kwargs):
+        super().__init__(**kwargs)
+        self.set_segments(starts, ends)
+
+    def set_segments(self, starts, ends) -> SegmentBatch:
+        starts = np.asarray(starts, dtype=float).reshape(-1, 3)
+        ends = np.asarray(ends, dtype=float).reshape(-1, 3)
+        # A straight cubic: handles at a third and two thirds of the way.
+        t = np.array([0, 1 / 3, 2 / 3, 1])[None, :, None]
+        self.set_points((starts[:, None] + t * (ends - starts)[:, None]).reshape(-1, 3))
+        return self
+
+
+class DotBatch(VMobject):
+    """Filled circles at ``centers``, drawn as one path."""
+
+    def __init__(self, centers, radius=0.05, color: ParsableManimColor = BLUE, **kwargs):
+        kwargs.setdefault("fill_opacity", 1.0)
+        kwargs.setdefault("stroke_width", 0)
+        super().__init__(color=color, **kwargs)
+        self.set_centers(centers, radius)
+
+    def set_centers(self, centers, radius=0.05) -> DotBatch:
+        centers = np.asarray(centers, dtype=float).reshape(-1, 3)
+        radius = np.broadcast_to(np.asarray(radius, dtype=float), len(centers))
+        circle = _unit_circle()
+        self.set_points((centers[:, None] + radius[:, None, None] * circle[None]).reshape(-1, 3))
+        return self
+
+
+class NodeGraph(VGroup):
+    """Nodes at ``positions`` joined by ``edges``, a list of index pairs.
+
+    ``edges`` may also be a list of such lists, one per stroke style, with
+    ``edge_width`` and ``edge_opacity`` given per group. ``graph.edges``
+    holds a SegmentBatch per group. ``graph.nodes`` holds a DotBatch and, if
+    ``hub`` names a node, that node as its own bigger Dot in ``hub_color``.
+    Edges and nodes can be animated on their own.
+    """
+
+    def __init__(
+        self,
+        positions,
+        edges,
+        node_radius=0.05,
+        node_color: ParsableManimColor = BLUE,
+        edge_color: ParsableManimColor = GRAY,
+        edge_width: float | Sequence[float] = 0.3,
+        edge_opacity: float | Sequence[float] = 0.2,
+        hub: int | None = None,
+        hub_radius: float = 0.08,
+        hub_color: ParsableManimColor = TEAL,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        self.positions = np.asarray(positions, dtype=float).reshape(-1, 3)
+        groups = edges if len(edges) and np.ndim(edges[0]) == 2 else [edges]
+        self.edge_index = [np.asarray(group, dtype=int).reshape(-1, 2) for group in groups]
+        widths = np.broadcast_to(edge_width, len(groups))
+        opacities = np.broadcast_to(edge_opacity, len(groups))
+        self.node_radius = node_radius
+        self.hub = hub
+        self.edges = VGroup(*(
+            SegmentBatch(
+                self.positions[index[:, 0]],
+                self.positions[index[:, 1]],
+                stroke_color=edge_color,
+                stroke_width=width,
+                stroke_opacity=opacity,
+            )
+            for index, width, opacity in zip(self.edge_index, widths, opacities)
+        ))
+        self.nodes = VGroup(DotBatch(self._node_positions(), radius=node_radius, color=node_color))
+        if hub is not None:
+            self.nodes.add_to_back(Dot(self.positions[hub], radius=hub_radius, color=hub_color))
+        self.add(self.edges, self.nodes)
+
+    def _node_positions(self) -> np.ndarray:
+        return self.positions if self.hub is None else np.delete(self.positions, self.hub, axis=0)
+
+    def set_positions(self, positions) -> NodeGraph:
+        self.positions = np.asarray(positions, dtype=float).reshape(-1, 3)
+        for batch, index in zip(self.edges, self.edge_index):
+            batch.set_segments(self.positions[index[:, 0]], self.positions[index[:, 1]])
+        self.nodes[-1].set_centers(self._node_positions(), self.node_radius)
+        if self.hub is not None:
+            self.nodes[0].move_to(self.positions[self.hub])
+        return self
+
+    def pulse(self, color: ParsableManimColor = YELLOW, scale: float = 1.5, opacity: float = 0.5) -> VGroup:
+        # Copies one flat VMobject (and the hub), not a Dot per node.
+        pulse = self.nodes.copy()
+        pulse.set_color(color).scale(scale).set_opacity(opacity)
+        return pulse
+
+
+class ParticleEmitter(VGroup):
+    """Particles spawned at ``origin`` and moving in a straight line.
+
+    Particle state lives in arrays and one updater steps all of them. Every
+    particle is drawn as a copy of ``template``'s outline. ``opacity`` maps
+    the fraction of life used (0 to 1, as an array) to fill opacity. The
+    result is rounded to one of ``levels`` layers, each a single VMobject,
+    so a frame costs at most ``levels`` paths however many particles there
+    are.
+
+    ``spread`` is the half-size of the spawn box, ``lifetime`` and
+    ``velocity_spread`` add uniform jitter, and ``rng`` (use the scene's
+    ``self.rng``) makes the stream the same on every render.
+    """
+
+    def __init__(
+        self,
+        template: VMobject,
+        origin=ORIGIN,
+        spread=(0.0, 0.0),
+        rate: float = 10.0,
+        lifetime: float | tuple[float, float] = 1.0,
+        velocity=UP,
+        velocity_spread=(0.0, 0.0),
+        opacity: Callable[[np.ndarray], np.ndarray] = lambda f: 1 - f,
+        color: ParsableManimColor | None = None,
+        levels: int = 8,
+        rng: np.random.Generator | None = None,
+        prewarm: float = 0.0,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        outline = [m.points for m in template.family_members_with_points()]
+        self.template = np.concatenate(outline) - template.get_center()
+        self.origin = np.asarray(origin, dtype=float)
+        self.spread = np.array([*spread, 0.0][:3], dtype=float)
+        self.rate = rate
+        self.lifetime = (lifetime, lifetime) if np.isscalar(lifetime) else tuple(lifetime)
+        self.velocity = np.asarray(velocity, dtype=float)
+        self.velocity_spread = np.array([*velocity_spread, 0.0][:3], dtype=float)
+        self.opacity = opacity
+        self.rng = rng if rng is not None else np.random.default_rng(0)
+        self.pending = 0.0
+
+        self.positions = np.empty((0, 3))
+        self.velocities = np.empty((0, 3))
+        self.ages = np.empty(0)
+        self.lifetimes = np.empty(0)
+
+        color = color or template.family_members_with_points()[0].get_fill_color()
+        self.add(*(
+            VMobject(fill_color=color, fill_opacity=(k + 1) / levels, stroke_width=0)
+            for k in range(levels)
+        ))
+        for _ in range(round(prewarm * 30)):
+            self.advance(1 / 30)
+        self.refresh()
+        self.add_updater(ParticleEmitter._step)
+
+    def _step(self, dt: float) -> None:
+        self.advance(dt)
+        self.refresh()
+
+    def spawn(self, count: int) -> None:
+        jitter = self.rng.uniform(-1, 1, (count, 3))
+        self.positions = np.concatenate([self.positions, self.origin + jitter * self.spread])
+        jitter = self.rng.uniform(-1, 1, (count, 3))
+        self.velocities = np.concatenate([self.velocities, self.velocity + jitter * self.velocity_spread])
+        self.ages = np.concatenate([self.ages, np.zeros(count)])
+        self.lifetimes = np.concatenate([self.lifetimes, self.rng.uniform(*self.lifetime, count)])
+
+    def advance(self, dt: float) -> None:
+        self.ages += dt
+        self.positions += self.velocities * dt
+        alive = self.ages < self.lifetimes
+        self.positions = self.positions[alive]
+        self.velocities = self.velocities[alive]
+        self.ages = self.ages[alive]
+        self.lifetimes = self.lifetimes[alive]
+        self.pending += self.rate * dt
+        count = int(self.pending)
+        self.pending -= count
+        if count:
+            self.spawn(count)
+
+    def refresh(self) -> None:
+        levels = len(self.submobjects)
+        opacity = np.clip(self.opacity(self.ages / self.lifetimes), 0, 1)
+        level = np.rint(opacity * levels).astype(int) - 1
+        for k, layer in enumerate(self.submobjects):
+            centers = self.positions[level == k]
+            layer.set_points((centers[:, None] + self.template[None]).reshape(-1, 3))
+
+
+class DNAHelix(VGroup):
+    """Two sine strands with straight rungs, built from arrays.
+
+    ``helix[0]`` holds the strands and ``helix[1]`` holds every rung in one
+    SegmentBatch. ``set_phase`` turns the helix about its own axis. It
+    recomputes the local curve and maps it through the affine transform
+    fitted from the current strand points, so the helix can be moved,
+    scaled or rotated, even as part of a parent group, and keeps twisting
+    in place.
+    """
+
+    def __init__(
+        self,
+        height: float = 5,
+        width: float = 1.4,
+        turns: float = 3,
+        color_a: ParsableManimColor = BLUE,
+        color_b: ParsableManimColor = ORANGE,
+        rung_color: ParsableManimColor = WHITE,
+        stroke_width: float = 4,
+        rung_width: float = 2,
+        rung_opacity: float = 0.65,
+        samples: int = 80,
+        rungs: int = 14,
+        phase: float = 0.0,
+        **kwargs,
+    ):
+        super().__init__(**kwargs)
+        # Not .height/.width: those are Mobject properties that rescale.
+        self.helix_size = (height, width)
+        self.turns = turns
+        self.t = np.linspace(0, TAU * turns, samples)
+        self.rung_t = np.linspace(0, TAU * turns, rungs)
+        self.strands = VGroup(
+            VMobject(stroke_color=color_a, stroke_width=stroke_width),
+            VMobject(stroke_color=color_b, stroke_width=stroke_width),
+        )
+        self.rungs = SegmentBatch(
+            np.empty((0, 3)), np.empty((0, 3)),
+            stroke_color=rung_color, stroke_width=rung_width, stroke_opacity=rung_opacity,
+        )
+        self.add(self.strands, self.rungs)
+        # Local (x, y, 1) -> world; starts as the identity placement.
+        self.affine = np.array([[1.0, 0, 0], [0, 1.0, 0], [0, 0, 0]])
+        self.phase = phase
+        self._place(self._local(phase))
+
+    def _local(self, phase: float) -> tuple[np.ndarray, ...]:
+        # Cubic Hermite segments of x = +-sin(t + phase) * w / 2, y linear in t.
+        height, width = self.helix_size
+        half, rise = width / 2, height / (TAU * self.turns)
+        t0, t1 = self.t[:-1], self.t[1:]
+        step = (t1 - t0) / 3
+        strands = []
+        for sign in (1, -1):
+            def point(t):
+                return np.stack([sign * half * np.sin(t + phase), rise * t - height / 2, 0 * t], axis=1)
+
+            def tangent(t):
+                return np.stack([sign * half * np.cos(t + phase), rise + 0 * t, 0 * t], axis=1)
+
+            p0, p3 = point(t0), point(t1)
+            p1 = p0 + step[:, None] * tangent(t0)
+            p2 = p3 - step[:, None] * tangent(t1)
+            strands.append(np.stack([p0, p1, p2, p3], axis=1).reshape(-1, 3))
+        x = half * np.sin(self.rung_t + phase)
+        y = rise * self.rung_t - height / 2
+        starts = np.stack([x, y, 0 * x], axis=1)
+        ends = np.stack([-x, y, 0 * x], axis=1)
+        return strands[0], strands[1], starts, ends
+
+    def _to_world(self, local: np.ndarray) -> np.ndarray:
+        return np.column_stack([local[:, :2], np.ones(len(local))]) @ self.affine
+
+    def _place(self, local: tuple[np.ndarray, ...]) -> None:
+        a, b, starts, ends = local
+        self.strands[0].set_points(self._to_world(a))
+        self.strands[1].set_points(self._to_world(b))
+        self.rungs.set_segments(self._to_world(starts), self._to_world(ends))
+        self.local_strand = a
+
+    def set_phase(self, phase: float) -> DNAHelix:
+        world = self.strands[0].points
+        if len(world) == len(self.local_strand):
+            local = np.column_stack([self.local_strand[:, :2], np.ones(len(world))])
+            self.affine = np.linalg.lstsq(local, world, rcond=None)[0]
+        self.phase = phase
+        self._place(self._local(phase))
+        return self
+
+    def twist(self, rate: float = 1.0) -> DNAHelix:
+        """Keep turning at ``rate`` radians per second."""
+        self.add_updater(lambda m, dt: m.set_phase(m.phase + rate * dt))
+        return self
@@ -0,0 +1,312 @@
+"""
+Check a scene's assets before rendering it.
+
+A missing image or data file only fails a render when construct reaches
+it, often minutes in. The preflight parses the scene file instead (no
+manim import) and collects, per scene:
+
+- images and SVGs given to ImageMobject/SVGMobject, as string literals or
+  through variables and loops over literals; paths are resolved from the
+  scene file's folder, where scenes run;
+- data files: a module-level DATA_FILES list read by a loader the scene
+  calls, where at least one candidate must exist (or REEL_PORTFOLIO_DATA);
+- fonts passed as ``font=`` to Text and friends, when fontconfig can list
+  the installed families.
+
+Each file must exist and parse as what its suffix says (PNG/JPEG/GIF
+headers are read for the size; huge images are flagged because they are
+decoded to RGBA). Every problem is reported at once:
+
+    python -m reelkit preflight
+    python -m reelkit preflight Bloom3
+
+The render commands, the batch and the render queue run it first and stop
+on errors unless REEL_PREFLIGHT=0.
+"""
+from __future__ import annotations
+
+import ast
+import difflib
+import functools
+import os
+import shutil
+import struct
+import subprocess
+from dataclasses import dataclass
+from pathlib import Path
+
+from reelkit.discovery import ROOT, scan_file
+
+IMAGE_CLASSES = {"ImageMobject", "SVGMobject", "ImageMobjectFromCamera"}
+TEXT_CLASSES = {"Text", "MarkupText", "Paragraph", "Title", "BulletedList", "Code"}
+IMAGE_SUFFIXES = {".png", ".jpg", ".jpeg", ".gif", ".bmp", ".webp", ".svg"}
+MAX_PIXELS = 4096 * 4096  # beyond this, each copy costs 64 MB of RGBA
+
+
+@dataclass
+class Issue:
+    file: str  # relative to the repository root
+    line: int
+    scene: str | None  # None: outside any scene class
+    kind: str  # image, data or font
+    value: str
+    problem: str
+    error: bool = True
+
+    def __str__(self) -> str:
+        level = "error" if self.error else "warning"
+        where = f"{self.file}:{self.line}" + (f" ({self.scene})" if self.scene else "")
+        return f"{where}: {level}: {self.kind} {self.value!r}: {self.problem}"
+
+
+class PreflightError(Exception):
+    def __init__(self, issues: list[Issue]):
+        self.issues = issues
+        super().__init__("\n".join(str(issue) for issue in issues))
+
+
+def preflight_enabled() -> bool:
+    return os.environ.get("REEL_PREFLIGHT", "1") not in ("0", "")
+
+
+def _call_name(node: ast.Call) -> str | None:
+    if isinstance(node.func, ast.Name):
+        return node.func.id
+    if isinstance(node.func, ast.Attribute):
+        return node.func.attr
+    return None
+
+
+def _strings(node: ast.expr) -> list[str] | None:
+    if isinstance(node, ast.Constant) and isinstance(node.value, str):
+        return [node.value]
+    if isinstance(node, (ast.List, ast.Tuple)):
+        values = [_strings(e) for e in node.elts]
+        if all(v is not None for v in values):
+            return [s for v in values for s in v]
+    return None
+
+
+class _Scope:
+    """String values assigned to names in one function or the module."""
+
+    def __init__(self, body: list[ast.stmt]):
+        self.assignments: dict[str, list[tuple[int, list[str] | None]]] = {}
+        for stmt in body:
+            for node in ast.walk(stmt):
+                if isinstance(node, ast.Assign):
+                    for target in node.targets:
+                        if isinstance(target, ast.Name):
+                            self._add(target.id, node.lineno, _strings(node.value))
+                elif isinstance(node, (ast.For, ast.comprehension)) and isinstance(node.target, ast.Name):
+                    # for path in ["a.png", "b.png"]: ...
+                    values = _strings(node.iter)
+                    self._add(node.target.id, getattr(node, "lineno", node.iter.lineno), values)
+
+    def _add(self, name: str, line: int, values: list[str] | None) -> None:
+        self.assignments.setdefault(name, []).append((line, values))
+
+    def resolve(self, name: str, line: int) -> list[str] | None | bool:
+        """The values bound last before ``line``; None if not literal, False if unbound."""
+        earlier = [values for at, values in self.assignments.get(name, []) if at <= line]
+        return earlier[-1] if earlier else False
+
+
+def _values(node: ast.expr, line: int, scopes: list[_Scope]) -> list[str] | None:
+    direct = _strings(node)
+    if direct is not None or not isinstance(node, ast.Name):
+        return direct
+    for scope in scopes:
+        values = scope.resolve(node.id, line)
+        if values is not False:
+            return values
+    return None
+
+
+def image_size(path: Path) -> tuple[str, int, int] | None:
+    """(format, width, height) read from the file header, or None if unknown."""
+    with path.open("rb") as fp:
+        head = fp.read(32)
+        if head.startswith(b"\x89PNG\r\n\x1a\n") and head[12:16] == b"IHDR":
+            width, height = struct.unpack(">II", head[16:24])
+            return "png", width, height
+        if head[:6] in (b"GIF87a", b"GIF89a"):
+            width, height = struct.unpack("<HH", head[6:10])
+            return "gif", width, height
+        if head.startswith(b"\xff\xd8"):
+            fp.seek(2)
+            while True:
+                marker = fp.read(2)
+                if len(marker) < 2 or marker[0] != 0xFF:
+                    return None
+                if marker[1] in (0xD8, 0x01) or 0xD0 <= marker[1] <= 0xD7:
+                    continue
+                length = struct.unpack(">H", fp.read(2))[0]
+                # Start-of-frame markers, except DHT, JPG and DAC.
+                if 0xC0 <= marker[1] <= 0xCF and marker[1] not in (0xC4, 0xC8, 0xCC):
+                    height, width = struct.unpack(">xHH", fp.read(5))
+                    return "jpeg", width, height
+                fp.seek(length - 2, os.SEEK_CUR)
+        if head.startswith(b"BM"):
+            width, height = struct.unpack("<ii", head[18:26])
+            return "bmp", width, abs(height)
+        if head.startswith(b"RIFF") and head[8:12] == b"WEBP":
+            return "webp", 0, 0  # size depends on the chunk type; existence is what matters
+    return None
+
+
+@functools.lru_cache(maxsize=1)
+def installed_fonts() -> frozenset[str] | None:
+    """Font families fontconfig knows, or None when it is not available."""
+    if shutil.which("fc-list") is None:
+        return None
+    result = subprocess.run(["fc-list", ":", "family"], capture_output=True, text=True, check=False)
+    families = set()
+    for line in result.stdout.splitlines():
+        families.update(name.strip().lower() for name in line.split(","))
+    return frozenset(families)
+
+
+def _suggest(path: Path) -> str:
+    if not path.parent.is_dir():
+        return f" (no folder {path.parent.name}/)"
+    names = [p.name for p in path.parent.iterdir()]
+    close = difflib.get_close_matches(path.name, names, n=1, cutoff=0.6)
+    return f" (did you mean {close[0]}?)" if close else ""
+
+
+def _check_image(folder: Path, value: str) -> tuple[str, bool] | None:
+    path = folder / value
+    if not path.suffix:
+        # manim tries the usual suffixes in turn
+        path = next((path.with_suffix(s) for s in IMAGE_SUFFIXES if path.with_suffix(s).exists()), path)
+    if not path.is_file():
+        return f"does not exist{_suggest(path)}", True
+    if path.suffix.lower() == ".svg":
+        head = path.read_bytes()[:512].lstrip()
+        return None if head.startswith((b"<", b"\xef\xbb\xbf<")) else ("is not an SVG document", True)
+    info = image_size(path)
+    if info is None:
+        return "is not a PNG, JPEG, GIF, BMP or WebP image", True
+    kind, width, height = info
+    if path.suffix.lower().lstrip(".").replace("jpg", "jpeg") != kind:
+        return f"is a {kind} file despite its {path.suffix} suffix", False
+    if kind in ("png", "jpeg", "gif", "bmp") and (width == 0 or height == 0):
+        return f"has an empty {width}x{height} {kind} header", True
+    if width * height > MAX_PIXELS:
+        return f"is {width}x{height}, {width * height * 4 / 2**20:.0f} MB per decoded copy", False
+    return None
+
+
+def _check_data(folder: Path, candidates: list[str]) -> tuple[str, bool] | None:
+    override = os.environ.get("REEL_PORTFOLIO_DATA")
+    if override:
+        return None if Path(override).is_file() else (f"REEL_PORTFOLIO_DATA={override} does not exist", True)
+    existing = [folder / c for c in candidates if (folder / c).is_file()]
+    if not existing:
+        return f"none of the candidates exist in {folder.name}/ (set REEL_PORTFOLIO_DATA or add the file)", True
+    first = existing[0]
+    if first.suffix.lower() == ".csv":
+        with first.open(encoding="utf-8", errors="replace") as fp:
+            if "," not in fp.readline():
+                return f"{first.name} has no CSV header line", True
+    return None
+
+
+def check_file(path: Path, scenes: list[str] | None = None, root: Path = ROOT) -> list[Issue]:
+    """Every asset problem of ``scenes`` (all scenes if None) in one scene file."""
+    path = Path(path).resolve()
+    folder = path.parent
+    relative = path.relative_to(root.resolve()).as_posix()
+    tree = ast.parse(path.read_bytes(), filename=str(path))
+    ranges = [(s.name, s.start, s.end) for s in scan_file(path, root)]
+
+    def scene_of(line: int) -> str | None:
+        return next((name for name, start, end in ranges if start <= line <= end), None)
+
+    def wanted(scene: str | None) -> bool:
+        # Helpers outside scene classes count for every scene of the file.
+        return scenes is None or scene is None or scene in scenes
+
+    module_scope = _Scope([s for s in tree.body if not isinstance(s, (ast.FunctionDef, ast.ClassDef))])
+    issues: list[Issue] = []
+
+    def report(line: int, kind: str, value: str, result: tuple[str, bool] | None) -> None:
+        if result is not None:
+            issues.append(Issue(relative, line, scene_of(line), kind, value, result[0], result[1]))
+
+    parents = {child: node for node in ast.walk(tree) for child in ast.iter_child_nodes(node)}
+    function_scopes: dict[ast.AST, _Scope] = {}
+
+    def scopes_of(node: ast.AST) -> list[_Scope]:
+        scopes = []
+        while node in parents:
+            node = parents[node]
+            if isinstance(node, (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda)):
+                if node not in function_scopes:
+                    body = node.body if isinstance(node.body, list) else []
+                    function_scopes[node] = _Scope(body)
+                scopes.append(function_scopes[node])
+        return scopes + [module_scope]
+
+    for call in (n for n in ast.walk(tree) if isinstance(n, ast.Call)):
+        if not wanted(scene_of(call.lineno)):
+            continue
+        name = _call_name(call)
+        if name in IMAGE_CLASSES:
+            arg = call.args[0] if call.args else next(
+                (k.value for k in call.keywords if k.arg in ("filename_or_array", "file_name")), None
+            )
+            if arg is None or isinstance(arg, ast.Starred):
+                continue
+            values = _values(arg, call.lineno, scopes_of(call))
+            if values is None:
+                report(call.lineno, "image", ast.unparse(arg), ("computed at runtime, not checked", False))
+                continue
+            for value in values:
+                report(call.lineno, "image", value, _check_image(folder, value))
+        elif name in TEXT_CLASSES and installed_fonts() is not None:
+            for keyword in call.keywords:
+                if keyword.arg != "font":
+                    continue
+                for value in _values(keyword.value, call.lineno, scopes_of(call)) or []:
+                    if value and value.lower() not in installed_fonts():
+                        # Pango falls back to another family, so the render still works.
+                        report(call.lineno, "font", value, ("is not installed, Pango will substitute", False))
+
+    # Data loaders: module functions reading DATA_FILES, and the scenes calling them.
+    data_files = next(
+        (
+            (stmt.lineno, _strings(stmt.value)) for stmt in tree.body
+            if isinstance(stmt, ast.Assign) and any(isinstance(t, ast.Name) and t.id == "DATA_FILES" for t in stmt.targets)
+        ),
+        None,
+    )
+    if data_files and data_files[1]:
+        line, candidates = data_files
+        loaders = {
+            stmt.name for stmt in tree.body
+            if isinstance(stmt, ast.FunctionDef)
+            and any(isinstance(n, ast.Name) and n.id == "DATA_FILES" for n in ast.walk(stmt))
+        }
+        callers = sorted({
+            scene_of(n.lineno) for n in ast.walk(tree)
+            if isinstance(n, ast.Call) and _call_name(n) in loaders and scene_of(n.lineno)
+        })
+        result = _check_data(folder, candidates)
+        for scene in callers:
+            if result is not None and (scenes is None or scene in scenes):
+                issues.append(Issue(relative, line, scene, "data", ", ".join(candidates), result[0], result[1]))
+
+    issues.sort(key=lambda issue: (issue.line, issue.kind, issue.value))
+    return issues
+
+
+def require_assets(path: Path, scenes: list[str] | None = None) -> list[Issue]:
+    """Raise PreflightError on errors; return the warnings."""
+    if not preflight_enabled():
+        return []
+    issues = check_file(path, scenes)
+    if any(issue.error for issue in issues):
+        raise PreflightError(issues)
+    return issues
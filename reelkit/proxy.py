@@ -0,0 +1,425 @@
+"""
+Fast low-resolution previews that can later be promoted to full quality.
+
+A preview runs construct once at full frame-rate timing, but only every
+``step``-th frame is rasterized, at ``scale`` of the final resolution, into a
+small proxy movie. Every frame's display list (the flattened, z-sorted
+mobjects the camera would draw, with their points, styles and images) is
+written to a frame log, including the frames the proxy skips. Promotion
+replays that log through a full-resolution camera at the scene's frame rate
+and with its codec, so the final render never re-runs construct and holds
+exactly the frames that were approved. It is written next to the normal
+render as ``<Scene>_promoted``, without sound:
+
+    python -m reelkit preview Bloom2/Bloom2.py FullAnimation --promote background
+    python -m reelkit promote media/proxies/FullAnimation
+"""
+from __future__ import annotations
+
+import hashlib
+import pickle
+import shutil
+from collections import OrderedDict
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Iterator
+
+import av
+import numpy as np
+from manim import Mobject, config, logger, tempconfig
+from manim.camera.camera import Camera
+from manim.renderer.cairo_renderer import CairoRenderer
+from manim.scene.scene_file_writer import SceneFileWriter, to_av_frame_rate
+from manim.utils.iterables import list_update
+
+from reelkit.runner import load_module, load_scene_class, scene_environment
+from reelkit.snapshot import flat_state
+
+LOG_VERSION = 3
+# Arrays at least this big (decoded images, mostly) go to content-addressed
+# blob files, so a picture shown for a minute is stored once.
+BLOB_BYTES = 256 * 1024
+# Besides tree links and callables (see reelkit.snapshot), a flattened
+# mobject needs none of these.
+SKIPPED_ATTRS = {"target", "saved_state"}
+
+
+def _digest(data) -> str:
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class FrameLog:
+    """Append-only record of every proxy frame of a scene.
+
+    ``timeline.bin`` is a sequence of pickled records. Mobject states and
+    static layers are defined once, the first time a frame uses them, and
+    frames refer to them by content hash.
+    """
+
+    def __init__(self, directory: Path, header: dict):
+        self.directory = Path(directory)
+        shutil.rmtree(self.directory, ignore_errors=True)
+        (self.directory / "blobs").mkdir(parents=True)
+        self.fp = (self.directory / "timeline.bin").open("wb")
+        pickle.dump(header, self.fp)
+        self.objects: set[str] = set()
+        self.blobs: set[str] = set()
+        self.layers: set[str] = set()
+        self.unpicklable: set[tuple[type, str]] = set()
+        self.pending: list | None = None
+        self.frames = 0
+
+    def _write(self, record: tuple) -> None:
+        pickle.dump(record, self.fp, protocol=pickle.HIGHEST_PROTOCOL)
+
+    def _blob(self, array: np.ndarray) -> tuple[str, str]:
+        array = np.ascontiguousarray(array)
+        key = _digest(memoryview(array).cast("B"))
+        if key not in self.blobs:
+            np.save(self.directory / "blobs" / f"{key}.npy", array)
+            self.blobs.add(key)
+        return ("blob", key)
+
+    def _state(self, mob: Mobject) -> dict:
+        cls = type(mob)
+        state = {}
+        for name, value in flat_state(mob, SKIPPED_ATTRS).items():
+            if (cls, name) in self.unpicklable:
+                continue
+            if isinstance(value, np.ndarray) and value.nbytes >= BLOB_BYTES:
+                value = self._blob(value)
+            state[name] = value
+        return state
+
+    def _payload(self, mob: Mobject) -> bytes:
+        state = self._state(mob)
+        try:
+            return pickle.dumps((type(mob), state), protocol=pickle.HIGHEST_PROTOCOL)
+        except Exception:
+            # Find the offending attributes once per class and drop them.
+            for name, value in list(state.items()):
+                try:
+                    pickle.dumps(value)
+                except Exception:
+                    logger.debug("Not recording %s.%s in the frame log", type(mob).__name__, name)
+                    self.unpicklable.add((type(mob), name))
+                    del state[name]
+            return pickle.dumps((type(mob), state), protocol=pickle.HIGHEST_PROTOCOL)
+
+    def keys(self, mobjects: list[Mobject]) -> tuple[str, ...]:
+        keys = []
+        for mob in mobjects:
+            payload = self._payload(mob)
+            key = _digest(payload)
+            if key not in self.objects:
+                self._write(("object", key, payload))
+                self.objects.add(key)
+            keys.append(key)
+        return tuple(keys)
+
+    def layer(self, mobjects: list[Mobject], background: tuple) -> str:
+        keys = self.keys(mobjects)
+        key = _digest(pickle.dumps((keys, background)))
+        if key not in self.layers:
+            self._write(("layer", key, keys, background))
+            self.layers.add(key)
+        return key
+
+    def frame(self, layer: str | None, mobjects: list[Mobject], repeat: int, background: tuple) -> None:
+        entry = [layer, self.keys(mobjects), background, repeat]
+        self.frames += repeat
+        # Holds and waits repeat the same picture; store them once.
+        if self.pending is not None and self.pending[:3] == entry[:3]:
+            self.pending[3] += repeat
+            return
+        self._flush()
+        self.pending = entry
+
+    def _flush(self) -> None:
+        if self.pending is not None:
+            self._write(("frame", *self.pending))
+            self.pending = None
+
+    def close(self) -> None:
+        self._flush()
+        self._write(("end", self.frames))
+        self.fp.close()
+
+
+def proxy_step(frame_rate: float, step: int) -> int:
+    # Streams need a whole-number rate, so 30 fps with step 4 drops to step 3.
+    for candidate in range(max(1, step), 0, -1):
+        if abs(frame_rate / candidate - round(frame_rate / candidate)) < 1e-6:
+            if candidate != step:
+                logger.info("Using proxy step %d so %g fps divides evenly", candidate, frame_rate)
+            return candidate
+    return 1
+
+
+class ProxyWriter(SceneFileWriter):
+    # Streams and the combined movie use proxy size and frame rate.
+    def __init__(self, renderer, scene_name, **kwargs):
+        with renderer.proxy_config():
+            super().__init__(renderer, f"{scene_name}_proxy", **kwargs)
+
+    def begin_animation(self, allow_write: bool = False, file_path=None):
+        with self.renderer.proxy_config():
+            super().begin_animation(allow_write, file_path)
+
+    def finish(self):
+        with self.renderer.proxy_config():
+            super().finish()
+
+
+class ProxyRenderer(CairoRenderer):
+    def __init__(self, log_dir: Path, scale: float = 0.25, step: int = 4, **kwargs):
+        super().__init__(file_writer_class=ProxyWriter, **kwargs)
+        self.scale = scale
+        self.step = proxy_step(config.frame_rate, step)
+        self.proxy_size = (
+            max(2, round(config.pixel_width * scale / 2) * 2),
+            max(2, round(config.pixel_height * scale / 2) * 2),
+        )
+        # Full frame-rate timing, so updaters see the dt of the final render.
+        self.camera = Camera(pixel_width=self.proxy_size[0], pixel_height=self.proxy_size[1])
+        self.log_dir = Path(log_dir)
+        self.log: FrameLog | None = None
+        self.play_frame = 0
+        self.static_layer: str | None = None
+        self.last_layer: str | None = None
+        self.last_display: list[Mobject] = []
+
+    def init_scene(self, scene):
+        super().init_scene(scene)
+        name = scene.__class__.__name__
+        self.log = FrameLog(self.log_dir, {
+            "version": LOG_VERSION,
+            "scene": name,
+            "input_file": str(config.input_file),
+            "output": str(Path(config.get_dir("video_dir")).resolve() / f"{name}_promoted{config.movie_file_extension}"),
+            "pixel_width": config.pixel_width,
+            "pixel_height": config.pixel_height,
+            "frame_width": config.frame_width,
+            "frame_rate": config.frame_rate,
+            "transparent": config.transparent,
+        })
+
+    @contextmanager
+    def proxy_config(self) -> Iterator[None]:
+        with tempconfig({
+            "pixel_width": self.proxy_size[0],
+            "pixel_height": self.proxy_size[1],
+            "frame_rate": round(config.frame_rate / self.step),
+        }):
+            yield
+
+    def background(self) -> tuple:
+        return (self.camera.background_color, self.camera.background_opacity)
+
+    def play(self, scene, *args, **kwargs):
+        self.play_frame = 0
+        super().play(scene, *args, **kwargs)
+
+    def save_static_frame_data(self, scene, static_mobjects):
+        super().save_static_frame_data(scene, static_mobjects)
+        if self.static_image is not None:
+            self.static_layer = self.log.layer(self.last_display, self.background())
+        return self.static_image
+
+    def update_frame(self, scene, mobjects=None, include_submobjects=True, ignore_skipping=True,
+                     rasterize=True, **kwargs):
+        if self.skip_animations and not ignore_skipping:
+            return
+        if not mobjects:
+            mobjects = list_update(scene.mobjects, scene.foreground_mobjects)
+        self.last_display = self.camera.get_mobjects_to_display(
+            mobjects, include_submobjects=include_submobjects, **kwargs
+        )
+        # play_internal clears static_image when a play ends.
+        self.last_layer = self.static_layer if self.static_image is not None else None
+        # Skipped frames are recorded for promotion but not drawn.
+        if not rasterize:
+            return
+        if self.static_image is not None:
+            self.camera.set_frame_to_background(self.static_image)
+        else:
+            self.camera.reset()
+        self.camera.capture_mobjects(self.last_display, include_submobjects=False)
+
+    def render(self, scene, time, moving_mobjects):
+        keep = self.play_frame % self.step == 0
+        self.update_frame(scene, moving_mobjects, rasterize=keep)
+        self.add_frame(self.get_frame() if keep else None)
+
+    def add_frame(self, frame, num_frames: int = 1):
+        if self.skip_animations:
+            return
+        self.time += num_frames / self.camera.frame_rate
+        # Every step-th frame of each play, so even a one-frame play shows up.
+        first = -(-self.play_frame // self.step) * self.step
+        kept = len(range(first, self.play_frame + num_frames, self.step))
+        self.play_frame += num_frames
+        self.log.frame(self.last_layer, self.last_display, num_frames, self.background())
+        if kept:
+            self.file_writer.write_frame(frame, num_frames=kept)
+
+    def scene_finished(self, scene):
+        self.log.close()
+        super().scene_finished(scene)
+
+
+def proxy_dir(scene_name: str) -> Path:
+    return Path(config.get_dir("media_dir")) / "proxies" / scene_name
+
+
+def render_preview(path: Path, scene_name: str, scale: float = 0.25, step: int = 4) -> tuple[Path, Path]:
+    """Render the proxy movie and frame log; returns both paths."""
+    path = Path(path).resolve()
+    with scene_environment(path), tempconfig({"disable_caching": True}):
+        scene_class = load_scene_class(path, scene_name)
+        log_dir = proxy_dir(scene_name).resolve()
+        renderer = ProxyRenderer(log_dir, scale=scale, step=step)
+        scene_class(renderer=renderer).render()
+        return renderer.file_writer.movie_file_path.resolve(), log_dir
+
+
+class _Replay:
+    """Rebuilds logged mobjects as flat, childless copies."""
+
+    def __init__(self, directory: Path, blob_cache: int = 16):
+        self.directory = directory
+        self.payloads: dict[str, bytes] = {}
+        self.built: dict[str, Mobject] = {}
+        self.blobs: OrderedDict[str, np.ndarray] = OrderedDict()
+        self.blob_cache = blob_cache
+
+    def _blob(self, key: str) -> np.ndarray:
+        if key in self.blobs:
+            self.blobs.move_to_end(key)
+        else:
+            self.blobs[key] = np.load(self.directory / "blobs" / f"{key}.npy")
+            if len(self.blobs) > self.blob_cache:
+                self.blobs.popitem(last=False)
+        return self.blobs[key]
+
+    def _build(self, key: str) -> Mobject:
+        cls, state = pickle.loads(self.payloads[key])
+        mob = cls.__new__(cls)
+        for name, value in state.items():
+            if isinstance(value, tuple) and len(value) == 2 and value[0] == "blob":
+                value = self._blob(value[1])
+            mob.__dict__[name] = value
+        mob.submobjects = []
+        mob.updaters = []
+        return mob
+
+    def mobjects(self, keys: tuple[str, ...]) -> list[Mobject]:
+        # Only the previous frame's objects are kept; most of them repeat.
+        built = {key: self.built.get(key) or self._build(key) for key in dict.fromkeys(keys)}
+        self.built = built
+        return [built[key] for key in keys]
+
+
+def _stream_settings(extension: str, transparent: bool) -> tuple[str, str, dict[str, str]]:
+    """Codec, pixel format and options, chosen as SceneFileWriter does."""
+    if extension == ".gif":
+        return "gif", "rgb8", {}
+    options = {"crf": "23"}
+    if extension == ".webm":
+        options["auto-alt-ref"] = "1"
+        return "libvpx-vp9", "yuva420p" if transparent else "yuv420p", options
+    if transparent:
+        return "qtrle", "argb", {}
+    return "libx264", "yuv420p", options
+
+
+def read_log(directory: Path) -> Iterator[tuple]:
+    with (Path(directory) / "timeline.bin").open("rb") as fp:
+        while True:
+            try:
+                yield pickle.load(fp)
+            except EOFError:
+                return
+
+
+def promote(log_dir: Path, output: Path | None = None) -> Path:
+    """Re-rasterize a preview's frame log at full resolution."""
+    log_dir = Path(log_dir).resolve()
+    records = read_log(log_dir)
+    header = next(records)
+    if header.get("version") != LOG_VERSION:
+        raise ValueError(f"{log_dir} was written by an incompatible preview, render it again")
+    output = Path(output or header["output"])
+    output.parent.mkdir(parents=True, exist_ok=True)
+
+    source = Path(header["input_file"])
+    with scene_environment(source):
+        # Definitions only, so pickled classes from the scene file resolve;
+        # construct is never called.
+        load_module(source)
+        camera = Camera(
+            pixel_width=header["pixel_width"],
+            pixel_height=header["pixel_height"],
+            frame_width=header["frame_width"],
+            frame_rate=header["frame_rate"],
+        )
+        replay = _Replay(log_dir)
+        layers: dict[str, tuple] = {}
+        layer_images: dict[str, np.ndarray] = {}
+        background = None
+        written = 0
+        complete = False
+
+        partial = output.with_name(f"{output.stem}_promoting{output.suffix}")
+        codec, pix_fmt, options = _stream_settings(output.suffix, header["transparent"])
+        container = av.open(str(partial), mode="w")
+        stream = container.add_stream(codec, rate=to_av_frame_rate(header["frame_rate"]), options=options)
+        stream.pix_fmt = pix_fmt
+        stream.width = header["pixel_width"]
+        stream.height = header["pixel_height"]
+
+        def set_background(value: tuple) -> None:
+            nonlocal background
+            if value != background:
+                camera.background_color, camera.background_opacity = value
+                background = value
+
+        try:
+            for record in records:
+                kind = record[0]
+                if kind == "object":
+                    replay.payloads[record[1]] = record[2]
+                elif kind == "layer":
+                    layers[record[1]] = (record[2], record[3])
+                elif kind == "frame":
+                    _, layer, keys, frame_background, repeat = record
+                    if layer is not None and layer not in layer_images:
+                        layer_keys, layer_background = layers[layer]
+                        set_background(layer_background)
+                        camera.reset()
+                        camera.capture_mobjects(replay.mobjects(layer_keys), include_submobjects=False)
+                        layer_images[layer] = np.array(camera.pixel_array)
+                    set_background(frame_background)
+                    if layer is not None:
+                        camera.set_frame_to_background(layer_images[layer])
+                    else:
+                        camera.reset()
+                    camera.capture_mobjects(replay.mobjects(keys), include_submobjects=False)
+                    pixels = np.array(camera.pixel_array)
+                    for _ in range(repeat):
+                        for packet in stream.encode(av.VideoFrame.from_ndarray(pixels, format="rgba")):
+                            container.mux(packet)
+                    written += repeat
+                elif kind == "end":
+                    complete = record[1] == written
+            for packet in stream.encode():
+                container.mux(packet)
+        finally:
+            container.close()
+
+    if not complete:
+        partial.unlink()
+        raise ValueError(f"Frame log in {log_dir} is incomplete; the preview did not finish")
+    partial.replace(output)
+    logger.info("Promoted %d frames to %s", written, output)
+    return output
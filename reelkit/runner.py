@@ -0,0 +1,63 @@
+"""
+Loading and instantiating scenes outside the manim CLI.
+
+Scene files expect to run the way ``manim bloom3.py SpaceEconomyIntro`` runs
+them: from their own folder (image paths are relative) and imported under
+their file stem. ``scene_environment`` recreates that for in-process renders
+and worker processes.
+"""
+from __future__ import annotations
+
+import importlib.util
+import os
+import sys
+from contextlib import contextmanager
+from pathlib import Path
+from types import ModuleType
+from typing import Iterator
+
+# manim's -q flags
+QUALITIES = {
+    "l": "low_quality",
+    "m": "medium_quality",
+    "h": "high_quality",
+    "p": "production_quality",
+    "k": "fourk_quality",
+}
+
+
+@contextmanager
+def scene_environment(path: Path) -> Iterator[None]:
+    path = Path(path).resolve()
+    old_cwd = Path.cwd()
+    sys.path.insert(0, str(path.parent))
+    os.chdir(path.parent)
+    try:
+        yield
+    finally:
+        os.chdir(old_cwd)
+        sys.path.remove(str(path.parent))
+
+
+def load_module(path: Path) -> ModuleType:
+    path = Path(path).resolve()
+    spec = importlib.util.spec_from_file_location(path.stem, path)
+    if spec is None or spec.loader is None:
+        raise ImportError(f"Cannot import scene file {path}")
+    module = importlib.util.module_from_spec(spec)
+    # Registered like manim does, so pickled closures can find their module.
+    sys.modules[path.stem] = module
+    spec.loader.exec_module(module)
+    return module
+
+
+def load_scene_class(path: Path, scene_name: str) -> type:
+    from manim import config
+
+    path = Path(path).resolve()
+    config.input_file = str(path)
+    module = load_module(path)
+    scene_class = getattr(module, scene_name, None)
+    if scene_class is None:
+        raise KeyError(f"No scene named {scene_name!r} in {path}")
+    return scene_class
@@ -0,0 +1,238 @@
+"""
+Named section checkpoints for long single-construct scenes.
+
+A SectionedScene lists its sections in order and implements each one as a
+``section_<name>`` method. At the start of every section the scene state
+(mobjects with their updaters and ValueTrackers, attributes the earlier
+sections left on ``self``, scene time and RNG state) is written to disk, so
+a later render can jump straight to a section instead of replaying
+everything before it. Each section also starts from its own seeded
+``self.rng``, so resumed and full renders draw the same numbers:
+
+    REEL_RESUME=earth_mesh manim -pql bloom3.py SpaceEconomyIntro
+
+REEL_STOP_AFTER=<section> ends the render after that section and
+REEL_CHECKPOINTS=0 turns snapshot writing off. Snapshots need the optional
+``dill`` package (pip install dill).
+
+Scenes whose sections share nothing (each one clears the scene when it is
+done) set ``independent_sections = True``: resuming then needs no snapshot,
+so any section can be rendered on its own, e.g. by separate workers.
+"""
+from __future__ import annotations
+
+import ast
+import hashlib
+import inspect
+import os
+import pickle
+import random
+from pathlib import Path
+from typing import Any, BinaryIO
+
+import numpy as np
+from manim import Scene, config, logger
+from manim.utils.exceptions import EndSceneEarlyException
+
+from reelkit.rng import SeededScene
+
+try:
+    import dill
+except ImportError:  # optional, only needed for checkpoints
+    dill = None
+
+CHECKPOINT_VERSION = 1
+
+
+class CheckpointError(Exception):
+    """A section's checkpoint is missing, stale or unreadable."""
+
+
+def _require_dill() -> None:
+    if dill is None:
+        raise ImportError("Section checkpoints need the optional 'dill' package: pip install dill")
+
+
+def _live_objects(scene: Scene) -> dict[str, Any]:
+    return {
+        "scene": scene,
+        "renderer": scene.renderer,
+        "camera": scene.camera,
+        "file_writer": scene.renderer.file_writer,
+    }
+
+
+def dump_scene_state(state: Any, file: BinaryIO, scene: Scene) -> None:
+    _require_dill()
+    live = _live_objects(scene)
+
+    class ScenePickler(dill.Pickler):
+        # Closures made inside sections often capture the scene itself
+        # (self.clamp_to_frame, ...). Keep those pointing at the live scene
+        # instead of trying to serialize it.
+        def persistent_id(self, obj):
+            for token, value in live.items():
+                if obj is value:
+                    return token
+            return None
+
+    ScenePickler(file).dump(state)
+
+
+def load_scene_state(file: BinaryIO, scene: Scene) -> Any:
+    _require_dill()
+    live = _live_objects(scene)
+
+    class SceneUnpickler(dill.Unpickler):
+        def persistent_load(self, pid):
+            return live[pid]
+
+    return SceneUnpickler(file).load()
+
+
+def _source_without(file: str, classes: set[str], methods: set[str]) -> str:
+    """``file``'s source with the named methods of the named classes cut out."""
+    source = Path(file).read_text(encoding="utf-8")
+    lines = source.splitlines(keepends=True)
+    cut = set()
+    for node in ast.walk(ast.parse(source)):
+        if isinstance(node, ast.ClassDef) and node.name in classes:
+            for item in node.body:
+                if isinstance(item, (ast.FunctionDef, ast.AsyncFunctionDef)) and item.name in methods:
+                    first = min([item.lineno] + [d.lineno for d in item.decorator_list])
+                    cut.update(range(first - 1, item.end_lineno))
+    return "".join(line for i, line in enumerate(lines) if i not in cut)
+
+
+class SectionedScene(SeededScene):
+    sections: tuple[str, ...] = ()
+    resume_from: str | None = None
+    stop_after: str | None = None
+    independent_sections = False
+
+    def construct(self):
+        self.run_sections()
+
+    def run_sections(self):
+        names = list(self.sections)
+        resume = os.environ.get("REEL_RESUME") or self.resume_from
+        stop = os.environ.get("REEL_STOP_AFTER") or self.stop_after
+        for name in filter(None, (resume, stop)):
+            if name not in names:
+                raise ValueError(f"Unknown section {name!r} for {type(self).__name__}, expected one of {names}")
+
+        write = os.environ.get("REEL_CHECKPOINTS", "1") != "0" and not self.independent_sections
+        if write and dill is None:
+            logger.warning("dill is not installed, section checkpoints are disabled")
+            write = False
+
+        self.current_section: str | None = None
+        # Anything a section adds to ``self`` from here on is section state.
+        self._scene_attrs = set(vars(self)) | {"_scene_attrs"}
+
+        start = names.index(resume) if resume else 0
+        if start and not self.independent_sections:
+            self.load_checkpoint(names[start])
+
+        for i, name in enumerate(names[start:], start):
+            if write and i > start:
+                self.save_checkpoint(name)
+            self.current_section = name
+            self.reseed(name)
+            self.next_section(name)
+            getattr(self, f"section_{name}")()
+            if name == stop:
+                raise EndSceneEarlyException()
+
+    # ---------------- Checkpoints ----------------
+    def checkpoint_path(self, name: str) -> Path:
+        return config.get_dir("media_dir") / "checkpoints" / type(self).__name__ / f"{name}.pkl"
+
+    def checkpoint_key(self, name: str) -> str:
+        # A snapshot is only valid while everything that produced it is
+        # unchanged: the frame, and the source of every file that defines the
+        # scene or one of its bases (module helpers and constants, inherited
+        # methods), except the sections from this one on.
+        cls = type(self)
+        names = list(self.sections)
+        later = {f"section_{section}" for section in names[names.index(name):]}
+        h = hashlib.sha256(str(CHECKPOINT_VERSION).encode())
+        for value in (config.pixel_width, config.pixel_height, config.frame_width, config.frame_height, config.frame_rate):
+            h.update(repr(value).encode())
+        files: dict[str, set[str]] = {}
+        for base in cls.__mro__:
+            if base.__module__.split(".")[0] in ("manim", "builtins"):
+                continue
+            try:
+                files.setdefault(inspect.getsourcefile(base), set()).add(base.__name__)
+            except TypeError:  # defined without a file, e.g. in a REPL
+                continue
+        for file, classes in sorted(files.items()):
+            h.update(_source_without(file, classes, later).encode())
+        return h.hexdigest()
+
+    def checkpoint_state(self) -> dict[str, Any]:
+        return {
+            "mobjects": self.mobjects,
+            "foreground_mobjects": self.foreground_mobjects,
+            "updaters": self.updaters,
+            "attrs": {k: v for k, v in vars(self).items() if k not in self._scene_attrs},
+            "time": self.renderer.time,
+            "num_plays": self.renderer.num_plays,
+            "background_color": self.camera.background_color,
+            "random": random.getstate(),
+            "np_random": np.random.get_state(),
+        }
+
+    def restore_state(self, state: dict[str, Any]):
+        self.mobjects = state["mobjects"]
+        self.foreground_mobjects = state["foreground_mobjects"]
+        self.updaters = state["updaters"]
+        vars(self).update(state["attrs"])
+        self.camera.background_color = state["background_color"]
+        random.setstate(state["random"])
+        np.random.set_state(state["np_random"])
+
+        self.renderer.time = state["time"]
+        self.renderer.num_plays = state["num_plays"]
+        # Partial movie files are indexed by play number; keep them in step.
+        self.renderer.file_writer.partial_movie_files.extend([None] * state["num_plays"])
+
+    def save_checkpoint(self, name: str):
+        path = self.checkpoint_path(name)
+        path.parent.mkdir(parents=True, exist_ok=True)
+        header = {"key": self.checkpoint_key(name), "section": name, "time": self.renderer.time}
+
+        tmp = path.with_suffix(".tmp")
+        with tmp.open("wb") as f:
+            pickle.dump(header, f)
+            dump_scene_state(self.checkpoint_state(), f, self)
+        tmp.replace(path)
+        logger.info("Checkpoint for section %s written to %s", name, path)
+
+    def load_checkpoint(self, name: str):
+        try:
+            _require_dill()
+        except ImportError as exc:
+            raise CheckpointError(str(exc)) from exc
+        path = self.checkpoint_path(name)
+        if not path.exists():
+            raise CheckpointError(f"No checkpoint for section {name!r} at {path}, render once from the start first")
+
+        with path.open("rb") as f:
+            try:
+                header = pickle.load(f)
+            except Exception as exc:
+                raise CheckpointError(f"Checkpoint for section {name!r} at {path} is unreadable: {exc}") from exc
+            if header.get("key") != self.checkpoint_key(name):
+                raise CheckpointError(
+                    f"Checkpoint for section {name!r} is stale (an earlier section changed), "
+                    "render once from the start first"
+                )
+            try:
+                state = load_scene_state(f, self)
+            except Exception as exc:  # a class it refers to was renamed or removed
+                raise CheckpointError(f"Checkpoint for section {name!r} at {path} is unreadable: {exc}") from exc
+
+        self.restore_state(state)
+        logger.info("Resuming %s at section %s (t=%.2fs)", type(self).__name__, name, header["time"])
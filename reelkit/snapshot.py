@@ -0,0 +1,34 @@
+"""
+The drawable state of one mobject, without its tree links or callables.
+
+reelkit.proxy records it in frame logs: what is left is points, style,
+images and plain settings, which pickle and hash cleanly. Children and
+updaters are left out; the caller keeps or rebuilds them. reelkit.icons
+uses holds_mobject to find the references it has to freeze as well.
+"""
+from __future__ import annotations
+
+from typing import Any, Collection
+
+from manim import Mobject
+
+# Tree links and callables are not needed to draw a mobject on its own.
+TREE_ATTRS = frozenset({"submobjects", "updaters"})
+
+
+def holds_mobject(value: Any) -> bool:
+    if isinstance(value, Mobject):
+        return True
+    if isinstance(value, (list, tuple)):
+        return any(isinstance(v, Mobject) for v in value)
+    if isinstance(value, dict):
+        return any(isinstance(v, Mobject) for v in value.values())
+    return False
+
+
+def flat_state(mob: Mobject, skipped: Collection[str] = ()) -> dict[str, Any]:
+    """``mob``'s own attributes, minus tree links, callables, mobject references and ``skipped``."""
+    return {
+        name: value for name, value in vars(mob).items()
+        if name not in TREE_ATTRS and name not in skipped and not callable(value) and not holds_mobject(value)
+    }
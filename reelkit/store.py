@@ -0,0 +1,267 @@
+"""
+One store of partial movies and final renders for the whole repository.
+
+manim caches a play's partial movie under its hash, but per scene folder
+(``media/videos/<file>/<quality>/partial_movie_files/<Scene>``): the same
+intro, CTA card or transition rendered by Bloom2, new_Bloom2 and
+FullAnimation is rendered and stored once per scene. The hash itself only
+depends on the animations, the mobjects and the camera, so the store keys
+artifacts by it (plus the output settings) in ``.reelkit/store``:
+
+- before a play renders, a partial movie already in the store is copied
+  into the scene's folder and manim treats the play as cached;
+- after a play renders, a copy of its partial movie is added to the store;
+- a final movie is stored under the hashes of its partial movies, and a
+  render whose plays all match copies it instead of concatenating again.
+
+Store objects and the files in ``media/`` never share an inode: manim
+rewrites final movies in place, which would change a stored object under
+its key. Copies are reflinks where the filesystem supports them (btrfs,
+XFS), so they cost no extra disk there.
+
+An SQLite index tracks size and last use. When the store grows past
+REEL_STORE_SIZE (default 20G) the least recently used artifacts go first,
+which frees their disk; the copies in ``media/`` are manim's own cache and
+are not counted. ``python -m reelkit store gc`` also removes orphans and
+old entries.
+``python -m reelkit render`` uses the store unless REEL_STORE=0.
+"""
+from __future__ import annotations
+
+import fcntl
+import functools
+import hashlib
+import os
+import shutil
+import sqlite3
+import time
+import uuid
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from reelkit.batch import parse_size
+
+ROOT = Path(__file__).resolve().parents[1]
+STORE = ROOT / ".reelkit" / "store"
+DEFAULT_SIZE = "20G"
+FICLONE = 0x40049409  # linux/fs.h: share the source's extents, copy on write
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS artifacts (
+    key TEXT PRIMARY KEY,
+    kind TEXT NOT NULL,  -- partial or movie
+    suffix TEXT NOT NULL,
+    size INTEGER NOT NULL,
+    origin TEXT,  -- file:Scene that first produced it
+    created REAL NOT NULL,
+    last_used REAL NOT NULL,
+    hits INTEGER NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS artifacts_last_used ON artifacts (last_used);
+"""
+
+
+def store_enabled() -> bool:
+    return os.environ.get("REEL_STORE", "1") not in ("0", "")
+
+
+def max_store_size() -> int:
+    return parse_size(os.environ.get("REEL_STORE_SIZE", DEFAULT_SIZE))
+
+
+def _copy(source: Path, target: Path) -> None:
+    """Replace ``target`` with an independent copy of ``source``, atomically."""
+    target.parent.mkdir(parents=True, exist_ok=True)
+    tmp = target.with_name(f".{target.name}.{uuid.uuid4().hex}")
+    try:
+        with open(source, "rb") as src, open(tmp, "wb") as dst:
+            try:
+                fcntl.ioctl(dst.fileno(), FICLONE, src.fileno())
+            except OSError:  # no reflinks here (ext4, tmpfs, another filesystem)
+                shutil.copyfileobj(src, dst, 1 << 20)
+        os.replace(tmp, target)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+
+
+@dataclass
+class GcResult:
+    removed: int
+    freed: int
+    orphans: int
+    kept: int
+    size: int
+
+
+class ArtifactStore:
+    def __init__(self, root: Path = STORE, max_size: int | None = None):
+        self.root = Path(root)
+        self.max_size = max_size if max_size is not None else max_store_size()
+        self.root.mkdir(parents=True, exist_ok=True)
+        self.db = sqlite3.connect(self.root / "index.db", isolation_level=None, timeout=30)
+        self.db.row_factory = sqlite3.Row
+        self.db.execute("PRAGMA journal_mode=WAL")
+        self.db.executescript(SCHEMA)
+
+    def object_path(self, key: str, suffix: str) -> Path:
+        return self.root / "objects" / key[:2] / f"{key}{suffix}"
+
+    def get(self, key: str, target: Path) -> bool:
+        """Copy the artifact stored under ``key`` to ``target``, if there is one."""
+        row = self.db.execute("SELECT suffix FROM artifacts WHERE key = ?", (key,)).fetchone()
+        if row is None:
+            return False
+        source = self.object_path(key, row["suffix"])
+        if not source.exists():
+            self.db.execute("DELETE FROM artifacts WHERE key = ?", (key,))
+            return False
+        _copy(source, Path(target))
+        self.db.execute("UPDATE artifacts SET last_used = ?, hits = hits + 1 WHERE key = ?", (time.time(), key))
+        return True
+
+    def put(self, key: str, source: Path, kind: str, origin: str | None = None) -> None:
+        """Store a copy of ``source`` under ``key``."""
+        source = Path(source)
+        target = self.object_path(key, source.suffix)
+        now = time.time()
+        if not target.exists():
+            _copy(source, target)
+            self.db.execute(
+                "INSERT OR REPLACE INTO artifacts (key, kind, suffix, size, origin, created, last_used) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (key, kind, source.suffix, target.stat().st_size, origin, now, now),
+            )
+        else:
+            self.db.execute("UPDATE artifacts SET last_used = ? WHERE key = ?", (now, key))
+        if self.size() > self.max_size:
+            self.evict(self.max_size)
+
+    def size(self) -> int:
+        return self.db.execute("SELECT COALESCE(SUM(size), 0) FROM artifacts").fetchone()[0]
+
+    def evict(self, max_size: int, older_than: float | None = None) -> tuple[int, int]:
+        """Drop least recently used artifacts until the store fits ``max_size``."""
+        total = self.size()
+        removed = freed = 0
+        cutoff = time.time() - older_than if older_than is not None else None
+        rows = self.db.execute("SELECT key, suffix, size, last_used FROM artifacts ORDER BY last_used").fetchall()
+        for row in rows:
+            if total <= max_size and (cutoff is None or row["last_used"] >= cutoff):
+                break
+            self.object_path(row["key"], row["suffix"]).unlink(missing_ok=True)
+            self.db.execute("DELETE FROM artifacts WHERE key = ?", (row["key"],))
+            total -= row["size"]
+            freed += row["size"]
+            removed += 1
+        return removed, freed
+
+    def gc(self, max_size: int | None = None, older_than: float | None = None) -> GcResult:
+        """Forget missing objects, delete unindexed ones, then evict."""
+        known = set()
+        for row in self.db.execute("SELECT key, suffix FROM artifacts").fetchall():
+            path = self.object_path(row["key"], row["suffix"])
+            if path.exists():
+                known.add(path)
+            else:
+                self.db.execute("DELETE FROM artifacts WHERE key = ?", (row["key"],))
+        orphans = 0
+        for path in (self.root / "objects").rglob("*"):
+            if not path.is_file() or path in known:
+                continue
+            if path.name.startswith(".") and time.time() - path.stat().st_mtime < 3600:
+                continue  # probably a copy another render is still making
+            path.unlink()  # left by an interrupted put
+            orphans += 1
+        removed, freed = self.evict(self.max_size if max_size is None else max_size, older_than)
+        kept = self.db.execute("SELECT COUNT(*) FROM artifacts").fetchone()[0]
+        return GcResult(removed, freed, orphans, kept, self.size())
+
+    def stats(self) -> dict[str, Any]:
+        rows = self.db.execute(
+            "SELECT kind, COUNT(*) AS count, COALESCE(SUM(size), 0) AS size, COALESCE(SUM(hits), 0) AS hits "
+            "FROM artifacts GROUP BY kind"
+        ).fetchall()
+        return {
+            "root": str(self.root),
+            "max_size": self.max_size,
+            "size": self.size(),
+            "kinds": {row["kind"]: {"count": row["count"], "size": row["size"], "hits": row["hits"]} for row in rows},
+        }
+
+
+def _output_key(*parts: Any) -> str:
+    from manim import config
+
+    settings = (
+        config.pixel_width, config.pixel_height, config.frame_rate,
+        config.movie_file_extension, config.transparent, config.background_color.to_hex(),
+    )
+    return hashlib.sha256(repr((parts, settings)).encode()).hexdigest()
+
+
+def attach(scene, store: ArtifactStore | None = None) -> ArtifactStore:
+    """Back one scene's partial movie cache and final movie with the store."""
+    from manim import config
+
+    store = store or ArtifactStore()
+    renderer, writer = scene.renderer, scene.renderer.file_writer
+    origin = f"{Path(config.input_file).name}:{type(scene).__name__}"
+    is_already_cached = writer.is_already_cached
+    begin_animation = writer.begin_animation
+    end_animation = writer.end_animation
+    combine_to_movie = writer.combine_to_movie
+
+    def partial_path(hash_invocation: str) -> Path:
+        return Path(writer.partial_movie_directory) / f"{hash_invocation}{config.movie_file_extension}"
+
+    @functools.wraps(is_already_cached)
+    def cached(hash_invocation):
+        if is_already_cached(hash_invocation):
+            return True
+        if not config.write_to_movie or not hasattr(writer, "partial_movie_directory"):
+            return False
+        return store.get(_output_key("partial", hash_invocation), partial_path(hash_invocation))
+
+    @functools.wraps(begin_animation)
+    def begin(allow_write: bool = False, *args, **kwargs):
+        if allow_write and renderer.num_plays < len(writer.partial_movie_files):
+            path = writer.partial_movie_files[renderer.num_plays]
+            # Write a new inode, never through one a store used to share.
+            if path:
+                Path(path).unlink(missing_ok=True)
+        return begin_animation(allow_write, *args, **kwargs)
+
+    @functools.wraps(end_animation)
+    def end(allow_write: bool = False):
+        result = end_animation(allow_write)
+        if allow_write and renderer.num_plays < len(writer.partial_movie_files):
+            path = writer.partial_movie_files[renderer.num_plays]
+            # disable_caching names partials uncached_00001, not by hash
+            if path and Path(path).exists() and not Path(path).stem.startswith("uncached_"):
+                store.put(_output_key("partial", Path(path).stem), Path(path), "partial", origin)
+        return result
+
+    @functools.wraps(combine_to_movie)
+    def combine():
+        partials = [Path(p) for p in writer.partial_movie_files if p is not None]
+        movie = getattr(writer, "movie_file_path", None)
+        # Sound is not part of any hash, and uncached partials have none.
+        if not movie or writer.includes_sound or any(p.stem.startswith("uncached_") for p in partials):
+            return combine_to_movie()
+        key = _output_key("movie", [p.stem for p in partials])
+        if store.get(key, Path(movie)):
+            return None
+        # manim truncates an existing movie in place; start from a fresh inode.
+        Path(movie).unlink(missing_ok=True)
+        result = combine_to_movie()
+        if Path(movie).exists():
+            store.put(key, Path(movie), "movie", origin)
+        return result
+
+    writer.is_already_cached = cached
+    writer.begin_animation = begin
+    writer.end_animation = end
+    writer.combine_to_movie = combine
+    return store
@@ -0,0 +1,140 @@
+"""
+SRT and WebVTT sidecars from a scene's caption timing, without rendering.
+
+Scenes that publish a ``caption_schedule()`` (CROStory) are read directly.
+Any other scene is run once with every play skipped, as for
+reelkit.timeline: nothing is rasterized or encoded, but construct still runs
+in full, text shaping included, so this takes a few seconds. Each caption built
+by a ``caption_helper`` is timed from the play in which it first shows
+until the play that hides it (faded out, removed, fully transparent or
+moved off the frame):
+
+    python -m reelkit subtitles Bloom3/bloom3.py SpaceEconomyIntro
+    python -m reelkit subtitles Bloom4/cro_story.py CROStory --frame-rate 30
+
+Times are frame-exact for the frame rate in effect, so pass the one the
+video is rendered at; ``--frame-rate`` wins over a rate the scene file sets
+when it is imported.
+"""
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Iterable
+
+import numpy as np
+from manim import Mobject, config, logger, tempconfig
+
+from reelkit.captions import Cue, listen_for_captions
+from reelkit.runner import load_scene_class, scene_environment
+from reelkit.timeline import TimelineRenderer
+
+FORMATS = ("srt", "vtt")
+
+
+def _shown(mob: Mobject) -> bool:
+    if (
+        mob.get_left()[0] >= config.frame_x_radius
+        or mob.get_right()[0] <= -config.frame_x_radius
+        or mob.get_bottom()[1] >= config.frame_y_radius
+        or mob.get_top()[1] <= -config.frame_y_radius
+    ):
+        return False
+    for sub in mob.family_members_with_points():
+        for rgbas in (getattr(sub, "fill_rgbas", None), getattr(sub, "stroke_rgbas", None)):
+            if rgbas is not None and len(rgbas) and np.max(rgbas[:, 3]) > 0.01:
+                return True
+    return False
+
+
+class CueRenderer(TimelineRenderer):
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self.captions: list[tuple[str, Mobject]] = []
+        self.showing: dict[int, Cue] = {}
+        self.cues: list[Cue] = []
+
+    def track(self, text: str, mobject: Mobject) -> None:
+        self.captions.append((" ".join(text.split()), mobject))
+
+    def play(self, scene, *args, **kwargs):
+        start = self.frame_index / config.frame_rate
+        self.check(scene, start, start)  # added or removed between plays
+        super().play(scene, *args, **kwargs)
+        self.check(scene, start, self.frame_index / config.frame_rate)
+
+    def check(self, scene, began: float, now: float) -> None:
+        on_screen = {id(m) for m in scene.get_mobject_family_members()}
+        for text, mob in self.captions:
+            visible = id(mob) in on_screen and _shown(mob)
+            cue = self.showing.get(id(mob))
+            if visible and cue is None:
+                self.showing[id(mob)] = Cue(text, began, began)
+            elif cue is not None and not visible:
+                cue.end = now
+                self.cues.append(self.showing.pop(id(mob)))
+
+    def scene_finished(self, scene):
+        end = self.frame_index / config.frame_rate
+        for cue in self.showing.values():
+            cue.end = end
+            self.cues.append(cue)
+        self.showing.clear()
+        super().scene_finished(scene)
+
+
+def collect_cues(path: Path, scene_name: str, frame_rate: float | None = None) -> list[Cue]:
+    path = Path(path).resolve()
+    with scene_environment(path), tempconfig({"dry_run": True, "progress_bar": "none"}):
+        scene_class = load_scene_class(path, scene_name)
+        # After the import: bloom3.py sets its own frame_rate at module level.
+        if frame_rate:
+            config.frame_rate = frame_rate
+        schedule = getattr(scene_class, "caption_schedule", None)
+        if schedule is not None:
+            return [cue for section in schedule(config.frame_rate) for cue in section.cues]
+        renderer = CueRenderer()
+        with listen_for_captions(renderer.track):
+            scene_class(renderer=renderer).render()
+    if not renderer.captions:
+        logger.warning("%s builds no captions through a caption_helper", scene_name)
+    return sorted(renderer.cues, key=lambda cue: cue.start)
+
+
+def _timestamp(seconds: float, separator: str) -> str:
+    ms = max(0, round(seconds * 1000))
+    hours, ms = divmod(ms, 3_600_000)
+    minutes, ms = divmod(ms, 60_000)
+    secs, ms = divmod(ms, 1000)
+    return f"{hours:02}:{minutes:02}:{secs:02}{separator}{ms:03}"
+
+
+def to_srt(cues: Iterable[Cue]) -> str:
+    blocks = [
+        f"{i}\n{_timestamp(cue.start, ',')} --> {_timestamp(cue.end, ',')}\n{cue.text}\n"
+        for i, cue in enumerate(cues, 1)
+    ]
+    return "\n".join(blocks)
+
+
+def to_vtt(cues: Iterable[Cue]) -> str:
+    blocks = [f"{_timestamp(cue.start, '.')} --> {_timestamp(cue.end, '.')}\n{cue.text}\n" for cue in cues]
+    return "\n".join(["WEBVTT\n", *blocks])
+
+
+def export_subtitles(path: Path, scene_name: str, output_dir: Path | None = None,
+                     formats: Iterable[str] = FORMATS, frame_rate: float | None = None) -> list[Path]:
+    path = Path(path).resolve()
+    cues = collect_cues(path, scene_name, frame_rate)
+    output_dir = Path(output_dir) if output_dir else path.parent / "media" / "subtitles"
+    output_dir.mkdir(parents=True, exist_ok=True)
+
+    writers = {"srt": to_srt, "vtt": to_vtt}
+    outputs = []
+    for fmt in formats:
+        if fmt not in writers:
+            raise ValueError(f"Unknown subtitle format {fmt!r}, expected one of {FORMATS}")
+        output = output_dir / f"{scene_name}.{fmt}"
+        output.write_text(writers[fmt](cues), encoding="utf-8")
+        outputs.append(output)
+    logger.info("Wrote %d cues for %s", len(cues), scene_name)
+    return outputs
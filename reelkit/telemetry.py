@@ -0,0 +1,203 @@
+"""
+Where a render's time goes, play by play.
+
+``Telemetry.attach(scene)`` wraps the renderer and file writer of one scene
+instance (nothing is patched globally) and times every play/wait:
+
+- construct: scene code run since the previous play ended (building
+  mobjects, shaping text)
+- raster: Cairo drawing, including the static background of each play
+- encode: PyAV encoding in the writer thread
+- frames written, partial movie size and whether the cache was hit
+
+Plays are summed per section (SectionedScene sections, or manim's own
+``next_section`` names) and for the scene. ``python -m reelkit render``
+writes the report to ``media/telemetry/<Scene>.json`` for every render:
+
+    python -m reelkit render Bloom2/Bloom2.py Scene1_ThreeSecretAreas Scene2_AIQuery -q l
+"""
+from __future__ import annotations
+
+import functools
+import json
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable
+
+from manim import Scene, config, logger, tempconfig
+
+from reelkit.runner import QUALITIES, load_scene_class, scene_environment
+from reelkit.store import attach as attach_store
+from reelkit.store import store_enabled
+from reelkit.timeline import describe_animation
+
+
+@dataclass
+class PlayStats:
+    index: int
+    section: str | None
+    animations: list[str] = field(default_factory=list)
+    construct: float = 0.0
+    wall: float = 0.0
+    raster: float = 0.0
+    encode: float = 0.0
+    frames: int = 0
+    bytes: int = 0
+    cached: bool | None = None  # None when caching is off
+
+
+TOTALS = ("construct", "wall", "raster", "encode", "frames", "bytes")
+
+
+def summarize(plays: list[PlayStats]) -> dict[str, Any]:
+    summary: dict[str, Any] = {name: sum(getattr(p, name) for p in plays) for name in TOTALS}
+    summary["plays"] = len(plays)
+    summary["cache_hits"] = sum(1 for p in plays if p.cached)
+    return summary
+
+
+class Telemetry:
+    def __init__(self, scene: Scene):
+        self.scene = scene
+        self.plays: list[PlayStats] = []
+        self.current: PlayStats | None = None
+        self.started = time.perf_counter()
+        self.last_end = self.started
+        self.finish = 0.0
+
+    @classmethod
+    def attach(cls, scene: Scene) -> Telemetry:
+        telemetry = cls(scene)
+        renderer, writer = scene.renderer, scene.renderer.file_writer
+        telemetry._wrap(renderer, "play", telemetry._timed_play)
+        telemetry._wrap(renderer, "update_frame", telemetry._add_time("raster"))
+        telemetry._wrap(renderer, "scene_finished", telemetry._timed_finish)
+        telemetry._wrap(writer, "encode_and_write_frame", telemetry._add_time("encode"))
+        telemetry._wrap(writer, "write_frame", telemetry._count_frames)
+        telemetry._wrap(writer, "is_already_cached", telemetry._note_cache)
+        return telemetry
+
+    @staticmethod
+    def _wrap(obj: Any, name: str, wrapper: Callable) -> None:
+        original = getattr(obj, name)
+        setattr(obj, name, functools.wraps(original)(functools.partial(wrapper, original)))
+
+    def _timed_play(self, original, scene, *args, **kwargs):
+        start = time.perf_counter()
+        section = getattr(scene, "current_section", None) or self._writer_section()
+        self.current = PlayStats(len(self.plays), section, construct=start - self.last_end)
+        self.plays.append(self.current)
+        try:
+            return original(scene, *args, **kwargs)
+        finally:
+            self.current.animations = [describe_animation(a) for a in scene.animations or []]
+            self.current.bytes = self._partial_movie_size()
+            self.last_end = time.perf_counter()
+            self.current.wall = self.last_end - start
+
+    def _add_time(self, name: str) -> Callable:
+        def timed(original, *args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return original(*args, **kwargs)
+            finally:
+                if self.current is not None:
+                    setattr(self.current, name, getattr(self.current, name) + time.perf_counter() - start)
+
+        return timed
+
+    def _count_frames(self, original, frame, num_frames: int = 1):
+        if self.current is not None:
+            self.current.frames += num_frames
+        return original(frame, num_frames)
+
+    def _note_cache(self, original, hash_invocation):
+        cached = original(hash_invocation)
+        if self.current is not None:
+            self.current.cached = bool(cached)
+        return cached
+
+    def _timed_finish(self, original, scene):
+        start = time.perf_counter()
+        try:
+            return original(scene)
+        finally:
+            self.finish = time.perf_counter() - start
+
+    def _writer_section(self) -> str | None:
+        sections = self.scene.renderer.file_writer.sections
+        return sections[-1].name if sections else None
+
+    def _partial_movie_size(self) -> int:
+        files = self.scene.renderer.file_writer.partial_movie_files
+        if not files or files[-1] is None:
+            return 0
+        path = Path(files[-1])
+        return path.stat().st_size if path.exists() else 0
+
+    def report(self) -> dict[str, Any]:
+        sections: dict[str, list[PlayStats]] = {}
+        for play in self.plays:
+            sections.setdefault(play.section or "", []).append(play)
+        return {
+            "scene": type(self.scene).__name__,
+            "file": config.input_file,
+            "resolution": [config.pixel_width, config.pixel_height],
+            "frame_rate": config.frame_rate,
+            "wall": time.perf_counter() - self.started,
+            "finish": self.finish,  # combining partial movies
+            "totals": summarize(self.plays),
+            "sections": {name: summarize(plays) for name, plays in sections.items()},
+            "plays": [asdict(p) for p in self.plays],
+        }
+
+
+def write_report(report: dict[str, Any], directory: Path | None = None) -> Path:
+    directory = Path(directory) if directory else config.get_dir("media_dir") / "telemetry"
+    directory.mkdir(parents=True, exist_ok=True)
+    path = directory / f"{report['scene']}.json"
+    path.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    return path
+
+
+def render_with_telemetry(path: Path, scene_name: str, quality: str | None = None,
+                          report_dir: Path | None = None, memory: bool = False,
+                          trace: bool = False, overrides: dict[str, Any] | None = None) -> tuple[Path, list[Path]]:
+    """Render one scene as ``manim`` would and write its telemetry report.
+
+    ``overrides`` are config values set like command line flags. With
+    ``memory`` a reelkit.memory report is written as well. Partial movies
+    go through the reelkit.store artifact store unless REEL_STORE=0.
+    """
+    path = Path(path).resolve()
+    with scene_environment(path), tempconfig({}):
+        # Before the import, so scene files that pin a size still win.
+        if quality:
+            config.quality = QUALITIES[quality]
+        for key, value in (overrides or {}).items():
+            config[key] = value
+        scene_class = load_scene_class(path, scene_name)
+        scene = scene_class()
+        if store_enabled():
+            # First, so telemetry counts store hits as cache hits.
+            attach_store(scene)
+        telemetry = Telemetry.attach(scene)
+        if memory:
+            from reelkit import memory as memory_probe
+
+            probe = memory_probe.MemoryProbe.attach(scene, trace=trace)
+        scene.render()
+        report = telemetry.report()
+        reports = [write_report(report, report_dir).resolve()]
+        if memory:
+            memory_dir = Path(report_dir) / "memory" if report_dir else None
+            reports.append(memory_probe.write_report(probe.report(), memory_dir).resolve())
+        movie = scene.renderer.file_writer.movie_file_path
+        movie = Path(movie).resolve() if movie else None
+    totals = report["totals"]
+    logger.info(
+        "%s: %d plays, %d frames, raster %.1fs, encode %.1fs, construct %.1fs",
+        scene_name, totals["plays"], totals["frames"], totals["raster"], totals["encode"], totals["construct"],
+    )
+    return movie, reports
@@ -0,0 +1,167 @@
+"""
+Dry-run timing pass over a scene.
+
+Runs construct with every play skipped, so nothing is rasterized or
+encoded, and records where each play/wait lands on the output timeline:
+
+    plays = record_timeline(Path("Bloom3/bloom3.py"), "SpaceEconomyIntro")
+
+From the command line the timeline is dumped as JSON with the animations
+and mobjects of every play, checked against platform length limits and
+the scene's BeatPlan (if it has one), and priced in estimated render time:
+
+    python -m reelkit timeline Bloom4/new_Bloom4.py TitleScene TrendsOverviewScene --platform shorts
+"""
+from __future__ import annotations
+
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+
+from manim import config, tempconfig
+from manim.renderer.cairo_renderer import CairoRenderer
+
+from reelkit.captions import frame_count
+from reelkit.runner import QUALITIES, load_scene_class, scene_environment
+
+
+@dataclass
+class PlayRecord:
+    index: int
+    start: float
+    duration: float
+    first_frame: int
+    frames: int
+    section: str | None = None
+    static: bool = False  # a frozen frame: rasterized once, then repeated
+    animations: list[str] = field(default_factory=list)
+    mobjects: list[str] = field(default_factory=list)
+
+
+# Longest video each platform accepts, in seconds.
+PLATFORM_LIMITS = {"shorts": 180.0, "reels": 180.0, "tiktok": 600.0}
+
+# Rough Cairo cost of rasterizing one megapixel frame of a typical reel
+# scene. Calibrate with real render timings for a better estimate.
+FRAME_COST = 0.015
+
+
+def describe_animation(animation) -> str:
+    name = type(animation).__name__
+    methods = getattr(animation, "methods", None)
+    if name == "_MethodAnimation" and methods:
+        return "animate." + ".".join(method.__name__ for method, _, _ in methods)
+    inner = getattr(animation, "animations", None)
+    if inner:
+        return f"{name}({', '.join(describe_animation(a) for a in inner)})"
+    return name
+
+
+def describe_mobject(mobject) -> str:
+    name = type(mobject).__name__
+    text = getattr(mobject, "text", None) or getattr(mobject, "original_text", None)
+    if isinstance(text, str) and text:
+        text = " ".join(text.split())
+        return f"{name}({text[:40] + '...' if len(text) > 40 else text!r})"
+    return name
+
+
+def play_frame_count(scene, frame_rate: float) -> int:
+    # Mirrors how CairoRenderer turns a play into frames: a static wait is
+    # one frozen frame repeated, everything else steps at 1 / frame_rate.
+    if scene.is_current_animation_frozen_frame():
+        return int(scene.duration / (1 / frame_rate))
+    return frame_count(scene.duration, frame_rate)
+
+
+class TimelineRenderer(CairoRenderer):
+    def __init__(self, **kwargs):
+        super().__init__(skip_animations=True, **kwargs)
+        self.plays: list[PlayRecord] = []
+        self.frame_index = 0
+
+    def play(self, scene, *args, **kwargs):
+        # Ask the skipping rules what a real render would do with this play.
+        self.skip_animations = False
+        self.update_skipping_status()
+        skipped = self.skip_animations
+        self.skip_animations = True
+
+        scene.compile_animation_data(*args, **kwargs)
+        frames = 0 if skipped else play_frame_count(scene, config.frame_rate)
+        mobjects = []
+        for animation in scene.animations:
+            if animation.mobject.submobjects or animation.mobject.has_points():
+                mobjects.append(describe_mobject(animation.mobject))
+        self.plays.append(PlayRecord(
+            index=self.num_plays,
+            start=self.frame_index / config.frame_rate,
+            duration=frames / config.frame_rate,
+            first_frame=self.frame_index,
+            frames=frames,
+            section=self.file_writer.sections[-1].name,
+            static=scene.is_current_animation_frozen_frame(),
+            animations=[describe_animation(a) for a in scene.animations],
+            mobjects=list(dict.fromkeys(mobjects)),
+        ))
+        self.frame_index += frames
+
+        self.file_writer.add_partial_movie_file(None)
+        scene.begin_animations()
+        if not scene.is_current_animation_frozen_frame():
+            scene.play_internal()
+        self.time += scene.duration
+        self.num_plays += 1
+
+
+def record_timeline(path: Path, scene_name: str, quality: str | None = None,
+                    resolution: tuple[int, int] | None = None) -> list[PlayRecord]:
+    with scene_environment(path), tempconfig({"dry_run": True, "progress_bar": "none"}):
+        # The frame rate decides the frame count, so match the real render's.
+        if quality:
+            config.quality = QUALITIES[quality]
+        if resolution:
+            config.pixel_width, config.pixel_height = resolution
+        scene_class = load_scene_class(path, scene_name)
+        renderer = TimelineRenderer()
+        scene_class(renderer=renderer).render()
+    return renderer.plays
+
+
+def timeline_report(path: Path, scene_name: str, max_seconds: float | None = None,
+                    frame_cost: float = FRAME_COST) -> dict:
+    """JSON-ready timeline of one scene, with length checks and a cost estimate."""
+    path = Path(path).resolve()
+    # Read the settings inside the run: scene files change config on import.
+    with scene_environment(path), tempconfig({"dry_run": True, "progress_bar": "none"}):
+        scene_class = load_scene_class(path, scene_name)
+        renderer = TimelineRenderer()
+        scene_class(renderer=renderer).render()
+        frame_rate = config.frame_rate
+        resolution = [config.pixel_width, config.pixel_height]
+    plays = renderer.plays
+    frames = sum(p.frames for p in plays)
+    duration = frames / frame_rate
+    # Frozen waits are rasterized once; everything else once per frame.
+    raster_frames = sum(1 if p.static else p.frames for p in plays if p.frames)
+    megapixels = resolution[0] * resolution[1] / 1e6
+
+    problems = []
+    if max_seconds is not None and duration > max_seconds + 1e-9:
+        problems.append(f"{duration:.2f}s is over the {max_seconds:g}s limit")
+    plan = getattr(scene_class, "plan", None)
+    if plan is not None and abs(duration - plan.total) >= 1 / frame_rate:
+        problems.append(f"renders {duration:.2f}s but its beat plan totals {plan.total:g}s")
+
+    return {
+        "scene": scene_name,
+        "file": str(path),
+        "frame_rate": frame_rate,
+        "resolution": resolution,
+        "duration": duration,
+        "frames": frames,
+        "raster_frames": raster_frames,
+        "estimated_render_seconds": round(raster_frames * megapixels * frame_cost, 1),
+        "plan_total": plan.total if plan is not None else None,
+        "problems": problems,
+        "plays": [asdict(p) for p in plays],
+    }
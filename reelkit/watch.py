@@ -0,0 +1,358 @@
+"""
+Re-render what an edit touched and show it in the browser.
+
+``python -m reelkit watch`` polls the given scene files. When one is saved,
+the changed lines are diffed against the previous version and mapped to
+scenes with reelkit.discovery: an edit inside a SectionedScene's
+``section_<name>`` method renders just that section (REEL_RESUME and
+REEL_STOP_AFTER, from its checkpoint or independently), any other edit in a
+scene renders that scene, and edits outside every scene (imports, module
+helpers) render the scene shown last. Renders run at preview quality on a
+render worker (see reelkit.worker) that watch starts for itself, so manim is
+imported once, not on every save; each render still re-executes the file and
+re-imports edited helper modules. They go through manim's partial movie
+cache and the reelkit.store, so unchanged plays are not rendered again:
+
+    python -m reelkit watch Bloom4/cro_story.py
+    python -m reelkit watch Bloom3/bloom3.py --scene SpaceEconomyIntro --open
+
+The page at http://127.0.0.1:8765 plays the latest result and reloads it
+when the next one is ready; syntax, preflight and render errors show there
+instead.
+"""
+from __future__ import annotations
+
+import ast
+import difflib
+import html
+import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import asdict, dataclass, field
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+
+from reelkit.discovery import ROOT, SceneInfo, build_index, scene_at
+from reelkit.preflight import check_file
+from reelkit.worker import request
+
+SECTION_PREFIX = "section_"
+
+
+@dataclass
+class Slice:
+    file: str  # relative to the repository root
+    scene: str
+    resume: str | None = None  # first section, None for the start
+    stop: str | None = None  # last section, None for the end
+
+    def __str__(self) -> str:
+        if self.resume is None and self.stop is None:
+            return self.scene
+        if self.resume == self.stop:
+            return f"{self.scene} [{self.resume}]"
+        return f"{self.scene} [{self.resume or 'start'}..{self.stop or 'end'}]"
+
+
+@dataclass
+class State:
+    version: int = 0
+    status: str = "waiting for a change"
+    slice: str | None = None
+    video: str | None = None
+    seconds: float | None = None
+    errors: list[str] = field(default_factory=list)
+
+
+def changed_lines(old: str, new: str) -> list[int]:
+    """1-based lines of ``new`` that differ from ``old`` (or border a deletion)."""
+    lines = set()
+    matcher = difflib.SequenceMatcher(None, old.splitlines(), new.splitlines(), autojunk=False)
+    for tag, _, _, j1, j2 in matcher.get_opcodes():
+        if tag == "equal":
+            continue
+        lines.update(range(j1 + 1, j2 + 1) if j2 > j1 else [max(j1, 1)])
+    return sorted(lines)
+
+
+def slices_for(file: Path, lines: list[int], focus: str | None) -> list[Slice]:
+    """The smallest renders that cover ``lines`` of ``file``."""
+    relative = file.resolve().relative_to(ROOT).as_posix()
+    scenes: dict[str, SceneInfo] = {}
+    sections: dict[str, set[str]] = {}
+    whole: set[str] = set()
+    outside = False
+    for line in lines:
+        found = scene_at(str(file), line)
+        if found is None:
+            outside = True
+            continue
+        scene, method = found
+        if not scene.renderable:
+            # A shared base (BaseBloomScene) has no render of its own.
+            outside = True
+            continue
+        scenes[scene.name] = scene
+        section = method.removeprefix(SECTION_PREFIX) if method else None
+        if section in scene.sections:
+            sections.setdefault(scene.name, set()).add(section)
+        else:
+            whole.add(scene.name)
+
+    if outside:
+        renderable = [s for s in build_index().get(relative, []) if s.renderable]
+        target = next((s for s in renderable if s.name == focus), renderable[0] if renderable else None)
+        if target is not None:
+            scenes[target.name] = target
+            whole.add(target.name)
+
+    result = []
+    for name, scene in sorted(scenes.items(), key=lambda item: item[1].start):
+        if name in whole:
+            result.append(Slice(relative, name))
+            continue
+        order = [s for s in scene.sections if s in sections[name]]
+        result.append(Slice(relative, name, order[0], order[-1]))
+    return result
+
+
+def byte_range(header: str, size: int) -> tuple[int, int]:
+    """First and last byte of a single ``bytes=`` range; ValueError if it cannot be served."""
+    unit, _, spec = header.partition("=")
+    first, dash, last = spec.strip().partition("-")
+    if unit.strip() != "bytes" or not dash or not (first or last):
+        raise ValueError(f"Malformed range {header!r}")
+    if first:
+        start = int(first)
+        end = min(int(last), size - 1) if last else size - 1
+    else:  # the last N bytes
+        start, end = max(size - int(last), 0), size - 1
+    if start < 0 or start > end:
+        raise ValueError(f"Range {header!r} is outside the {size} byte file")
+    return start, end
+
+
+class Watcher:
+    def __init__(self, files: list[Path], quality: str = "l", focus: str | None = None, poll: float = 0.4):
+        self.files = [Path(f).resolve() for f in files]
+        self.quality = quality
+        self.focus = focus
+        self.poll = poll
+        self.report_dir = ROOT / ".reelkit" / "watch"
+        self.socket_path = ROOT / ".reelkit" / f"watch-{os.getpid()}.sock"
+        self.worker: subprocess.Popen | None = None
+        self.state = State()
+        self.lock = threading.Lock()
+        self.stamps = {f: f.stat().st_mtime_ns for f in self.files}
+        self.texts = {f: f.read_text(encoding="utf-8") for f in self.files}
+
+    def start_worker(self) -> None:
+        self.worker = subprocess.Popen(
+            [sys.executable, "-m", "reelkit", "worker", "--socket", str(self.socket_path)], cwd=ROOT,
+        )
+        # Ready once it answers; importing manim and loading fonts takes a while.
+        while True:
+            if self.worker.poll() is not None:
+                raise RuntimeError(f"render worker exited with code {self.worker.returncode} while starting")
+            try:
+                request({"command": "ping"}, self.socket_path)
+                return
+            except ConnectionError:
+                time.sleep(0.2)
+
+    def stop_worker(self) -> None:
+        if self.worker is None or self.worker.poll() is not None:
+            return
+        try:
+            request({"command": "shutdown"}, self.socket_path)
+            self.worker.wait(timeout=10)
+        except (ConnectionError, subprocess.TimeoutExpired):
+            self.worker.terminate()
+
+    def update(self, **changes) -> None:
+        with self.lock:
+            for key, value in changes.items():
+                setattr(self.state, key, value)
+            self.state.version += 1
+
+    def snapshot(self) -> dict:
+        with self.lock:
+            return asdict(self.state)
+
+    def run(self) -> None:
+        while True:
+            time.sleep(self.poll)
+            for file in self.files:
+                try:
+                    if file.stat().st_mtime_ns == self.stamps[file]:
+                        continue
+                    time.sleep(self.poll)  # let the editor finish writing
+                    self.stamps[file] = file.stat().st_mtime_ns
+                    text = file.read_text(encoding="utf-8")
+                except FileNotFoundError:  # replaced by an atomic save, back next poll
+                    continue
+                lines = changed_lines(self.texts[file], text)
+                self.texts[file] = text
+                if lines:
+                    self.changed(file, text, lines)
+
+    def changed(self, file: Path, text: str, lines: list[int]) -> None:
+        relative = file.relative_to(ROOT).as_posix()
+        try:
+            ast.parse(text, filename=relative)
+        except SyntaxError as exc:
+            self.update(status="syntax error", errors=[f"{relative}:{exc.lineno}: {exc.msg}"])
+            return
+        slices = slices_for(file, lines, self.focus)
+        if not slices:
+            self.update(status=f"{relative}: lines {lines[0]}-{lines[-1]} belong to no scene", errors=[])
+            return
+        for piece in slices:
+            issues = [i for i in check_file(file, [piece.scene]) if i.error]
+            if issues:
+                self.update(status=f"preflight failed for {piece}", errors=[str(i) for i in issues])
+                continue
+            self.render(piece)
+
+    def render(self, piece: Slice) -> None:
+        self.update(status=f"rendering {piece}", slice=str(piece), errors=[])
+        print(f"rendering {piece}", file=sys.stderr)
+        started = time.perf_counter()
+        try:
+            reply = self._render(piece.resume, piece)
+            # reelkit.sections.CheckpointError, reported by name across the socket.
+            if not reply["ok"] and piece.resume is not None and reply.get("type") == "CheckpointError":
+                # Missing, stale or unreadable: render from the start up to the section.
+                print(f"{reply['error']}; rendering from the start", file=sys.stderr)
+                reply = self._render(None, piece)
+        except Exception as exc:
+            reply = {"ok": False, "error": f"{type(exc).__name__}: {exc}"}
+        if not reply["ok"]:
+            self.update(status=f"{piece} failed", errors=[reply["error"]])
+            return
+        movie = reply["output"]
+        self.focus = piece.scene
+        seconds = time.perf_counter() - started
+        self.update(status=f"rendered {piece} in {seconds:.1f}s", video=movie, seconds=seconds)
+        print(f"{movie} ({seconds:.1f}s)", file=sys.stderr)
+
+    def _render(self, resume: str | None, piece: Slice) -> dict:
+        stop = piece.stop
+        name = piece.scene if resume is None and stop is None else f"{piece.scene}_{resume or 'start'}_{stop or 'end'}"
+        payload = {
+            "file": str(ROOT / piece.file),
+            "scene": piece.scene,
+            "quality": self.quality,
+            "config": {"output_file": name, "progress_bar": "none"},
+            "env": {"REEL_RESUME": resume, "REEL_STOP_AFTER": stop},
+            "report_dir": str(self.report_dir),
+        }
+        try:
+            return request(payload, self.socket_path)
+        except ConnectionError:  # the worker died (a crash in Cairo, say); start another
+            self.start_worker()
+            return request(payload, self.socket_path)
+
+
+PAGE = """<!doctype html>
+<meta charset="utf-8">
+<title>reelkit watch</title>
+<style>
+  body {{ background: #111; color: #ddd; font: 14px system-ui, sans-serif; margin: 1rem; }}
+  video {{ max-height: 85vh; max-width: 100%; background: #000; display: block; }}
+  pre {{ color: #f88; white-space: pre-wrap; }}
+</style>
+<p>watching {files} &middot; <span id="status"></span></p>
+<video id="video" controls autoplay loop muted></video>
+<pre id="errors"></pre>
+<script>
+  let version = -1;
+  async function poll() {{
+    try {{
+      const state = await (await fetch("/state")).json();
+      if (state.version !== version) {{
+        document.getElementById("status").textContent = state.status;
+        document.getElementById("errors").textContent = state.errors.join("\\n");
+        const video = document.getElementById("video");
+        if (state.video && state.errors.length === 0) video.src = "/video?v=" + state.version;
+        version = state.version;
+      }}
+    }} catch (e) {{
+      document.getElementById("status").textContent = "watch stopped";
+    }}
+    setTimeout(poll, 500);
+  }}
+  poll();
+</script>
+"""
+
+
+def make_handler(watcher: Watcher) -> type[BaseHTTPRequestHandler]:
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            route = self.path.split("?", 1)[0]
+            if route == "/":
+                files = ", ".join(html.escape(f.relative_to(ROOT).as_posix()) for f in watcher.files)
+                self._send(PAGE.format(files=files).encode(), "text/html; charset=utf-8")
+            elif route == "/state":
+                self._send(json.dumps(watcher.snapshot()).encode(), "application/json")
+            elif route == "/video" and watcher.snapshot()["video"]:
+                self._send_file(Path(watcher.snapshot()["video"]))
+            else:
+                self.send_error(HTTPStatus.NOT_FOUND)
+
+        def _send(self, body: bytes, content_type: str, status: HTTPStatus = HTTPStatus.OK, headers=()):
+            self.send_response(status)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.send_header("Cache-Control", "no-store")
+            for key, value in headers:
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def _send_file(self, path: Path):
+            data = path.read_bytes()
+            # Browsers seek (and Safari plays at all) through range requests.
+            ranged = self.headers.get("Range", "")
+            if not ranged or "," in ranged:  # several ranges: the whole file will do
+                self._send(data, "video/mp4", headers=[("Accept-Ranges", "bytes")])
+                return
+            try:
+                start, end = byte_range(ranged, len(data))
+            except ValueError:
+                headers = [("Content-Range", f"bytes */{len(data)}")]
+                self._send(b"", "video/mp4", HTTPStatus.REQUESTED_RANGE_NOT_SATISFIABLE, headers)
+                return
+            headers = [("Accept-Ranges", "bytes"), ("Content-Range", f"bytes {start}-{end}/{len(data)}")]
+            self._send(data[start:end + 1], "video/mp4", HTTPStatus.PARTIAL_CONTENT, headers)
+
+        def log_message(self, format, *args):  # the page polls twice a second
+            pass
+
+    return Handler
+
+
+def serve(files: list[Path], quality: str = "l", focus: str | None = None, port: int = 8765,
+          open_browser: bool = False) -> None:
+    watcher = Watcher(files, quality, focus)
+    watcher.start_worker()
+    server = ThreadingHTTPServer(("127.0.0.1", port), make_handler(watcher))
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    url = f"http://127.0.0.1:{server.server_address[1]}/"
+    print(f"watching {', '.join(f.name for f in watcher.files)}, preview at {url}", file=sys.stderr)
+    if open_browser:
+        import webbrowser
+
+        webbrowser.open(url)
+    try:
+        watcher.run()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.shutdown()
+        watcher.stop_worker()
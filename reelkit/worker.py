@@ -0,0 +1,162 @@
+"""
+A long-lived render worker that keeps manim warm between jobs.
+
+Starting a render costs seconds before the first frame: importing manim,
+NumPy and Cairo, loading fonts, parsing config. For the short new_Bloom4
+scenes that is a large share of the whole render. The worker pays it once
+and then takes jobs over a Unix socket, one JSON object per line:
+
+    python -m reelkit worker &
+    python -m reelkit submit Bloom4/new_Bloom4.py TitleScene -q l
+    python -m reelkit submit Bloom4/new_Bloom4.py CtaScene --set frame_rate=30
+
+A request may also carry ``env`` (variables such as REEL_RESUME for this job
+only, ``null`` to unset one) and ``report_dir``; ``python -m reelkit watch``
+renders through a worker of its own this way.
+
+Every job re-executes its scene file, so edits are always picked up and
+module-level config (a scene's own size or frame rate) applies again.
+When any scene-folder module a job imported (helpers such as
+``Bloom4/cro_story.py``) has changed since, those modules are dropped from
+``sys.modules`` so the next job imports the new code. Until then they stay
+loaded, with their caches. reelkit itself, including this worker, stays
+loaded: restart the worker after editing it.
+
+Jobs run one at a time; start several workers on different sockets to
+render in parallel.
+"""
+from __future__ import annotations
+
+import json
+import os
+import socket
+import sys
+import time
+from pathlib import Path
+from typing import Any
+
+ROOT = Path(__file__).resolve().parents[1]
+SOCKET = ROOT / ".reelkit" / "worker.sock"
+
+
+def _warm_up() -> None:
+    from manim import Text
+
+    # Pango enumerates and caches the system fonts on the first Text.
+    Text("warm", font_size=12)
+
+
+def _set_env(values: dict[str, str | None]) -> None:
+    for key, value in values.items():
+        if value is None:
+            os.environ.pop(key, None)
+        else:
+            os.environ[key] = value
+
+
+class Worker:
+    def __init__(self, socket_path: Path = SOCKET):
+        self.socket_path = Path(socket_path)
+        self.stamps: dict[str, int] = {}  # module file: mtime_ns when imported
+        self.running = True
+
+    def serve(self) -> None:
+        started = time.perf_counter()
+        _warm_up()
+        self._record_stamps()
+        print(f"worker warm in {time.perf_counter() - started:.1f}s, listening on {self.socket_path}", file=sys.stderr)
+
+        self.socket_path.parent.mkdir(parents=True, exist_ok=True)
+        if self.socket_path.exists():
+            self.socket_path.unlink()
+        with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as server:
+            server.bind(str(self.socket_path))
+            server.listen()
+            try:
+                while self.running:
+                    conn, _ = server.accept()
+                    with conn, conn.makefile("rw", encoding="utf-8") as stream:
+                        for line in stream:
+                            stream.write(json.dumps(self.handle(json.loads(line))) + "\n")
+                            stream.flush()
+            finally:
+                self.socket_path.unlink(missing_ok=True)
+
+    def handle(self, request: dict[str, Any]) -> dict[str, Any]:
+        command = request.get("command", "render")
+        if command == "ping":
+            return {"ok": True, "pid": os.getpid()}
+        if command == "shutdown":
+            self.running = False
+            return {"ok": True}
+        try:
+            return {"ok": True, **self.render(request)}
+        except Exception as exc:  # report it and keep serving
+            return {"ok": False, "error": f"{type(exc).__name__}: {exc}", "type": type(exc).__name__}
+
+    def render(self, request: dict[str, Any]) -> dict[str, Any]:
+        from reelkit.telemetry import render_with_telemetry
+
+        started = time.perf_counter()
+        path = Path(request["file"]).resolve()
+        reloaded = self._drop_changed_modules()
+        report_dir = request.get("report_dir")
+        saved = {key: os.environ.get(key) for key in request.get("env", {})}
+        _set_env(request.get("env", {}))
+        try:
+            movie, reports = render_with_telemetry(
+                path, request["scene"], request.get("quality"), Path(report_dir) if report_dir else None,
+                overrides=request.get("config"),
+            )
+        finally:
+            _set_env(saved)
+        self._record_stamps()
+        return {
+            "output": str(movie),
+            "reports": [str(r) for r in reports],
+            "reloaded": reloaded,
+            "seconds": time.perf_counter() - started,
+        }
+
+    def _repo_modules(self):
+        for name, module in list(sys.modules.items()):
+            # __main__ and reelkit are what is running this loop.
+            if name == "__main__" or name == "reelkit" or name.startswith("reelkit."):
+                continue
+            file = getattr(module, "__file__", None)
+            if file and Path(file).resolve().is_relative_to(ROOT):
+                yield name, str(Path(file).resolve())
+
+    def _record_stamps(self) -> None:
+        for _, file in self._repo_modules():
+            if os.path.exists(file):
+                self.stamps.setdefault(file, os.stat(file).st_mtime_ns)
+
+    def _drop_changed_modules(self) -> list[str]:
+        modules = list(self._repo_modules())
+        changed = any(
+            (os.stat(file).st_mtime_ns if os.path.exists(file) else None) != self.stamps.get(file)
+            for _, file in modules
+        )
+        if not changed:
+            return []
+        # Drop them all, so no unchanged module keeps using a stale one.
+        for name, _ in modules:
+            del sys.modules[name]
+        self.stamps.clear()
+        return [name for name, _ in modules]
+
+
+def request(payload: dict[str, Any], socket_path: Path = SOCKET) -> dict[str, Any]:
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as client:
+        try:
+            client.connect(str(socket_path))
+        except (FileNotFoundError, ConnectionRefusedError) as exc:
+            raise ConnectionError(f"No worker on {socket_path}, start one with: python -m reelkit worker") from exc
+        with client.makefile("rw", encoding="utf-8") as stream:
+            stream.write(json.dumps(payload) + "\n")
+            stream.flush()
+            reply = stream.readline()
+    if not reply:
+        raise ConnectionError(f"The worker on {socket_path} closed the connection without replying")
+    return json.loads(reply)
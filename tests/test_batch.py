@@ -0,0 +1,48 @@
+import sys
+
+import pytest
+
+from reelkit import batch
+
+
+@pytest.mark.parametrize("text, size", [
+    ("8G", 8 * 2**30),
+    ("512M", 512 * 2**20),
+    ("2.5GiB", int(2.5 * 2**30)),
+    (" 64kb ", 64 * 2**10),
+    ("1T", 2**40),
+    ("4096", 4096),
+])
+def test_parse_size(text, size):
+    assert batch.parse_size(text) == size
+
+
+@pytest.mark.parametrize("text", ["", "G", "lots", "8X"])
+def test_parse_size_rejects(text):
+    with pytest.raises(ValueError):
+        batch.parse_size(text)
+
+
+def run_order(monkeypatch, max_wait):
+    # Expected peaks after the margin: A 690, B 575, C and D 460 each.
+    monkeypatch.setattr(batch, "load_estimates", lambda: {"a:A:-": 600, "b:B:-": 500, "c:C:-": 400, "d:D:-": 400})
+    monkeypatch.setattr(batch, "save_estimates", lambda estimates: None)
+    started = []
+
+    def command(job):
+        started.append(job.scene)
+        return [sys.executable, "-c", f"import time; time.sleep({0.4 if job.scene == 'A' else 0.05})"]
+
+    monkeypatch.setattr(batch, "_command", command)
+    jobs = [batch.Job(name.lower(), name) for name in "ABCD"]
+    results = batch.run_batch(jobs, budget=1200, workers=4, poll=0.02, max_wait=max_wait)
+    assert sorted(r.job.scene for r in results) == list("ABCD")
+    return started
+
+
+def test_small_jobs_fill_the_gaps(monkeypatch):
+    assert run_order(monkeypatch, max_wait=60) == list("ACDB")
+
+
+def test_a_job_that_waited_long_enough_goes_next(monkeypatch):
+    assert run_order(monkeypatch, max_wait=0) == list("ABCD")
@@ -0,0 +1,43 @@
+import pytest
+
+from reelkit.beats import Beat, BeatPlan
+
+
+def test_beats_follow_each_other():
+    plan = BeatPlan(3.0, ("a", 1.0), ("b", 1.5), ("c", 0.5))
+    assert [(b.name, b.start, b.end) for b in plan] == [("a", 0.0, 1.0), ("b", 1.0, 2.5), ("c", 2.5, 3.0)]
+    assert plan.span("a", "b") == 2.5
+    assert plan["c"].duration == 0.5
+
+
+def test_fill_beat_takes_the_rest():
+    plan = BeatPlan(8.5, ("lead_in", 0.5), ("caption", 4.5), Beat("arrows", 1.5, overlap=1.5),
+                    ("hold", 1.0), ("pad", None), ("fade", 0.25))
+    assert plan["arrows"].start == 3.5
+    assert plan["pad"].duration == pytest.approx(2.25)
+    assert plan["fade"].end == pytest.approx(8.5)
+
+
+def test_overlapping_beats_are_not_cut():
+    plan = BeatPlan(3.0, ("a", 1.0), ("b", 1.5), Beat("c", 1.0, overlap=1.0), ("d", 0.5))
+    # c starts inside b, so nothing can be cut between them.
+    assert plan.boundaries() == [0.0, 1.0, 2.5, 3.0]
+    assert plan.frame_ranges(30) == [("a", 0, 30), ("b", 30, 75), ("d", 75, 90)]
+
+
+@pytest.mark.parametrize("args, message", [
+    ((3.0, ("a", 1.0), ("b", 1.0)), "total is 3.0s"),
+    ((1.0, ("a", 1.0), ("b", 1.0)), "total is 1.0s"),
+    ((1.0, ("a", 1.5), ("b", None)), "over the 1.0s total"),
+    ((2.0, ("a", None), ("b", None)), "Only one beat"),
+    ((2.0, ("a", 1.0), ("a", 1.0)), "unique"),
+    ((2.0, ("a", 0.5), Beat("b", 1.0, overlap=1.0)), "longer than 'a'"),
+])
+def test_inconsistent_plans_fail_at_definition(args, message):
+    with pytest.raises(ValueError, match=message):
+        BeatPlan(*args)
+
+
+def test_unknown_beat():
+    with pytest.raises(KeyError):
+        BeatPlan(1.0, ("a", 1.0))["b"]
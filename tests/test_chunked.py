@@ -0,0 +1,34 @@
+import pytest
+
+pytest.importorskip("manim")
+
+from reelkit.beats import BeatPlan  # noqa: E402
+from reelkit.chunked import plan_beat_chunks, plan_chunks  # noqa: E402
+from reelkit.timeline import PlayRecord  # noqa: E402
+
+
+def plays(*frames):
+    records, first = [], 0
+    for index, count in enumerate(frames):
+        records.append(PlayRecord(index, first / 60, count / 60, first, count))
+        first += count
+    return records
+
+
+def test_chunks_cover_every_frame_once():
+    ranges = plan_chunks(plays(30, 45, 25), 3)
+    assert ranges[0][0] == 0 and ranges[-1][1] == 100
+    assert all(a[1] == b[0] for a, b in zip(ranges, ranges[1:]))
+    assert [b - a for a, b in ranges] == [33, 34, 33]
+
+
+def test_never_more_chunks_than_frames():
+    assert plan_chunks(plays(2), 8) == [(0, 1), (1, 2)]
+    assert plan_chunks(plays(0), 4) == []
+
+
+def test_beat_chunks_scale_onto_measured_frames():
+    plan = BeatPlan(2.0, ("a", 0.5), ("b", 1.0), ("c", 0.5))
+    # 121 measured frames for a 2 s plan: rounding never drops the last one.
+    ranges = plan_beat_chunks(plays(61, 60), plan)
+    assert ranges == [(0, 30), (30, 91), (91, 121)]
@@ -0,0 +1,52 @@
+import argparse
+
+import pytest
+
+from reelkit import __main__ as cli
+from reelkit import discovery
+
+SCENES = '''from manim import *
+
+
+class Intro(Scene):
+    def construct(self):
+        self.wait()
+'''
+
+
+@pytest.fixture
+def tree(tmp_path):
+    root = tmp_path / "repo"
+    (root / "Reel").mkdir(parents=True)
+    (root / "Reel" / "good.py").write_text(SCENES)
+    (root / "Reel" / "broken.py").write_text("class Broken(Scene:\n    pass\n")
+    return root, tmp_path / "index.json"
+
+
+def test_syntax_errors_are_reported(tree):
+    root, index_path = tree
+    index = discovery.build_index(root, index_path)
+    assert [s.name for s in index["Reel/good.py"]] == ["Intro"]
+    assert index["Reel/broken.py"] == []
+    errors = discovery.scan_errors(root, index_path)
+    assert list(errors) == ["Reel/broken.py"] and "line 1" in errors["Reel/broken.py"]
+    # Still reported when the cached index is reused.
+    assert discovery.scan_errors(root, index_path) == errors
+
+
+def test_list_prints_syntax_errors_and_fails(tree, monkeypatch, capsys):
+    root, index_path = tree
+    index = discovery.build_index(root, index_path)
+    scenes = [s for file_scenes in index.values() for s in file_scenes]
+    monkeypatch.setattr(discovery, "discover", lambda patterns, renderable_only: scenes)
+    errors = discovery.scan_errors(root, index_path)
+    monkeypatch.setattr(discovery, "scan_errors", lambda: errors)
+    with pytest.raises(SystemExit) as exit:
+        cli._list(argparse.Namespace(patterns=[], all=False, json=False))
+    assert exit.value.code == 1
+    out, err = capsys.readouterr()
+    assert "Reel/good.py:Intro" in out
+    assert "Reel/broken.py: SyntaxError:" in err
+
+    # Errors in files the patterns leave out do not count.
+    cli._list(argparse.Namespace(patterns=["good"], all=False, json=True))
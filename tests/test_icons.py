@@ -0,0 +1,50 @@
+import numpy as np
+import pytest
+
+pytest.importorskip("manim")
+
+from manim import BLUE, ParametricFunction, Rectangle, VGroup  # noqa: E402
+
+from reelkit import icons  # noqa: E402
+
+
+def wave(t):
+    return np.array([t, np.sin(t), 0])
+
+
+@icons.icon
+def make_panel(color=BLUE):
+    frame = Rectangle(width=2, height=1, grid_xstep=0.5, grid_ystep=0.5, color=color)
+    return VGroup(frame, ParametricFunction(wave, t_range=(0, 2)))
+
+
+@icons.icon
+def make_curve():
+    return ParametricFunction(lambda t: np.array([t, t * t, 0]), t_range=(0, 1))
+
+
+@pytest.fixture
+def cache(tmp_path, monkeypatch):
+    monkeypatch.setenv("REEL_ICON_CACHE", str(tmp_path))
+    icons.clear_icons()
+    yield tmp_path
+    icons.clear_icons()
+
+
+def test_cached_icon_matches_a_fresh_one(cache):
+    make_panel()
+    (path,) = cache.glob("make_panel-*.pkl")
+    cached, fresh = icons._load(path), make_panel.build()
+
+    for a, b in zip(cached.get_family(), fresh.get_family(), strict=True):
+        assert type(a) is type(b)
+        assert set(vars(a)) == set(vars(b))
+        assert np.array_equal(a.points, b.points)
+    frame, curve = cached
+    assert frame.grid_lines in frame.submobjects
+    assert curve.function is wave
+
+
+def test_unpicklable_icons_stay_in_memory(cache):
+    assert make_curve() is not make_curve()
+    assert not list(cache.glob("make_curve-*.pkl"))
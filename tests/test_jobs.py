@@ -0,0 +1,125 @@
+import os
+import subprocess
+import sys
+import time
+
+import pytest
+
+from reelkit import jobs
+
+SCENE_FILE = str(jobs.ROOT / "Bloom4" / "new_Bloom4.py")
+
+
+@pytest.fixture
+def db(tmp_path, monkeypatch):
+    monkeypatch.setattr(jobs, "LOGS", tmp_path / "logs")
+    monkeypatch.setenv("REEL_PREFLIGHT", "0")
+    return jobs.connect(tmp_path / "jobs.db")
+
+
+def states(db):
+    return {row["scene"]: row["state"] for row in jobs.status(db)}
+
+
+def test_add_job_upserts(db):
+    first = jobs.add_job(db, SCENE_FILE, "TitleScene", "l", priority=1)
+    db.execute("UPDATE jobs SET state = 'failed', attempts = 3, error = 'boom'")
+    again = jobs.add_job(db, SCENE_FILE, "TitleScene", "l", priority=5, max_attempts=4)
+    assert first == again
+    row = db.execute("SELECT * FROM jobs").fetchone()
+    assert (row["state"], row["attempts"], row["priority"], row["max_attempts"], row["error"]) == (
+        "queued", 0, 5, 4, None,
+    )
+    assert row["file"] == "Bloom4/new_Bloom4.py"
+    assert jobs.add_job(db, SCENE_FILE, "TitleScene", "h") != first
+
+
+def test_add_job_leaves_running_jobs_alone(db):
+    jobs.add_job(db, SCENE_FILE, "TitleScene", priority=1)
+    db.execute("UPDATE jobs SET state = 'running', attempts = 1")
+    jobs.add_job(db, SCENE_FILE, "TitleScene", priority=9)
+    row = db.execute("SELECT state, attempts, priority FROM jobs").fetchone()
+    assert tuple(row) == ("running", 1, 1)
+
+
+def test_ready_orders_by_priority_then_age(db):
+    jobs.add_job(db, SCENE_FILE, "A", priority=1)
+    jobs.add_job(db, SCENE_FILE, "B", priority=5)
+    jobs.add_job(db, SCENE_FILE, "C", priority=1)
+    jobs.add_job(db, SCENE_FILE, "D", priority=9)
+    db.execute("UPDATE jobs SET not_before = ? WHERE scene = 'D'", (time.time() + 60,))
+    assert [job.scene for job in jobs._ready(db)] == ["B", "A", "C"]
+
+
+def test_retry_delay_doubles():
+    assert [jobs.retry_delay(n) for n in (1, 2, 3)] == [jobs.RETRY_DELAY, 2 * jobs.RETRY_DELAY, 4 * jobs.RETRY_DELAY]
+
+
+def test_failures_retry_then_fail(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(jobs, "RETRY_DELAY", 0.01)
+    monkeypatch.setattr(jobs.QueuedJob, "command", lambda self: [sys.executable, "-c", "raise SystemExit(3)"])
+    jobs.add_job(db, SCENE_FILE, "TitleScene", max_attempts=2)
+    jobs.run_queue(db, budget=2**40, cores=4, poll=0.01, lock=tmp_path / "jobs.lock")
+    row = db.execute("SELECT state, attempts, error FROM jobs").fetchone()
+    assert (row["state"], row["attempts"]) == ("failed", 2)
+    assert row["error"].startswith("exit code 3")
+
+
+def test_success_without_output_is_reported(db, tmp_path, monkeypatch):
+    monkeypatch.setattr(jobs.QueuedJob, "command", lambda self: [sys.executable, "-c", "pass"])
+    jobs.add_job(db, SCENE_FILE, "TitleScene", max_attempts=1)
+    jobs.run_queue(db, budget=2**40, cores=4, poll=0.01, lock=tmp_path / "jobs.lock")
+    assert db.execute("SELECT error FROM jobs").fetchone()[0].startswith("no output found")
+
+
+def test_blocked_job_holds_back_lower_priorities(db, tmp_path, monkeypatch):
+    started = []
+
+    def command(self):
+        started.append(self.scene)
+        return [sys.executable, "-c", "import time; time.sleep(0.2)"]
+
+    monkeypatch.setattr(jobs.QueuedJob, "command", command)
+    usage = {"Small": (1, 1.0), "Big": (10, 1.0), "Later": (1, 1.0)}
+    monkeypatch.setattr(jobs, "_usage", lambda db, job: usage[job.scene])
+    jobs.add_job(db, SCENE_FILE, "Small", priority=9, max_attempts=1)
+    jobs.add_job(db, SCENE_FILE, "Big", priority=5, max_attempts=1)
+    jobs.add_job(db, SCENE_FILE, "Later", priority=1, max_attempts=1)
+    jobs.run_queue(db, budget=10, cores=4, poll=0.01, lock=tmp_path / "jobs.lock")
+    assert started == ["Small", "Big", "Later"]
+
+
+def test_only_one_scheduler(tmp_path):
+    with jobs.scheduler_lock(tmp_path / "jobs.lock"):
+        with pytest.raises(RuntimeError):
+            with jobs.scheduler_lock(tmp_path / "jobs.lock"):
+                pass
+
+
+def test_recover_requeues_and_spares_foreign_pids(db):
+    jobs.add_job(db, SCENE_FILE, "TitleScene")
+    jobs.add_job(db, SCENE_FILE, "CtaScene")
+    stranger = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)"])
+    orphan = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(30)", "reelkit",
+                               "Bloom4/new_Bloom4.py", "CtaScene"])
+    try:
+        db.execute("UPDATE jobs SET state = 'running', pid = ?, boot_id = ? WHERE scene = 'TitleScene'",
+                   (stranger.pid, jobs.boot_id()))
+        db.execute("UPDATE jobs SET state = 'running', pid = ?, boot_id = ? WHERE scene = 'CtaScene'",
+                   (orphan.pid, jobs.boot_id()))
+        assert jobs.recover(db) == 2
+        assert set(states(db).values()) == {"queued"}
+        assert orphan.wait(timeout=5) != 0
+        assert stranger.poll() is None
+    finally:
+        for proc in (stranger, orphan):
+            if proc.poll() is None:
+                proc.kill()
+                proc.wait()
+
+
+def test_recover_ignores_pids_from_another_boot(db):
+    jobs.add_job(db, SCENE_FILE, "TitleScene")
+    db.execute("UPDATE jobs SET state = 'running', pid = ?, boot_id = 'another-boot'", (os.getpid(),))
+    assert jobs.recover(db) == 1
+    assert states(db) == {"TitleScene": "queued"}
@@ -0,0 +1,79 @@
+import ast
+import struct
+
+import pytest
+
+from reelkit.preflight import _Scope, image_size
+
+
+def segment(marker, payload):
+    return bytes([0xFF, marker]) + struct.pack(">H", len(payload) + 2) + payload
+
+
+HEADERS = {
+    "png": b"\x89PNG\r\n\x1a\n" + struct.pack(">I", 13) + b"IHDR" + struct.pack(">II", 640, 360) + b"\x08\x06\0\0\0",
+    "gif": b"GIF89a" + struct.pack("<HH", 320, 200) + b"\0" * 8,
+    # APP0 and DHT come before the start-of-frame and must be skipped.
+    "jpeg": b"\xff\xd8" + segment(0xE0, b"JFIF\0" + b"\0" * 9) + segment(0xC4, b"\0" * 20)
+            + segment(0xC0, b"\x08" + struct.pack(">HH", 1080, 1920) + b"\x03" + b"\0" * 9),
+    "bmp": b"BM" + b"\0" * 16 + struct.pack("<ii", 800, -600) + b"\0" * 8,
+    "webp": b"RIFF" + b"\0" * 4 + b"WEBPVP8 " + b"\0" * 16,
+}
+
+
+@pytest.mark.parametrize("kind, size", [
+    ("png", (640, 360)),
+    ("gif", (320, 200)),
+    ("jpeg", (1920, 1080)),
+    ("bmp", (800, 600)),  # top-down rows: negative height
+    ("webp", (0, 0)),
+])
+def test_image_size(tmp_path, kind, size):
+    path = tmp_path / f"image.{kind}"
+    path.write_bytes(HEADERS[kind])
+    assert image_size(path) == (kind, *size)
+
+
+@pytest.mark.parametrize("data", [
+    b"",
+    b"<svg xmlns='http://www.w3.org/2000/svg'/>",
+    b"\xff\xd8" + segment(0xE0, b"\0" * 14),  # JPEG cut before its frame header
+    b"\xff\xd8\x00\x00",
+])
+def test_image_size_unknown(tmp_path, data):
+    path = tmp_path / "image.bin"
+    path.write_bytes(data)
+    assert image_size(path) is None
+
+
+SOURCE = '''
+logo = "logo.png"
+for icon in ["a.png", "b.svg"]:
+    pass
+logo = "logo_dark.png"
+paths = [name for name in ("c.png", "d.png")]
+where = make_path()
+'''
+
+
+@pytest.fixture
+def scope():
+    return _Scope(ast.parse(SOURCE).body)
+
+
+def test_resolve_takes_the_last_binding_before_the_line(scope):
+    assert scope.resolve("logo", 1) is False
+    assert scope.resolve("logo", 2) == ["logo.png"]
+    assert scope.resolve("logo", 4) == ["logo.png"]
+    assert scope.resolve("logo", 5) == ["logo_dark.png"]
+    assert scope.resolve("logo", 99) == ["logo_dark.png"]
+
+
+def test_resolve_loops_and_comprehensions(scope):
+    assert scope.resolve("icon", 3) == ["a.png", "b.svg"]
+    assert scope.resolve("name", 6) == ["c.png", "d.png"]
+
+
+def test_resolve_unknown_values(scope):
+    assert scope.resolve("where", 7) is None  # bound, but not to literals
+    assert scope.resolve("missing", 7) is False
@@ -0,0 +1,81 @@
+import os
+import time
+
+import pytest
+
+from reelkit.store import ArtifactStore
+
+
+@pytest.fixture
+def store(tmp_path):
+    return ArtifactStore(tmp_path / "store", max_size=10**6)
+
+
+def write(path, data):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_bytes(data)
+    return path
+
+
+def test_put_then_get_copies(store, tmp_path):
+    source = write(tmp_path / "a" / "x.mp4", b"partial")
+    store.put("k", source, "partial", "a.py:A")
+    target = tmp_path / "b" / "x.mp4"
+    assert store.get("k", target)
+    assert target.read_bytes() == b"partial"
+    assert store.stats()["kinds"]["partial"] == {"count": 1, "size": 7, "hits": 1}
+
+
+def test_store_objects_never_share_an_inode(store, tmp_path):
+    source = write(tmp_path / "movie.mp4", b"first")
+    store.put("k", source, "movie")
+    target = tmp_path / "other.mp4"
+    store.get("k", target)
+    assert not os.path.samefile(source, target)
+    assert not os.path.samefile(target, store.object_path("k", ".mp4"))
+    # Rewriting a render in place must not change what the key returns.
+    source.write_bytes(b"second")
+    target.write_bytes(b"third")
+    assert store.object_path("k", ".mp4").read_bytes() == b"first"
+
+
+def test_get_misses(store, tmp_path):
+    assert not store.get("missing", tmp_path / "x.mp4")
+    source = write(tmp_path / "x.mp4", b"data")
+    store.put("k", source, "partial")
+    store.object_path("k", ".mp4").unlink()
+    assert not store.get("k", tmp_path / "y.mp4")
+    assert store.size() == 0
+
+
+def test_put_evicts_least_recently_used(tmp_path):
+    store = ArtifactStore(tmp_path / "store", max_size=25)
+    for key in ("a", "b"):
+        store.put(key, write(tmp_path / f"{key}.mp4", b"x" * 10), "partial")
+        time.sleep(0.01)
+    store.get("a", tmp_path / "again.mp4")  # b is now the oldest
+    store.put("c", write(tmp_path / "c.mp4", b"x" * 10), "partial")
+    assert not store.object_path("b", ".mp4").exists()
+    assert store.object_path("a", ".mp4").exists()
+    assert store.size() == 20
+
+
+def test_evict_older_than(store, tmp_path):
+    store.put("old", write(tmp_path / "old.mp4", b"x"), "partial")
+    store.db.execute("UPDATE artifacts SET last_used = ? WHERE key = 'old'", (time.time() - 7200,))
+    store.put("new", write(tmp_path / "new.mp4", b"y"), "partial")
+    assert store.evict(10**6, older_than=3600) == (1, 1)
+    assert store.get("new", tmp_path / "n.mp4")
+
+
+def test_gc_removes_orphans_and_forgets_missing(store, tmp_path):
+    store.put("kept", write(tmp_path / "kept.mp4", b"kept"), "partial")
+    store.put("lost", write(tmp_path / "lost.mp4", b"lost"), "partial")
+    store.object_path("lost", ".mp4").unlink()
+    orphan = write(store.root / "objects" / "zz" / "zz.mp4", b"orphan")
+    recent_tmp = write(store.root / "objects" / "zz" / ".zz.mp4.tmp", b"copying")
+    result = store.gc()
+    assert (result.orphans, result.kept, result.size) == (1, 1, 4)
+    assert not orphan.exists()
+    assert recent_tmp.exists()
+    assert store.gc(max_size=0).removed == 1
@@ -0,0 +1,63 @@
+import pytest
+
+from reelkit.discovery import ROOT, build_index
+from reelkit.watch import Slice, byte_range, changed_lines, slices_for
+
+CRO = ROOT / "Bloom4" / "cro_story.py"
+BLOOM4 = ROOT / "Bloom4" / "new_Bloom4.py"
+
+
+def scene(file, name):
+    relative = file.relative_to(ROOT).as_posix()
+    return next(s for s in build_index()[relative] if s.name == name)
+
+
+def test_changed_lines():
+    old = "a\nb\nc\nd\n"
+    assert changed_lines(old, old) == []
+    assert changed_lines(old, "a\nB\nc\nd\n") == [2]
+    assert changed_lines(old, "a\nb\nx\ny\nc\nd\n") == [3, 4]
+    # A deletion marks the line before the gap.
+    assert changed_lines(old, "a\nd\n") == [1]
+    assert changed_lines(old, "b\nc\nd\n") == [1]
+
+
+def test_section_edit_renders_only_that_section():
+    cro = scene(CRO, "CROStory")
+    start, _ = cro.methods["section_three"]
+    assert slices_for(CRO, [start + 1], None) == [Slice("Bloom4/cro_story.py", "CROStory", "three", "three")]
+
+
+def test_edits_in_several_sections_span_them():
+    cro = scene(CRO, "CROStory")
+    lines = [cro.methods["section_five"][0], cro.methods["section_two"][0]]
+    assert slices_for(CRO, lines, None) == [Slice("Bloom4/cro_story.py", "CROStory", "two", "five")]
+
+
+def test_edit_outside_sections_renders_the_scene():
+    title = scene(BLOOM4, "TitleScene")
+    assert slices_for(BLOOM4, [title.start], None) == [Slice("Bloom4/new_Bloom4.py", "TitleScene")]
+
+
+def test_edit_outside_every_scene_renders_the_focus():
+    base = scene(BLOOM4, "BaseBloomScene")
+    assert slices_for(BLOOM4, [1], "CtaScene") == [Slice("Bloom4/new_Bloom4.py", "CtaScene")]
+    # A shared base has no render of its own; the first scene stands in.
+    assert slices_for(BLOOM4, [base.start], None) == [Slice("Bloom4/new_Bloom4.py", "TitleScene")]
+
+
+@pytest.mark.parametrize("header, expected", [
+    ("bytes=0-", (0, 99)),
+    ("bytes=10-19", (10, 19)),
+    ("bytes=90-500", (90, 99)),
+    ("bytes=-10", (90, 99)),
+    ("bytes=-500", (0, 99)),
+])
+def test_byte_range(header, expected):
+    assert byte_range(header, 100) == expected
+
+
+@pytest.mark.parametrize("header", ["bytes=abc-", "bytes=20-10", "bytes=100-", "bytes=-", "items=0-5", "bytes=-0"])
+def test_unsatisfiable_byte_range(header):
+    with pytest.raises(ValueError):
+        byte_range(header, 100)